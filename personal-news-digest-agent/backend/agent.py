@@ -3,23 +3,92 @@
 """
 Agent logic for building a personalized news digest:
 
-1. Fetch articles from multiple sources (Hacker News + RSS).
+1. Read articles from the shared snapshot (refreshed in the background
+   from Hacker News + RSS by ingestion.py).
 2. Optionally filter by source.
-3. Compute simple topic relevance scores.
+3. Compute topic relevance scores (word/phrase matches, see topic_matcher.py).
 4. Combine relevance with source score.
 5. Generate AI summaries for top articles using Gemini.
+
+Every pipeline entry point takes an optional 'deadline_at' (a
+time.monotonic() timestamp). Source fetching is capped by it, and when
+it gets close, articles whose Gemini summary isn't ready get a cached
+summary or a snippet instead and are marked "degraded".
+
+build_digest_page_async serves the same digest in pages: the ranked list
+is kept for a while (pagination.py) and each page only summarizes its
+own slice.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+from ingestion import ARTICLE_STORE
+from news_sources import AGGREGATE_BUDGET
+from cache import get_cached_summary
+from metrics import timed, DIGEST_STAGE_SECONDS
+from warmer import SUMMARY_WARMER
+from pagination import RANKED_LISTS, PAGE_MAX_RANKED, page_slice
+from topic_matcher import TopicMatcher
+from ranking import bm25_rank
+from dedup import in_sources
+from digest_cache import DIGEST_CACHE, make_digest_key
+from ai_client import (
+    summarize_article,
+    summarize_articles_batch,
+    summarize_article_async,
+    summarize_articles_batch_async,
+)
+
+# How many articles get an AI summary, and how many Gemini calls run at once.
+# The Gemini request rate itself is capped in ai_client (GEMINI_RPM).
+MAX_LLM_SUMMARIES = int(os.getenv("MAX_LLM_SUMMARIES", "50"))
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "8"))
+# Articles packed into one Gemini prompt; 1 disables batching.
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "5"))
+# Time kept back from a request's deadline for assembling the response (ms).
+DEADLINE_RESERVE_MS = float(os.getenv("DEADLINE_RESERVE_MS", "100"))
+
+# Summary tasks that outlived their request's deadline; referenced here so
+# they run to completion (and fill the summary cache) in the background
+_BACKGROUND_SUMMARIES: set = set()
+
+
+def _finish_in_background(task: "asyncio.Task[Any]") -> None:
+    _BACKGROUND_SUMMARIES.add(task)
+
+    def _done(t: "asyncio.Task[Any]") -> None:
+        _BACKGROUND_SUMMARIES.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            print(f"[WARN] Background summary call failed: {t.exception()}")
 
-from news_sources import fetch_all_sources
-from ai_client import summarize_article
+    task.add_done_callback(_done)
+
+
+def _remaining(deadline_at: Optional[float]) -> Optional[float]:
+    """
+    Seconds left before 'deadline_at' (minus the reserve), or None without a deadline.
+    """
+    if deadline_at is None:
+        return None
+    return deadline_at - time.monotonic() - DEADLINE_RESERVE_MS / 1000.0
+
+
+def _fetch_budget(deadline_at: Optional[float]) -> float:
+    remaining = _remaining(deadline_at)
+    return AGGREGATE_BUDGET if remaining is None else max(0.0, min(AGGREGATE_BUDGET, remaining))
 
 
 def compute_topic_score(title: str, topics: List[str]) -> float:
     """
     Simple relevance score:
     - Count how many topic keywords appear (case-insensitive) in the title.
+
+    Substring-based; the pipeline uses TopicMatcher (word/phrase matching,
+    compiled once per request). Kept for comparison in benchmarks.
     """
     title_lower = title.lower()
     score = 0.0
@@ -32,33 +101,170 @@ def compute_topic_score(title: str, topics: List[str]) -> float:
     return score
 
 
-def build_digest(
+def _snippet_summary(article: Dict[str, Any]) -> str:
+    """
+    Cheap fallback summary (no Gemini call).
+    """
+    desc = article.get("description") or article["title"]
+    summary_text = desc.strip()
+    if len(summary_text) > 220:
+        summary_text = summary_text[:220] + "..."
+    summary_text += "\n\n(Note: This is a simple snippet, not an AI-generated summary.)"
+    return summary_text
+
+
+def _deadline_summary(article: Dict[str, Any]) -> Tuple[str, bool]:
+    """
+    Summary for an article that ran out of time: a cached AI summary if
+    there is one, else a snippet. Returns (summary, degraded).
+    """
+    cached = get_cached_summary(article.get("url"))
+    if cached is not None:
+        return cached, False
+    return _snippet_summary(article), True
+
+
+def iter_summaries(
+    articles: List[Dict[str, Any]],
+    topics: List[str],
+    max_workers: int = SUMMARY_CONCURRENCY,
+    batch_size: int = SUMMARY_BATCH_SIZE,
+    deadline_at: Optional[float] = None,
+) -> Iterator[Tuple[int, str, bool]]:
+    """
+    Summarize articles in parallel (at most max_workers Gemini calls at once)
+    and yield (index, summary, degraded) as soon as each one is ready.
+    With batch_size > 1, each call covers up to batch_size articles.
+    The first MAX_LLM_SUMMARIES get an AI summary, the rest a snippet.
+
+    With a deadline, summaries still pending when it arrives are replaced
+    by _deadline_summary(); the Gemini calls finish in the background and
+    still fill the summary cache.
+    """
+    def _summarize(chunk: List[Dict[str, Any]]) -> List[str]:
+        if len(chunk) > 1:
+            return summarize_articles_batch(chunk, topics)
+        a = chunk[0]
+        return [
+            summarize_article(
+                title=a["title"],
+                description=a.get("description"),
+                topics=topics,
+                url=a.get("url"),
+            )
+        ]
+
+    # Snippets are free, so hand them out first
+    for idx in range(MAX_LLM_SUMMARIES, len(articles)):
+        yield idx, _snippet_summary(articles[idx]), False
+
+    llm_articles = articles[:MAX_LLM_SUMMARIES]
+    size = max(1, batch_size)
+    starts = list(range(0, len(llm_articles), size))
+    if not starts:
+        return
+
+    budget = _remaining(deadline_at)
+    if budget is not None and budget <= 0:
+        for idx, a in enumerate(llm_articles):
+            yield (idx, *_deadline_summary(a))
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(starts))))
+    pending = set(starts)
+    try:
+        futures = {executor.submit(_summarize, llm_articles[start:start + size]): start for start in starts}
+        try:
+            for fut in as_completed(futures, timeout=budget):
+                start = futures[fut]
+                pending.discard(start)
+                for offset, summary_text in enumerate(fut.result()):
+                    yield start + offset, summary_text, False
+        except FuturesTimeoutError:
+            print(f"[WARN] {len(pending)} summary calls missed the deadline; using cached/snippet summaries.")
+            for start in sorted(pending):
+                for offset, a in enumerate(llm_articles[start:start + size]):
+                    yield (start + offset, *_deadline_summary(a))
+    finally:
+        # With a deadline, don't block on stragglers (queued calls are dropped)
+        executor.shutdown(wait=deadline_at is None, cancel_futures=deadline_at is not None)
+
+
+def summarize_articles(
+    articles: List[Dict[str, Any]],
+    topics: List[str],
+    max_workers: int = SUMMARY_CONCURRENCY,
+    batch_size: int = SUMMARY_BATCH_SIZE,
+    deadline_at: Optional[float] = None,
+) -> List[Tuple[str, bool]]:
+    """
+    Summarize all articles (see iter_summaries) and return (summary, degraded)
+    pairs in the same order as 'articles'.
+    """
+    summaries: List[Tuple[str, bool]] = [("", False)] * len(articles)
+    with timed(DIGEST_STAGE_SECONDS, span="summarize", stage="summarize"):
+        for idx, summary_text, degraded in iter_summaries(articles, topics, max_workers, batch_size, deadline_at):
+            summaries[idx] = (summary_text, degraded)
+    return summaries
+
+
+def rank_articles(
     topics: List[str],
     max_articles: int = 10,
     allowed_sources: Optional[List[str]] = None,
+    ranking: str = "keyword",
+    deadline_at: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Main agent pipeline.
+    Ranking half of the pipeline (no summaries).
 
     Steps:
-    1. Fetch lots of articles from all configured sources.
-    2. Optionally keep only articles from allowed_sources.
-    3. Compute a combined_score = topic_score * 10 + source_score.
+    1. Read the latest article snapshot (no live upstream calls, unless
+       nothing has been ingested yet; that fetch is capped by the deadline).
+    2. Optionally keep only articles from allowed_sources (a story
+       matches if any copy of it, see dedup.py alternates, does).
+    3. Score with the selected ranking mode:
+       - "keyword": combined_score = topic_score * 10 + source_score
+       - "bm25": BM25 over title + description + normalized source score (ranking.py)
     4. Sort and take top max_articles.
-    5. Generate summaries using Gemini (or fallback).
     """
-    # 1. Fetch from all sources
-    raw_articles = fetch_all_sources(limit_per_source=30)
+    # 1. Read from the in-memory article snapshot
+    version, raw_articles = _read_snapshot(deadline_at)
+    with timed(DIGEST_STAGE_SECONDS, span="rank", stage="rank"):
+        return _score_and_rank(raw_articles, version, topics, max_articles, allowed_sources, ranking)
+
+
+def _read_snapshot(deadline_at: Optional[float]) -> Tuple[int, List[Dict[str, Any]]]:
+    with timed(DIGEST_STAGE_SECONDS, span="snapshot", stage="snapshot"):
+        return ARTICLE_STORE.get_snapshot(budget=_fetch_budget(deadline_at))
+
+
+async def _read_snapshot_async(deadline_at: Optional[float]) -> Tuple[int, List[Dict[str, Any]]]:
+    with timed(DIGEST_STAGE_SECONDS, span="snapshot", stage="snapshot"):
+        return await ARTICLE_STORE.get_snapshot_async(budget=_fetch_budget(deadline_at))
 
-    # 2. Filter by allowed_sources if provided
+
+def _score_and_rank(
+    raw_articles: List[Dict[str, Any]],
+    snapshot_version: int,
+    topics: List[str],
+    max_articles: int,
+    allowed_sources: Optional[List[str]],
+    ranking: str,
+) -> List[Dict[str, Any]]:
+    if ranking == "bm25":
+        return bm25_rank(raw_articles, topics, snapshot_version, allowed_sources)[:max_articles]
+
+    # 2. Filter by allowed_sources if provided (alternates count too)
     if allowed_sources:
         allowed_set = set(allowed_sources)
-        raw_articles = [a for a in raw_articles if a["source"] in allowed_set]
+        raw_articles = [a for a in raw_articles if in_sources(a, allowed_set)]
 
-    # 3. Score articles
+    # 3. Score articles (topics are compiled once, not per article)
+    matcher = TopicMatcher(topics)
     scored: List[Dict[str, Any]] = []
     for a in raw_articles:
-        topic_score = compute_topic_score(a["title"], topics)
+        topic_score = matcher.score(a["title"])
         combined_score = topic_score * 10.0 + float(a.get("score", 0.0))
 
         scored.append(
@@ -75,44 +281,268 @@ def build_digest(
     # 5. Sort by combined_score descending
     scored.sort(key=lambda x: x["combined_score"], reverse=True)
 
-       # 6. Take top N
-    top = scored[:max_articles]
+    # 6. Take top N
+    return scored[:max_articles]
 
-    # 7. Generate summaries
-    #    To keep latency reasonable, only send the first few articles to Gemini.
-    MAX_LLM_SUMMARIES = 2  # you can tune this
 
-    digest_articles: List[Dict[str, Any]] = []
-    for idx, a in enumerate(top):
-        if idx < MAX_LLM_SUMMARIES:
-            # Full AI summary for the top few
-            summary_text = summarize_article(
-                title=a["title"],
-                description=a.get("description"),
-                topics=topics,
-                url=a.get("url"),
-            )
-        else:
-            # Cheap fallback for the rest (no Gemini call)
-            desc = a.get("description") or a["title"]
-            summary_text = desc.strip()
-            if len(summary_text) > 220:
-                summary_text = summary_text[:220] + "..."
-            summary_text += "\n\n(Note: This is a simple snippet, not an AI-generated summary.)"
-
-        digest_articles.append(
-            {
-                "id": a["id"],
-                "title": a["title"],
-                "url": a["url"],
-                "score": a["combined_score"],
-                "source": a["source"],
-                "summary": summary_text,
-            }
+def _digest_entry(article: Dict[str, Any], summary_text: Optional[str], degraded: bool = False) -> Dict[str, Any]:
+    return {
+        "id": article["id"],
+        "title": article["title"],
+        "url": article["url"],
+        "score": article["combined_score"],
+        "source": article["source"],
+        "summary": summary_text,
+        "alternates": article.get("alternates", []),
+        "degraded": degraded,
+    }
+
+
+def build_digest(
+    topics: List[str],
+    max_articles: int = 10,
+    allowed_sources: Optional[List[str]] = None,
+    ranking: str = "keyword",
+    deadline_at: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Main agent pipeline: rank_articles(), then generate summaries
+    using Gemini (or fallback).
+
+    Results are cached per normalized request + the version of the
+    snapshot they were ranked from, and concurrent identical requests
+    share one computation (digest_cache.py). Nothing is cached before the
+    first ingestion (version 0). A request with a deadline only reuses a
+    finished result; it computes its own otherwise, and caches it only if
+    nothing was degraded.
+    """
+    version, raw_articles = _read_snapshot(deadline_at)
+
+    def _compute() -> List[Dict[str, Any]]:
+        return _build_digest_uncached(
+            raw_articles, version, topics, max_articles, allowed_sources, ranking, deadline_at
         )
 
-    return digest_articles
+    if version == 0:
+        return _compute()
+
+    key = make_digest_key(topics, allowed_sources, max_articles, version, ranking)
+    if deadline_at is None:
+        return DIGEST_CACHE.get_or_compute(key, _compute)
+
+    cached = DIGEST_CACHE.peek(key)
+    if cached is not None:
+        return cached
+    result = _compute()
+    if not any(a["degraded"] for a in result):
+        DIGEST_CACHE.store(key, result)
+    return result
+
+
+def _build_digest_uncached(
+    raw_articles: List[Dict[str, Any]],
+    version: int,
+    topics: List[str],
+    max_articles: int,
+    allowed_sources: Optional[List[str]],
+    ranking: str,
+    deadline_at: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    with timed(DIGEST_STAGE_SECONDS, span="rank", stage="rank"):
+        top = _score_and_rank(raw_articles, version, topics, max_articles, allowed_sources, ranking)
+    SUMMARY_WARMER.note_requested(top[:MAX_LLM_SUMMARIES])
+
+    # Generate summaries concurrently (order is preserved)
+    summaries = summarize_articles(top, topics, deadline_at=deadline_at)
+
+    return [_digest_entry(a, summary_text, degraded) for a, (summary_text, degraded) in zip(top, summaries)]
+
+
+def stream_digest(
+    topics: List[str],
+    max_articles: int = 10,
+    allowed_sources: Optional[List[str]] = None,
+    ranking: str = "keyword",
+    deadline_at: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of build_digest. Yields events:
+      - {"type": "articles", "topics": [...], "articles": [...], "next_cursor": ..., "total": ...}
+        ranked list (summary=None); next_cursor continues it through
+        build_digest_page_async, as if this were the first page
+      - {"type": "summary", "id": ..., "summary": ..., "degraded": ...}  one per article, as each is ready
+      - {"type": "done"}
+    """
+    ranked = rank_articles(topics, PAGE_MAX_RANKED, allowed_sources, ranking, deadline_at)
+    if len(ranked) > max_articles:
+        top, next_cursor = page_slice(RANKED_LISTS.put(topics, ranked), ranked, 0, max_articles)
+    else:
+        top, next_cursor = ranked, None
+    SUMMARY_WARMER.note_requested(top[:MAX_LLM_SUMMARIES])
+
+    yield {
+        "type": "articles",
+        "topics": topics,
+        "articles": [_digest_entry(a, None) for a in top],
+        "next_cursor": next_cursor,
+        "total": len(ranked),
+    }
+
+    for idx, summary_text, degraded in iter_summaries(top, topics, deadline_at=deadline_at):
+        yield {"type": "summary", "id": top[idx]["id"], "summary": summary_text, "degraded": degraded}
+
+    yield {"type": "done"}
+
+
+# ---------- Async pipeline ---------- #
+
+
+async def summarize_articles_async(
+    articles: List[Dict[str, Any]],
+    topics: List[str],
+    max_concurrency: int = SUMMARY_CONCURRENCY,
+    batch_size: int = SUMMARY_BATCH_SIZE,
+    deadline_at: Optional[float] = None,
+) -> List[Tuple[str, bool]]:
+    """
+    Async version of summarize_articles: at most max_concurrency Gemini
+    calls in flight, (summary, degraded) pairs returned in the same order
+    as 'articles'. At the deadline, calls already running are left to
+    finish in the background (they still fill the summary cache, as in
+    the sync path); calls still queued are dropped.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    started: set = set()
+
+    async def _summarize(n: int, chunk: List[Dict[str, Any]]) -> List[str]:
+        async with semaphore:
+            started.add(n)
+            if len(chunk) > 1:
+                return await summarize_articles_batch_async(chunk, topics)
+            a = chunk[0]
+            return [
+                await summarize_article_async(
+                    title=a["title"],
+                    description=a.get("description"),
+                    topics=topics,
+                    url=a.get("url"),
+                )
+            ]
+
+    llm_articles = articles[:MAX_LLM_SUMMARIES]
+    size = max(1, batch_size)
+    chunks = [llm_articles[i:i + size] for i in range(0, len(llm_articles), size)]
+
+    summaries: List[Tuple[str, bool]] = []
+    with timed(DIGEST_STAGE_SECONDS, span="summarize", stage="summarize"):
+        if chunks:
+            tasks = [asyncio.create_task(_summarize(n, chunk)) for n, chunk in enumerate(chunks)]
+            budget = _remaining(deadline_at)
+            done, not_done = await asyncio.wait(tasks, timeout=None if budget is None else max(0.0, budget))
+            if not_done:
+                queued = []
+                for n, task in enumerate(tasks):
+                    if task in not_done:
+                        if n in started:
+                            _finish_in_background(task)
+                        else:
+                            task.cancel()
+                            queued.append(task)
+                await asyncio.gather(*queued, return_exceptions=True)
+                print(f"[WARN] {len(not_done)} summary calls missed the deadline; using cached/snippet summaries.")
+
+            for task, chunk in zip(tasks, chunks):
+                if task in done:
+                    summaries.extend((summary_text, False) for summary_text in task.result())
+                else:
+                    # Cache lookups hit SQLite: keep them off the event loop
+                    summaries.extend(await asyncio.to_thread(lambda c=chunk: [_deadline_summary(a) for a in c]))
+
+    summaries.extend((_snippet_summary(a), False) for a in articles[MAX_LLM_SUMMARIES:])
+    return summaries
+
+
+async def rank_articles_async(
+    topics: List[str],
+    max_articles: int = 10,
+    allowed_sources: Optional[List[str]] = None,
+    ranking: str = "keyword",
+    deadline_at: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of rank_articles.
+    """
+    version, raw_articles = await _read_snapshot_async(deadline_at)
+    with timed(DIGEST_STAGE_SECONDS, span="rank", stage="rank"):
+        return _score_and_rank(raw_articles, version, topics, max_articles, allowed_sources, ranking)
 
 
+async def build_digest_async(
+    topics: List[str],
+    max_articles: int = 10,
+    allowed_sources: Optional[List[str]] = None,
+    ranking: str = "keyword",
+    deadline_at: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of build_digest (shares its result cache and in-flight
+    requests with the sync pipeline).
+    """
+    version, raw_articles = await _read_snapshot_async(deadline_at)
+
+    async def _compute() -> List[Dict[str, Any]]:
+        with timed(DIGEST_STAGE_SECONDS, span="rank", stage="rank"):
+            top = _score_and_rank(raw_articles, version, topics, max_articles, allowed_sources, ranking)
+        SUMMARY_WARMER.note_requested(top[:MAX_LLM_SUMMARIES])
+        summaries = await summarize_articles_async(top, topics, deadline_at=deadline_at)
+        return [_digest_entry(a, summary_text, degraded) for a, (summary_text, degraded) in zip(top, summaries)]
+
+    if version == 0:
+        return await _compute()
+
+    key = make_digest_key(topics, allowed_sources, max_articles, version, ranking)
+    if deadline_at is None:
+        return await DIGEST_CACHE.get_or_compute_async(key, _compute)
+
+    cached = DIGEST_CACHE.peek(key)
+    if cached is not None:
+        return cached
+    result = await _compute()
+    if not any(a["degraded"] for a in result):
+        DIGEST_CACHE.store(key, result)
+    return result
+
+
+async def build_digest_page_async(
+    topics: List[str],
+    page_size: int = 10,
+    allowed_sources: Optional[List[str]] = None,
+    ranking: str = "keyword",
+    cursor: Optional[str] = None,
+    deadline_at: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Paginated digest. Without a cursor, ranks up to PAGE_MAX_RANKED articles
+    once and keeps the list (pagination.py); with one, pages through that
+    stored list (topics/sources/ranking then come from the first request).
+    Only the articles on the returned page are summarized.
+
+    Returns {"topics", "articles", "next_cursor", "total"}.
+    Raises pagination.InvalidCursorError / ExpiredCursorError for bad cursors.
+    """
+    if cursor is None:
+        ranked = await rank_articles_async(topics, PAGE_MAX_RANKED, allowed_sources, ranking, deadline_at)
+        token, offset = RANKED_LISTS.put(topics, ranked), 0
+    else:
+        token, offset, topics, ranked = RANKED_LISTS.get(cursor)
 
+    page, next_cursor = page_slice(token, ranked, offset, page_size)
+    SUMMARY_WARMER.note_requested(page[:MAX_LLM_SUMMARIES])
+    summaries = await summarize_articles_async(page, topics, deadline_at=deadline_at)
 
+    return {
+        "topics": topics,
+        "articles": [_digest_entry(a, summary_text, degraded) for a, (summary_text, degraded) in zip(page, summaries)],
+        "next_cursor": next_cursor,
+        "total": len(ranked),
+    }
@@ -1,26 +1,36 @@
 # backend/ai_client.py
 
 """
-Gemini 2.5 Flash integration for article summarization + JSON cache + usage tracking.
+Gemini 2.5 Flash integration for article summarization + summary cache + usage tracking.
 
 - Reads API key from GEMINI_API_KEY or GOOGLE_API_KEY.
 - summarize_article() will:
-  * Check JSON file cache by URL
+  * Check the summary cache (SQLite, see cache.py) by URL
   * If cached, return stored summary (no API call)
   * Otherwise call Gemini, track tokens, store in cache
   * On failures or missing key, fall back to a simple snippet
-
-- get_usage_stats() exposes total calls, tokens, and estimated cost.
+  * Respect the spend budget (budget.py): near the ceilings it asks for
+    shorter summaries, then serves cached ones only, then only snippets
+- summarize_articles_batch() packs several uncached articles into one
+  prompt and falls back to summarize_article() for anything it can't parse
+- *_async variants do the same with non-blocking Gemini calls
+
+- get_usage_stats() exposes total calls, tokens, and estimated cost
+  (summed over all backend processes).
 """
 
+import asyncio
+import json
 import os
 import time
 from threading import Lock
-from typing import Optional, List, Dict, Any
-
-import google.generativeai as genai
+from typing import Optional, List, Dict, Any, Tuple
 
-from cache import get_cached_summary, save_cached_summary
+from cache import get_cached_summary, save_cached_summary, get_cache_stats
+from usage_store import record_usage, read_usage
+from rate_limit import TokenBucket, backoff_delay
+from budget import BudgetController
+from metrics import timed, GEMINI_CALL_SECONDS, GEMINI_RATE_LIMIT_WAIT_SECONDS, GEMINI_RETRIES_TOTAL
 
 # --------- API KEY + MODEL CONFIG --------- #
 
@@ -28,7 +38,6 @@ from cache import get_cached_summary, save_cached_summary
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
 
 if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
     print("[INFO] Gemini API key loaded successfully.")
 else:
     print(
@@ -39,27 +48,84 @@ else:
 # Use Gemini 2.5 Flash (text model)
 GEMINI_MODEL_NAME = "gemini-2.5-flash"
 
+# The SDK is imported, configured and the model built on first use
+# (_get_model), so importing this module (agent, main, benchmarks) doesn't
+# pay for google.generativeai, and every call reuses the same model.
+# That first build takes ~0.5 s and holds _MODEL_LOCK, so the app warms it
+# in a background thread at startup (warm_model) and the async path never
+# runs it on the event loop.
+_MODEL_LOCK = Lock()
+_MODEL: Optional[Any] = None
+
+
+def _get_model() -> Any:
+    """
+    Return the shared GenerativeModel, importing and configuring the SDK
+    the first time. Only called when GEMINI_API_KEY is set.
+    """
+    global _MODEL
+    if _MODEL is None:
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=GEMINI_API_KEY)
+                _MODEL = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _MODEL
+
+
+def warm_model() -> None:
+    """
+    Build the shared model now (no-op without GEMINI_API_KEY), so the first
+    summary request doesn't pay for the SDK import.
+    """
+    if GEMINI_API_KEY:
+        _get_model()
+
 # Approximate pricing (per 1M tokens) — override via env if you want
 # Input:  $0.30 / 1M tokens
 # Output: $2.50 / 1M tokens
 COST_INPUT_PER_M = float(os.getenv("GEMINI_COST_INPUT_PER_M", "0.30"))
 COST_OUTPUT_PER_M = float(os.getenv("GEMINI_COST_OUTPUT_PER_M", "2.50"))
 
-# --------- USAGE TRACKING (IN-MEMORY) --------- #
-
-_USAGE_LOCK = Lock()
-_USAGE_STATS: Dict[str, Any] = {
-    "calls": 0,
-    "prompt_tokens": 0,
-    "response_tokens": 0,
-}
+# Requests-per-minute quota for Gemini. Every attempt (including retries)
+# takes a token, so concurrent summarization can't exceed the quota.
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))
+GEMINI_BURST = float(os.getenv("GEMINI_BURST", "5"))
+_RATE_LIMITER = TokenBucket(rate=GEMINI_RPM / 60.0, capacity=GEMINI_BURST)
+
+# Spend ceilings (0 = none). As usage approaches the tightest one,
+# summaries step down: full -> short -> cache_only -> fallback (budget.py).
+_BUDGET = BudgetController(
+    tokens_per_minute=int(os.getenv("GEMINI_BUDGET_TOKENS_PER_MINUTE", "0")),
+    tokens_per_day=int(os.getenv("GEMINI_BUDGET_TOKENS_PER_DAY", "0")),
+    usd_per_minute=float(os.getenv("GEMINI_BUDGET_USD_PER_MINUTE", "0")),
+    usd_per_day=float(os.getenv("GEMINI_BUDGET_USD_PER_DAY", "0")),
+    cost_input_per_m=COST_INPUT_PER_M,
+    cost_output_per_m=COST_OUTPUT_PER_M,
+    short_at=float(os.getenv("GEMINI_BUDGET_SHORT_AT", "0.7")),
+    cache_only_at=float(os.getenv("GEMINI_BUDGET_CACHE_ONLY_AT", "0.9")),
+)
+# "short" tier: snippet length sent to Gemini, and an optional output cap per
+# article (0 = no cap). Gemini 2.5 models count thinking tokens toward
+# max_output_tokens and this SDK can't turn thinking off, so a small cap can
+# leave no room for the reply itself; the short prompt already asks for one
+# sentence. Replies cut off at the cap are not retried (see _response_text).
+SHORT_SNIPPET_CHARS = int(os.getenv("GEMINI_SHORT_SNIPPET_CHARS", "300"))
+SHORT_MAX_OUTPUT_TOKENS = int(os.getenv("GEMINI_SHORT_MAX_OUTPUT_TOKENS", "0"))
+
+# --------- USAGE TRACKING (SHARED ACROSS PROCESSES, see usage_store.py) --------- #
+
+
+def get_budget_tier() -> str:
+    """
+    Current summarization tier: "full", "short", "cache_only" or "fallback".
+    """
+    return _BUDGET.tier()
 
 
 def _record_usage(prompt_tokens: int, response_tokens: int) -> None:
-    with _USAGE_LOCK:
-        _USAGE_STATS["calls"] += 1
-        _USAGE_STATS["prompt_tokens"] += int(prompt_tokens)
-        _USAGE_STATS["response_tokens"] += int(response_tokens)
+    record_usage(prompt_tokens, response_tokens)
 
 
 def get_usage_stats() -> Dict[str, Any]:
@@ -71,9 +137,13 @@ def get_usage_stats() -> Dict[str, Any]:
       - estimated_input_cost_usd
       - estimated_output_cost_usd
       - estimated_total_cost_usd
+      - summary_cache: hit/miss/eviction counters of the in-memory cache tier
+      - budget: current summarization tier, ceilings, windowed spend and
+        recent tier changes
+
+    Totals cover every backend process (they share usage_store's database).
     """
-    with _USAGE_LOCK:
-        stats = dict(_USAGE_STATS)  # shallow copy
+    stats: Dict[str, Any] = read_usage()
 
     input_cost = stats["prompt_tokens"] / 1_000_000 * COST_INPUT_PER_M
     output_cost = stats["response_tokens"] / 1_000_000 * COST_OUTPUT_PER_M
@@ -82,6 +152,8 @@ def get_usage_stats() -> Dict[str, Any]:
     stats["estimated_input_cost_usd"] = round(input_cost, 6)
     stats["estimated_output_cost_usd"] = round(output_cost, 6)
     stats["estimated_total_cost_usd"] = round(total_cost, 6)
+    stats["summary_cache"] = get_cache_stats()
+    stats["budget"] = _BUDGET.stats()
 
     return stats
 
@@ -94,13 +166,17 @@ def _build_summary_prompt(
     description: Optional[str],
     topics: List[str],
     url: Optional[str] = None,
+    short: bool = False,
 ) -> str:
     """
     Build a concise prompt for the LLM using title + snippet + topics.
+    short=True (budget "short" tier) trims the snippet, drops the URL
+    and asks for a single sentence.
     """
     topics_str = ", ".join(topics) if topics else "the user's interests"
-    desc_text = description or "(No description provided.)"
-    url_part = f"\nURL: {url}" if url else ""
+    desc_text = _prompt_snippet(description, short)
+    url_part = f"\nURL: {url}" if url and not short else ""
+    length = _summary_length(short)
 
     prompt = f"""
 You are a concise news assistant.
@@ -111,7 +187,7 @@ Title: {title}
 Snippet: {desc_text}{url_part}
 
 Task:
-- Write a clear, neutral, 2–3 sentence summary of what this article is about.
+- Write a clear, neutral, {length} summary of what this article is about.
 - Focus on the main idea and why it might matter to someone interested in the topics above.
 - Do NOT use bullet points.
 - Do NOT include headers, markdown, or emojis.
@@ -121,6 +197,215 @@ Task:
     return prompt
 
 
+def _prompt_snippet(description: Optional[str], short: bool) -> str:
+    desc_text = description or "(No description provided.)"
+    if short and len(desc_text) > SHORT_SNIPPET_CHARS:
+        desc_text = desc_text[:SHORT_SNIPPET_CHARS] + "..."
+    return desc_text
+
+
+def _summary_length(short: bool) -> str:
+    return "one-sentence (at most 30 words)" if short else "2–3 sentence"
+
+
+def _build_batch_prompt(articles: List[Dict[str, Any]], topics: List[str], short: bool = False) -> str:
+    """
+    Build one prompt covering several articles. The model is asked to reply
+    with a JSON array of {"id": <n>, "summary": "..."} objects.
+    """
+    topics_str = ", ".join(topics) if topics else "the user's interests"
+    length = _summary_length(short)
+
+    blocks = []
+    for n, a in enumerate(articles, start=1):
+        desc_text = _prompt_snippet(a.get("description"), short)
+        url_part = f"\nURL: {a['url']}" if a.get("url") and not short else ""
+        blocks.append(f"[{n}]\nTitle: {a['title']}\nSnippet: {desc_text}{url_part}")
+    articles_str = "\n\n".join(blocks)
+
+    prompt = f"""
+You are a concise news assistant.
+
+User interests: {topics_str}
+
+Articles:
+
+{articles_str}
+
+Task:
+- For EACH article above, write a clear, neutral, {length} summary of what it is about.
+- Focus on the main idea and why it might matter to someone interested in the topics above.
+- Do NOT use bullet points, headers, markdown, or emojis inside the summaries.
+- Return ONLY a JSON array, one object per article, in this exact form:
+  [{{"id": 1, "summary": "..."}}, {{"id": 2, "summary": "..."}}]
+""".strip()
+
+    return prompt
+
+
+def _parse_batch_response(text: str, count: int) -> Dict[int, str]:
+    """
+    Parse the JSON array returned for a batch prompt.
+    Returns {article_number: summary} for every well-formed item (1-based).
+    Raises ValueError if the response is not a JSON array.
+    """
+    body = text.strip()
+    # Models sometimes wrap JSON in a ```json fence despite instructions
+    if body.startswith("```"):
+        body = body.strip("`")
+        if body.lower().startswith("json"):
+            body = body[4:]
+
+    data = json.loads(body)
+    if not isinstance(data, list):
+        raise ValueError("batch response is not a JSON array")
+
+    parsed: Dict[int, str] = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        try:
+            n = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        summary = item.get("summary")
+        if 1 <= n <= count and isinstance(summary, str) and summary.strip():
+            parsed[n] = summary.strip()
+    return parsed
+
+
+def _response_text(response: Any) -> str:
+    """
+    Reply text, or "" if there is none or it was cut off at max_output_tokens.
+    Either way the reply is final: a retry would pay for the same outcome.
+    """
+    candidates = getattr(response, "candidates", None) or []
+    finish_reason = getattr(candidates[0], "finish_reason", None) if candidates else None
+    if getattr(finish_reason, "name", None) == "MAX_TOKENS":
+        print("[WARN] Gemini reply hit max_output_tokens; discarding it.")
+        return ""
+    try:
+        return (response.text or "").strip()
+    except ValueError as e:
+        # .text raises when the reply has no text parts (e.g. blocked)
+        print(f"[WARN] Gemini reply has no text: {e}")
+        return ""
+
+
+def _read_response(response: Any) -> Tuple[str, int, int]:
+    """
+    Pull (text, prompt_tokens, response_tokens) out of a Gemini response
+    and record the usage (also for empty replies: those tokens are billed).
+    """
+    text = _response_text(response)
+
+    # Extract token usage (if available)
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) if usage else 0
+    response_tokens = getattr(usage, "candidates_token_count", 0) if usage else 0
+
+    _record_usage(prompt_tokens, response_tokens)
+    return text, prompt_tokens, response_tokens
+
+
+def _call_gemini(
+    prompt: str,
+    max_retries: int,
+    retry_delay: float,
+    max_output_tokens: Optional[int] = None,
+) -> Optional[Tuple[str, int, int]]:
+    """
+    Send a prompt to Gemini with rate limiting, retries and usage tracking.
+    Returns (text, prompt_tokens, response_tokens), or None if every attempt failed.
+    """
+    config = {"max_output_tokens": max_output_tokens} if max_output_tokens else None
+    last_error: Optional[Exception] = None
+
+    for attempt in range(1, max_retries + 1):
+        with timed(GEMINI_RATE_LIMIT_WAIT_SECONDS, span="gemini_wait"):
+            _RATE_LIMITER.acquire()
+        try:
+            with timed(GEMINI_CALL_SECONDS, span="gemini"):
+                response = _get_model().generate_content(prompt, generation_config=config)
+            return _read_response(response)
+
+        except Exception as e:
+            last_error = e
+            print(f"[WARN] Gemini call failed (attempt {attempt}/{max_retries}): {e}")
+            if attempt < max_retries:
+                GEMINI_RETRIES_TOTAL.inc()
+                time.sleep(backoff_delay(attempt, retry_delay))
+
+    print(f"[ERROR] All Gemini attempts failed. Last error: {last_error}")
+    return None
+
+
+async def _call_gemini_async(
+    prompt: str,
+    max_retries: int,
+    retry_delay: float,
+    max_output_tokens: Optional[int] = None,
+) -> Optional[Tuple[str, int, int]]:
+    """
+    Async version of _call_gemini (generate_content_async, non-blocking waits).
+    """
+    config = {"max_output_tokens": max_output_tokens} if max_output_tokens else None
+    last_error: Optional[Exception] = None
+
+    for attempt in range(1, max_retries + 1):
+        with timed(GEMINI_RATE_LIMIT_WAIT_SECONDS, span="gemini_wait"):
+            await _RATE_LIMITER.acquire_async()
+        try:
+            # The first build imports the SDK: do it off the event loop
+            model = _MODEL if _MODEL is not None else await asyncio.to_thread(_get_model)
+            with timed(GEMINI_CALL_SECONDS, span="gemini"):
+                response = await model.generate_content_async(prompt, generation_config=config)
+            # Usage is recorded in SQLite: keep it off the event loop
+            return await asyncio.to_thread(_read_response, response)
+
+        except Exception as e:
+            last_error = e
+            print(f"[WARN] Gemini call failed (attempt {attempt}/{max_retries}): {e}")
+            if attempt < max_retries:
+                GEMINI_RETRIES_TOTAL.inc()
+                await asyncio.sleep(backoff_delay(attempt, retry_delay))
+
+    print(f"[ERROR] All Gemini attempts failed. Last error: {last_error}")
+    return None
+
+
+def _finish_summary(
+    result: Optional[Tuple[str, int, int]],
+    title: str,
+    description: Optional[str],
+    topics: List[str],
+    url: Optional[str],
+) -> str:
+    """
+    Turn a single-article Gemini result into the summary text,
+    caching it on success and falling back otherwise.
+    """
+    if result is None:
+        return _fallback_summary(title, description, topics)
+
+    summary_text, prompt_tokens, response_tokens = result
+    if not summary_text:
+        print("[WARN] Gemini returned empty summary; using fallback.")
+        return _fallback_summary(title, description, topics)
+
+    save_cached_summary(
+        url=url,
+        title=title,
+        description=description,
+        summary=summary_text,
+        model=GEMINI_MODEL_NAME,
+        prompt_tokens=prompt_tokens,
+        response_tokens=response_tokens,
+    )
+
+    return summary_text
+
+
 def summarize_article(
     title: str,
     description: Optional[str],
@@ -131,61 +416,210 @@ def summarize_article(
 ) -> str:
     """
     Summarize an article using Gemini 2.5 Flash, with:
-      - JSON cache by URL
+      - summary cache by URL
       - usage tracking
+      - token-bucket rate limiting (GEMINI_RPM / GEMINI_BURST)
+      - jittered exponential backoff between retries (base 'retry_delay')
+      - spend ceilings (budget tier: full / short / cache_only / fallback)
       - fallback on failure / missing key
+    Safe to call from several threads at once.
     """
-    # 1) Check cache first
+    # 1) Check cache first (free, so in every budget tier)
     cached = get_cached_summary(url)
     if cached:
         return cached
 
-    # 2) If no API key, skip Gemini and fallback
-    if not GEMINI_API_KEY:
+    # 2) If no API key (or budget only allows cached summaries), fallback
+    tier = _BUDGET.tier()
+    if not GEMINI_API_KEY or tier in ("cache_only", "fallback"):
         return _fallback_summary(title, description, topics)
 
-    prompt = _build_summary_prompt(title, description, topics, url)
+    short = tier == "short"
+    prompt = _build_summary_prompt(title, description, topics, url, short=short)
+    result = _call_gemini(prompt, max_retries, retry_delay, SHORT_MAX_OUTPUT_TOKENS if short else None)
+    return _finish_summary(result, title, description, topics, url)
 
-    last_error: Optional[Exception] = None
 
-    for attempt in range(1, max_retries + 1):
-        try:
-            model = genai.GenerativeModel(GEMINI_MODEL_NAME)
-            response = model.generate_content(prompt)
-
-            summary_text = (response.text or "").strip()
-            if not summary_text:
-                print("[WARN] Gemini returned empty summary; using fallback.")
-                return _fallback_summary(title, description, topics)
-
-            # Extract token usage (if available)
-            usage = getattr(response, "usage_metadata", None)
-            prompt_tokens = getattr(usage, "prompt_token_count", 0) if usage else 0
-            response_tokens = getattr(usage, "candidates_token_count", 0) if usage else 0
-
-            _record_usage(prompt_tokens, response_tokens)
-            save_cached_summary(
-                url=url,
-                title=title,
-                description=description,
-                summary=summary_text,
-                model=GEMINI_MODEL_NAME,
-                prompt_tokens=prompt_tokens,
-                response_tokens=response_tokens,
-            )
+async def summarize_article_async(
+    title: str,
+    description: Optional[str],
+    topics: List[str],
+    url: Optional[str] = None,
+    max_retries: int = 3,
+    retry_delay: float = 1.5,
+) -> str:
+    """
+    Async version of summarize_article (same cache, limits, budget and fallback).
+    Budget, cache and usage reads/writes hit SQLite (with a busy timeout when
+    several workers contend), so they run in worker threads, not on the loop.
+    """
+    cached = await asyncio.to_thread(get_cached_summary, url)
+    if cached:
+        return cached
 
-            return summary_text
+    tier = await asyncio.to_thread(_BUDGET.tier)
+    if not GEMINI_API_KEY or tier in ("cache_only", "fallback"):
+        return _fallback_summary(title, description, topics)
 
-        except Exception as e:
-            last_error = e
-            print(f"[WARN] Gemini summarization failed (attempt {attempt}/{max_retries}): {e}")
-            if attempt < max_retries:
-                time.sleep(retry_delay)
-            else:
-                break
+    short = tier == "short"
+    prompt = _build_summary_prompt(title, description, topics, url, short=short)
+    result = await _call_gemini_async(prompt, max_retries, retry_delay, SHORT_MAX_OUTPUT_TOKENS if short else None)
+    return await asyncio.to_thread(_finish_summary, result, title, description, topics, url)
 
-    print(f"[ERROR] All Gemini attempts failed. Last error: {last_error}")
-    return _fallback_summary(title, description, topics)
+
+def _start_batch(
+    articles: List[Dict[str, Any]],
+    topics: List[str],
+) -> Tuple[List[Optional[str]], List[int], bool]:
+    """
+    Fill in cached (or, without an API key / budget, fallback) summaries.
+    Returns (summaries, indexes still needing Gemini, short prompt?).
+    """
+    summaries: List[Optional[str]] = [get_cached_summary(a.get("url")) for a in articles]
+    pending = [idx for idx, s in enumerate(summaries) if not s]
+
+    tier = _BUDGET.tier()
+    if pending and (not GEMINI_API_KEY or tier in ("cache_only", "fallback")):
+        for idx in pending:
+            a = articles[idx]
+            summaries[idx] = _fallback_summary(a["title"], a.get("description"), topics)
+        pending = []
+
+    return summaries, pending, tier == "short"
+
+
+def _apply_batch_result(
+    result: Optional[Tuple[str, int, int]],
+    articles: List[Dict[str, Any]],
+    pending: List[int],
+    summaries: List[Optional[str]],
+    topics: List[str],
+) -> List[int]:
+    """
+    Parse a batch response into 'summaries' and cache each summary with an
+    even share of the call's tokens. Returns the indexes still missing
+    (to be re-run singly).
+
+    If the call itself failed (every retry used up) or came back empty or
+    cut off, the pending articles get _fallback_summary instead: re-running
+    them one by one would only repeat the failing or capped calls.
+    """
+    if result is None or not result[0]:
+        for idx in pending:
+            a = articles[idx]
+            summaries[idx] = _fallback_summary(a["title"], a.get("description"), topics)
+        return []
+
+    text, prompt_tokens, response_tokens = result
+    parsed: Dict[int, str] = {}
+    try:
+        parsed = _parse_batch_response(text, len(pending))
+    except ValueError as e:
+        print(f"[WARN] Could not parse batch summary response; retrying singly: {e}")
+
+    share = len(pending)
+    for n, summary_text in parsed.items():
+        idx = pending[n - 1]
+        a = articles[idx]
+        summaries[idx] = summary_text
+        save_cached_summary(
+            url=a.get("url"),
+            title=a["title"],
+            description=a.get("description"),
+            summary=summary_text,
+            model=GEMINI_MODEL_NAME,
+            prompt_tokens=prompt_tokens // share,
+            response_tokens=response_tokens // share,
+        )
+
+    return [idx for idx in pending if not summaries[idx]]
+
+
+def summarize_articles_batch(
+    articles: List[Dict[str, Any]],
+    topics: List[str],
+    max_retries: int = 3,
+    retry_delay: float = 1.5,
+) -> List[str]:
+    """
+    Summarize several articles with a single Gemini request.
+
+    - Cached articles are answered from the cache and left out of the prompt
+    - Uncached ones are packed into one structured prompt (_build_batch_prompt)
+    - Token usage is recorded once for the call; each cache entry stores
+      an even share of it
+    - Articles missing from an unparseable or partial response are re-run
+      one by one with summarize_article(); if the call fails outright,
+      they get the fallback summary
+
+    Each article is a dict with title, description (optional) and url.
+    Returns summaries in the same order as 'articles'.
+    """
+    summaries, pending, short = _start_batch(articles, topics)
+
+    if len(pending) > 1:
+        batch = [articles[idx] for idx in pending]
+        result = _call_gemini(
+            _build_batch_prompt(batch, topics, short),
+            max_retries,
+            retry_delay,
+            SHORT_MAX_OUTPUT_TOKENS * len(batch) if short else None,
+        )
+        pending = _apply_batch_result(result, articles, pending, summaries, topics)
+
+    # Singles, and anything the batch call didn't cover
+    for idx in pending:
+        a = articles[idx]
+        summaries[idx] = summarize_article(
+            title=a["title"],
+            description=a.get("description"),
+            topics=topics,
+            url=a.get("url"),
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+        )
+
+    return [s or "" for s in summaries]
+
+
+async def summarize_articles_batch_async(
+    articles: List[Dict[str, Any]],
+    topics: List[str],
+    max_retries: int = 3,
+    retry_delay: float = 1.5,
+) -> List[str]:
+    """
+    Async version of summarize_articles_batch (SQLite work runs in worker threads).
+    """
+    summaries, pending, short = await asyncio.to_thread(_start_batch, articles, topics)
+
+    if len(pending) > 1:
+        batch = [articles[idx] for idx in pending]
+        result = await _call_gemini_async(
+            _build_batch_prompt(batch, topics, short),
+            max_retries,
+            retry_delay,
+            SHORT_MAX_OUTPUT_TOKENS * len(batch) if short else None,
+        )
+        pending = await asyncio.to_thread(_apply_batch_result, result, articles, pending, summaries, topics)
+
+    singles = await asyncio.gather(
+        *(
+            summarize_article_async(
+                title=articles[idx]["title"],
+                description=articles[idx].get("description"),
+                topics=topics,
+                url=articles[idx].get("url"),
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+            )
+            for idx in pending
+        )
+    )
+    for idx, summary_text in zip(pending, singles):
+        summaries[idx] = summary_text
+
+    return [s or "" for s in summaries]
 
 
 def _fallback_summary(
@@ -0,0 +1,174 @@
+# backend/budget.py
+
+"""
+Token / dollar budget controller for Gemini usage.
+
+- Ceilings: tokens and USD per minute and per day (0 = no ceiling)
+- Usage comes from usage_store's per-minute buckets, so every backend
+  process sees the same spend
+  * "minute" is a sliding 60 s window: the current bucket plus the part
+    of the previous bucket that still falls inside the window
+  * "day" is the last 1440 buckets
+- The tightest ceiling decides the tier (fraction = used / ceiling):
+  * full        fraction < short_at
+  * short       fraction < cache_only_at   (shorter prompt, optional output cap)
+  * cache_only  fraction < 1.0             (cached summaries, else fallback)
+  * fallback    budget spent               (same as cache_only: cache reads
+                                            are free; reported separately)
+- The tier is recomputed at most every refresh_seconds; tier changes are
+  logged and kept (most recent first) for /usage
+"""
+
+import time
+from collections import deque
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Dict, Any, Optional, Tuple
+
+from usage_store import read_minutes
+
+TIERS = ("full", "short", "cache_only", "fallback")
+
+
+class BudgetController:
+    """
+    Maps recent Gemini spend onto a summary tier. tier() re-reads the
+    shared usage buckets at most every refresh_seconds and otherwise
+    returns the cached tier, so it is cheap to call per article.
+    """
+
+    def __init__(
+        self,
+        tokens_per_minute: int = 0,
+        tokens_per_day: int = 0,
+        usd_per_minute: float = 0.0,
+        usd_per_day: float = 0.0,
+        cost_input_per_m: float = 0.0,
+        cost_output_per_m: float = 0.0,
+        short_at: float = 0.7,
+        cache_only_at: float = 0.9,
+        refresh_seconds: float = 1.0,
+    ) -> None:
+        self.limits = {
+            "tokens_per_minute": tokens_per_minute,
+            "tokens_per_day": tokens_per_day,
+            "usd_per_minute": usd_per_minute,
+            "usd_per_day": usd_per_day,
+        }
+        self.cost_input_per_m = cost_input_per_m
+        self.cost_output_per_m = cost_output_per_m
+        self.short_at = short_at
+        self.cache_only_at = cache_only_at
+        self.refresh_seconds = refresh_seconds
+
+        self._lock = Lock()
+        self._tier = "full"
+        self._checked_at = 0.0
+        self._usage: Dict[str, Dict[str, float]] = {}
+        self._fraction = 0.0
+        self._binding: Optional[str] = None
+        self._changes: deque = deque(maxlen=20)
+
+    @property
+    def enabled(self) -> bool:
+        return any(v > 0 for v in self.limits.values())
+
+    def _cost(self, prompt_tokens: float, response_tokens: float) -> float:
+        return prompt_tokens / 1_000_000 * self.cost_input_per_m + response_tokens / 1_000_000 * self.cost_output_per_m
+
+    def _read_usage(self) -> Dict[str, Dict[str, float]]:
+        now = time.time()
+        minute = int(now // 60)
+        buckets = read_minutes(minute - 24 * 60 + 1, minute)
+
+        def _window(weights: Dict[int, float]) -> Dict[str, float]:
+            prompt = sum(buckets[m]["prompt_tokens"] * w for m, w in weights.items() if m in buckets)
+            response = sum(buckets[m]["response_tokens"] * w for m, w in weights.items() if m in buckets)
+            return {"tokens": round(prompt + response, 1), "usd": round(self._cost(prompt, response), 6)}
+
+        # Weight of the previous bucket = share of it still inside the last 60 s
+        previous_weight = 1.0 - (now % 60) / 60.0
+        return {
+            "minute": _window({minute: 1.0, minute - 1: previous_weight}),
+            "day": {
+                "tokens": sum(b["prompt_tokens"] + b["response_tokens"] for b in buckets.values()),
+                "usd": round(
+                    self._cost(
+                        sum(b["prompt_tokens"] for b in buckets.values()),
+                        sum(b["response_tokens"] for b in buckets.values()),
+                    ),
+                    6,
+                ),
+            },
+        }
+
+    def _fraction_used(self, usage: Dict[str, Dict[str, float]]) -> Tuple[float, Optional[str]]:
+        """
+        Return (highest used/ceiling fraction, name of that ceiling).
+        """
+        used = {
+            "tokens_per_minute": usage["minute"]["tokens"],
+            "tokens_per_day": usage["day"]["tokens"],
+            "usd_per_minute": usage["minute"]["usd"],
+            "usd_per_day": usage["day"]["usd"],
+        }
+        fraction, binding = 0.0, None
+        for name, limit in self.limits.items():
+            if limit > 0 and used[name] / limit >= fraction:
+                fraction, binding = used[name] / limit, name
+        return fraction, binding
+
+    def _tier_for(self, fraction: float) -> str:
+        if fraction >= 1.0:
+            return "fallback"
+        if fraction >= self.cache_only_at:
+            return "cache_only"
+        if fraction >= self.short_at:
+            return "short"
+        return "full"
+
+    def tier(self) -> str:
+        """
+        Current summarization tier (see module docstring).
+        """
+        if not self.enabled:
+            return "full"
+
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.refresh_seconds:
+                return self._tier
+
+        usage = self._read_usage()
+        fraction, binding = self._fraction_used(usage)
+        new_tier = self._tier_for(fraction)
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+            self._usage, self._fraction, self._binding = usage, fraction, binding
+            if new_tier != self._tier:
+                print(f"[INFO] Gemini budget tier {self._tier} -> {new_tier} ({binding} at {fraction:.0%}).")
+                self._changes.appendleft(
+                    {
+                        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                        "from": self._tier,
+                        "to": new_tier,
+                        "limit": binding,
+                        "fraction": round(fraction, 4),
+                    }
+                )
+                self._tier = new_tier
+            return self._tier
+
+    def stats(self) -> Dict[str, Any]:
+        tier = self.tier()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "tier": tier,
+                "limits": dict(self.limits),
+                "usage": {k: dict(v) for k, v in self._usage.items()},
+                "fraction_used": round(self._fraction, 4),
+                "binding_limit": self._binding,
+                "thresholds": {"short": self.short_at, "cache_only": self.cache_only_at, "fallback": 1.0},
+                "tier_changes": list(self._changes),
+            }
@@ -1,51 +1,228 @@
 # backend/cache.py
 
 """
-File-based JSON cache for article summaries.
+SQLite-backed cache for article summaries.
 
-- Keyed by URL
+- Keyed by URL (primary key index, so lookups don't scan the cache)
 - Stores: title, description, summary, model, token usage, created_at
-- Thread-safe via a simple lock
+- WAL journal mode: each save is a single atomic transaction, and readers
+  don't block on writers
+- Stored at CACHE_DB_PATH (env, default next to this file)
+- One connection per thread; safe to share between worker processes
+  (SQLite file locking, 10 s busy timeout)
+- On first use, entries from the old summary_cache.json are imported once
+  and the JSON file is renamed to summary_cache.json.migrated
+- A bounded in-process LRU tier sits in front of SQLite; entries are
+  evicted when the memory budget is exceeded (or, if SUMMARY_TTL_SECONDS
+  is set, when they outlive it; then get_cached_summary() misses and the
+  summary is regenerated)
 """
 
 import json
+import os
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
 from pathlib import Path
-from threading import Lock
-from datetime import datetime
-from typing import Optional, Dict, Any
+from threading import Lock, local
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Tuple
 
+from metrics import CACHE_LOOKUP_SECONDS, record_span
+
+CACHE_DB_PATH = Path(os.getenv("CACHE_DB_PATH", str(Path(__file__).parent / "summary_cache.db")))
+# Legacy whole-file JSON cache, only read for the one-time migration
 CACHE_FILE_PATH = Path(__file__).parent / "summary_cache.json"
+
 _CACHE_LOCK = Lock()
+_THREAD_LOCAL = local()
+_INITIALIZED = False
+
+# Memory tier limits. An optional TTL (SUMMARY_TTL_SECONDS > 0) also bounds
+# how long a summary is served from the SQLite store: older entries are
+# treated as misses and regenerated (at Gemini cost). The default, 0, keeps
+# summaries forever, as the cache always did; only the size limits evict.
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_MEMORY_MAX_ENTRIES", "1000"))
+MEMORY_CACHE_MAX_BYTES = int(os.getenv("SUMMARY_MEMORY_MAX_BYTES", str(8 * 1024 * 1024)))
+SUMMARY_TTL_SECONDS = float(os.getenv("SUMMARY_TTL_SECONDS", "0"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    url TEXT PRIMARY KEY,
+    title TEXT,
+    description TEXT,
+    summary TEXT NOT NULL,
+    model TEXT,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    response_tokens INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+)
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(str(CACHE_DB_PATH), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _migrate_json_cache(conn: sqlite3.Connection) -> None:
+    """
+    Import entries from the legacy JSON cache file, then rename it
+    so the import only happens once.
+    """
+    if not CACHE_FILE_PATH.exists():
+        return
+
+    try:
+        with CACHE_FILE_PATH.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"[WARN] Could not read legacy summary cache for migration: {e}")
+        return
 
+    rows = []
+    if isinstance(data, dict):
+        for url, entry in data.items():
+            if not isinstance(entry, dict) or not entry.get("summary"):
+                continue
+            rows.append(
+                (
+                    url,
+                    entry.get("title"),
+                    entry.get("description"),
+                    entry["summary"],
+                    entry.get("model"),
+                    int(entry.get("prompt_tokens") or 0),
+                    int(entry.get("response_tokens") or 0),
+                    entry.get("created_at") or datetime.utcnow().isoformat(),
+                )
+            )
 
-def _load_cache() -> Dict[str, Any]:
+    with conn:
+        # Don't clobber anything already written to the new store
+        conn.executemany(
+            "INSERT OR IGNORE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    try:
+        CACHE_FILE_PATH.rename(CACHE_FILE_PATH.with_name(CACHE_FILE_PATH.name + ".migrated"))
+    except FileNotFoundError:
+        # Another worker process migrated (and renamed) it at the same time
+        return
+    print(f"[INFO] Migrated {len(rows)} cached summaries from {CACHE_FILE_PATH.name}.")
+
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Return this thread's connection, creating the schema (and running
+    the JSON migration) the first time any thread connects.
+    """
+    global _INITIALIZED
+
+    conn = getattr(_THREAD_LOCAL, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _THREAD_LOCAL.conn = conn
+
+    if not _INITIALIZED:
+        with _CACHE_LOCK:
+            if not _INITIALIZED:
+                with conn:
+                    conn.execute(_SCHEMA)
+                _migrate_json_cache(conn)
+                _INITIALIZED = True
+
+    return conn
+
+
+# ---------- In-memory LRU/TTL tier ---------- #
+
+
+class MemoryCache:
     """
-    Load the entire cache from disk.
-    Returns a dict: {url: { ...entry... }, ...}
+    Size-bounded LRU cache with per-entry TTL, kept in front of SQLite so
+    hot summaries skip the database.
+
+    Size is the approximate memory of the key + summary strings, checked
+    against max_bytes; max_entries bounds the count as well.
     """
-    with _CACHE_LOCK:
-        if not CACHE_FILE_PATH.exists():
-            return {}
 
-        try:
-            with CACHE_FILE_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, dict):
-                return data
-            # If file structure is weird, start fresh
-            return {}
-        except Exception:
-            # If file is corrupted or unreadable, start fresh
-            return {}
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        # url -> (summary, expires_at, size)
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions_lru": 0, "evictions_ttl": 0}
 
+    def _expires_at(self, created_at: float) -> float:
+        return created_at + self.ttl_seconds if self.ttl_seconds > 0 else float("inf")
 
-def _save_cache(cache: Dict[str, Any]) -> None:
+    def _drop(self, url: str) -> None:
+        _, _, size = self._entries.pop(url)
+        self._bytes -= size
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            summary, expires_at, _ = entry
+            if time.time() >= expires_at:
+                self._drop(url)
+                self._stats["evictions_ttl"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(url)
+            self._stats["hits"] += 1
+            return summary
+
+    def put(self, url: str, summary: str, created_at: Optional[float] = None) -> None:
+        size = sys.getsizeof(url) + sys.getsizeof(summary)
+        if size > self.max_bytes:
+            return
+        expires_at = self._expires_at(created_at if created_at is not None else time.time())
+        with self._lock:
+            if url in self._entries:
+                self._drop(url)
+            self._entries[url] = (summary, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats["evictions_lru"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["max_bytes"] = self.max_bytes
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+
+_MEMORY_CACHE = MemoryCache(MEMORY_CACHE_MAX_ENTRIES, MEMORY_CACHE_MAX_BYTES, SUMMARY_TTL_SECONDS)
+
+
+def get_cache_stats() -> Dict[str, Any]:
     """
-    Save the entire cache to disk (overwrite).
+    Return hit/miss/eviction counters and size of the in-memory tier.
     """
-    with _CACHE_LOCK:
-        with CACHE_FILE_PATH.open("w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+    return _MEMORY_CACHE.stats()
+
+
+# ---------- Public API ---------- #
 
 
 def get_cached_summary(url: Optional[str]) -> Optional[str]:
@@ -55,11 +232,65 @@ def get_cached_summary(url: Optional[str]) -> Optional[str]:
     if not url:
         return None
 
-    cache = _load_cache()
-    entry = cache.get(url)
-    if entry and isinstance(entry, dict):
-        return entry.get("summary")
-    return None
+    start = time.perf_counter()
+    summary, result = _lookup_summary(url)
+    elapsed = time.perf_counter() - start
+    CACHE_LOOKUP_SECONDS.observe(elapsed, cache="summary", result=result)
+    record_span("summary_cache", elapsed)
+    return summary
+
+
+def _lookup_summary(url: str) -> Tuple[Optional[str], str]:
+    """
+    Returns (summary, result) with result "hit_memory", "hit_sqlite" or "miss".
+    """
+    summary = _MEMORY_CACHE.get(url)
+    if summary is not None:
+        return summary, "hit_memory"
+
+    try:
+        row = _get_conn().execute(
+            "SELECT summary, created_at FROM summaries WHERE url = ?", (url,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"[WARN] Summary cache lookup failed: {e}")
+        return None, "miss"
+
+    if not row:
+        return None, "miss"
+
+    summary, created_at = row
+    try:
+        created_ts = datetime.fromisoformat(created_at).replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        created_ts = time.time()
+
+    if SUMMARY_TTL_SECONDS > 0 and time.time() - created_ts >= SUMMARY_TTL_SECONDS:
+        # Stale: let the caller regenerate (and overwrite) it
+        return None, "miss"
+
+    _MEMORY_CACHE.put(url, summary, created_at=created_ts)
+    return summary, "hit_sqlite"
+
+
+def get_cached_usage(url: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Return (prompt_tokens, response_tokens) stored with the cached summary
+    for this URL, or None if there is no entry.
+    """
+    if not url:
+        return None
+
+    try:
+        row = _get_conn().execute(
+            "SELECT prompt_tokens, response_tokens FROM summaries WHERE url = ?", (url,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"[WARN] Summary cache lookup failed: {e}")
+        return None
+
+    return (int(row[0]), int(row[1])) if row else None
+
 
 def save_cached_summary(
     url: Optional[str],
@@ -77,17 +308,24 @@ def save_cached_summary(
         # No URL = nothing to key on
         return
 
-    cache = _load_cache()
+    try:
+        conn = _get_conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    title,
+                    description,
+                    summary,
+                    model,
+                    int(prompt_tokens),
+                    int(response_tokens),
+                    datetime.utcnow().isoformat(),
+                ),
+            )
+    except sqlite3.Error as e:
+        print(f"[WARN] Summary cache write failed: {e}")
 
-    cache[url] = {
-        "url": url,
-        "title": title,
-        "description": description,
-        "summary": summary,
-        "model": model,
-        "prompt_tokens": int(prompt_tokens),
-        "response_tokens": int(response_tokens),
-        "created_at": datetime.utcnow().isoformat(),
-    }
+    _MEMORY_CACHE.put(url, summary)
 
-    _save_cache(cache)
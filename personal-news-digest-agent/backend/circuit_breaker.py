@@ -0,0 +1,176 @@
+# backend/circuit_breaker.py
+
+"""
+Per-source circuit breakers + health tracking for upstream requests.
+
+- One breaker per source name ("hackernews" and the RSS_FEEDS names)
+- Every upstream HTTP request records success/failure and latency
+- closed -> open when either
+  * BREAKER_FAILURE_THRESHOLD consecutive failures, or
+  * error rate >= BREAKER_ERROR_RATE over the last BREAKER_WINDOW requests
+    (once at least BREAKER_MIN_REQUESTS have been seen)
+- open: requests fail fast (no network) for BREAKER_OPEN_SECONDS
+- half-open: one probe request at a time; success closes the breaker,
+  failure re-opens it
+- Requests we cancel ourselves (deadlines) are not failures: they are
+  released without recording an outcome
+- get_breaker_stats() reports state, error rate and latency percentiles
+"""
+
+import os
+import time
+from collections import deque
+from threading import Lock
+from typing import Dict, Any, List
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_ERROR_RATE = float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "50"))
+BREAKER_MIN_REQUESTS = int(os.getenv("BREAKER_MIN_REQUESTS", "10"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a request is refused because the source's breaker is open.
+    """
+    pass
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+class CircuitBreaker:
+    """
+    Breaker for one source: call before_request() first, then exactly one
+    of record_success(), record_failure() or release() per request.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._consecutive_failures = 0
+        self._outcomes: deque = deque(maxlen=BREAKER_WINDOW)  # True = success
+        self._latencies: deque = deque(maxlen=BREAKER_WINDOW)
+        self._totals = {"requests": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def before_request(self) -> None:
+        """
+        Call before an upstream request. Raises CircuitOpenError if the
+        breaker refuses it.
+        """
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < BREAKER_OPEN_SECONDS:
+                    self._totals["rejected"] += 1
+                    raise CircuitOpenError(f"Circuit open for source '{self.name}'")
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+
+            if self._state == HALF_OPEN:
+                if self._probe_in_flight:
+                    self._totals["rejected"] += 1
+                    raise CircuitOpenError(f"Circuit half-open for source '{self.name}' (probe in flight)")
+                self._probe_in_flight = True
+
+    def release(self) -> None:
+        """
+        End a request without an outcome (we cancelled it ourselves, e.g.
+        at a deadline): nothing is recorded, and a half-open probe slot
+        is freed for the next request.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._totals["opened"] += 1
+        print(f"[WARN] Circuit opened for source '{self.name}'.")
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._totals["requests"] += 1
+            self._outcomes.append(True)
+            self._latencies.append(latency)
+            self._consecutive_failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._probe_in_flight = False
+                self._outcomes.clear()
+
+    def record_failure(self, latency: float) -> None:
+        with self._lock:
+            self._totals["requests"] += 1
+            self._totals["failures"] += 1
+            self._outcomes.append(False)
+            self._latencies.append(latency)
+            self._consecutive_failures += 1
+
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            if self._state == OPEN:
+                return
+
+            failures = self._outcomes.count(False)
+            if self._consecutive_failures >= BREAKER_FAILURE_THRESHOLD or (
+                len(self._outcomes) >= BREAKER_MIN_REQUESTS
+                and failures / len(self._outcomes) >= BREAKER_ERROR_RATE
+            ):
+                self._open()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            outcomes = list(self._outcomes)
+            stats: Dict[str, Any] = dict(self._totals)
+            stats["state"] = self._state
+            stats["consecutive_failures"] = self._consecutive_failures
+            if self._state == OPEN:
+                stats["retry_in_seconds"] = round(
+                    max(0.0, BREAKER_OPEN_SECONDS - (time.monotonic() - self._opened_at)), 3
+                )
+
+        stats["error_rate"] = round(outcomes.count(False) / len(outcomes), 4) if outcomes else 0.0
+        stats["latency_ms"] = {
+            "p50": round(_percentile(latencies, 50) * 1000, 1),
+            "p95": round(_percentile(latencies, 95) * 1000, 1),
+            "p99": round(_percentile(latencies, 99) * 1000, 1),
+            "samples": len(latencies),
+        }
+        return stats
+
+
+_BREAKERS_LOCK = Lock()
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(source)
+        if breaker is None:
+            breaker = _BREAKERS[source] = CircuitBreaker(source)
+        return breaker
+
+
+def get_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return breaker state, error rate and latency percentiles per source.
+    """
+    with _BREAKERS_LOCK:
+        breakers = dict(_BREAKERS)
+    return {name: b.stats() for name, b in sorted(breakers.items())}
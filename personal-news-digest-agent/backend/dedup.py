@@ -0,0 +1,172 @@
+# backend/dedup.py
+
+"""
+URL canonicalization and near-duplicate story clustering.
+
+- canonicalize_url() lowercases scheme/host, drops "www.", fragments,
+  trailing slashes and tracking params (utm_*, fbclid, ...), so the same
+  link shared by two feeds dedups exactly; it is a comparison key only
+  and may not load (scheme/host rewritten), so never show it to users
+- cluster_articles() groups stories that are near-duplicates (the same
+  news from HN, The Verge and Ars Technica) by the Jaccard similarity of
+  their title words; descriptions are ignored (HN has none, and each
+  feed writes its own)
+  * candidates are found with MinHash banding: MINHASH_BANDS bands of
+    MINHASH_ROWS values; pairs sharing a band are then checked exactly
+    against JACCARD_THRESHOLD
+  * the default 0.8 keeps an extra or dropped word on a 4+ word title
+    together, while unrelated stories from the benchmark fixtures
+    (small vocabulary, up to 0.75 similar) stay apart
+  * each cluster keeps its first article (canonical source order) and lists
+    the others under "alternates", so it takes one digest slot and gets
+    one summary; source filters match any member (in_sources())
+"""
+
+import hashlib
+import os
+import random
+import re
+from typing import List, Dict, Any, Optional, FrozenSet, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+JACCARD_THRESHOLD = float(os.getenv("DEDUP_JACCARD_THRESHOLD", "0.8"))
+MINHASH_BANDS = 10
+MINHASH_ROWS = 3
+
+# Universal hashing (a * h + b) mod p stands in for random permutations
+_MERSENNE_61 = (1 << 61) - 1
+_perm_rng = random.Random(20240601)
+_PERMS = [
+    (_perm_rng.randrange(1, _MERSENNE_61), _perm_rng.randrange(0, _MERSENNE_61))
+    for _ in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+
+# Compared lowercased
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "ref_url", "cmp", "cmpid", "smid", "smtyp", "ncid",
+    "ocid", "taid", "guccounter",
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was",
+    "will", "with", "after", "over", "new", "says", "said",
+}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different links to the same page compare
+    equal. For dedup keys only: keep the original URL on the article.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = "https" if parts.scheme.lower() in ("http", "https") else parts.scheme.lower()
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip("/") or "/"
+
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def title_tokens(article: Dict[str, Any]) -> FrozenSet[str]:
+    """
+    Lowercased title words with stopwords removed.
+    """
+    return frozenset(
+        tok for tok in _TOKEN_RE.findall((article.get("title") or "").lower()) if tok not in _STOPWORDS
+    )
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(tokens: FrozenSet[str]) -> Optional[Tuple[int, ...]]:
+    """
+    MinHash signature of a token set (None if the set is empty).
+    """
+    if not tokens:
+        return None
+    hashes = [_token_hash(tok) for tok in tokens]
+    return tuple(min((a * h + b) % _MERSENNE_61 for h in hashes) for a, b in _PERMS)
+
+
+def in_sources(article: Dict[str, Any], allowed: set) -> bool:
+    """
+    True if the article or any of its alternates comes from an allowed
+    source (a cluster is usually led by its HN copy).
+    """
+    if article["source"] in allowed:
+        return True
+    return any(alt["source"] in allowed for alt in article.get("alternates") or ())
+
+
+def cluster_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapse near-duplicate articles. Input order decides which article
+    represents a cluster (the first one). Each returned article carries
+    an "alternates" list of {"source", "url"} for the rest of its cluster;
+    a representative without a description borrows one from an alternate.
+    """
+    n = len(articles)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    tokens = [title_tokens(a) for a in articles]
+    buckets: Dict[tuple, List[int]] = {}
+
+    for i, tok in enumerate(tokens):
+        sig = minhash(tok)
+        if sig is None:
+            continue
+        for band in range(MINHASH_BANDS):
+            key = (band, sig[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+            for j in buckets.get(key, ()):
+                if find(i) != find(j) and jaccard(tok, tokens[j]) >= JACCARD_THRESHOLD:
+                    # Union, keeping the earlier article as root
+                    ri, rj = find(i), find(j)
+                    parent[max(ri, rj)] = min(ri, rj)
+            buckets.setdefault(key, []).append(i)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+
+    result: List[Dict[str, Any]] = []
+    for root in sorted(clusters):
+        members = clusters[root]
+        rep = dict(articles[members[0]])
+        others = [articles[i] for i in members[1:]]
+        rep["alternates"] = [{"source": a["source"], "url": a["url"]} for a in others]
+        if not rep.get("description"):
+            rep["description"] = next((a["description"] for a in others if a.get("description")), None)
+        result.append(rep)
+
+    return result
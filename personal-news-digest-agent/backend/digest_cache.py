@@ -0,0 +1,234 @@
+# backend/digest_cache.py
+
+"""
+Result cache + request coalescing for finished digests.
+
+- Keyed by normalized (topics, sources, max_articles, ranking) plus the article
+  snapshot version, so a new ingestion cycle naturally invalidates results
+- Entries expire after DIGEST_CACHE_TTL seconds; oldest entries are dropped
+  beyond DIGEST_CACHE_MAX_ENTRIES
+- Single-flight: concurrent identical requests wait on one in-flight
+  computation instead of each running the pipeline
+- Requests with a deadline use peek()/store() instead: they never wait on
+  someone else's (possibly slower) computation, and only complete
+  (non-degraded) results are stored
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from typing import Optional, List, Dict, Any, Tuple, Callable, Hashable, Awaitable
+
+from metrics import CACHE_LOOKUP_SECONDS, record_span
+
+DIGEST_CACHE_TTL = float(os.getenv("DIGEST_CACHE_TTL", "120"))
+DIGEST_CACHE_MAX_ENTRIES = int(os.getenv("DIGEST_CACHE_MAX_ENTRIES", "256"))
+
+
+def make_digest_key(
+    topics: List[str],
+    allowed_sources: Optional[List[str]],
+    max_articles: int,
+    snapshot_version: int,
+    ranking: str = "keyword",
+) -> Tuple[Hashable, ...]:
+    """
+    Normalize a digest request into a cache key.
+    Topic matching is case-insensitive and order-independent, so
+    ["AI", "startups"] and ["startups", "ai"] share a key.
+    """
+    norm_topics = tuple(sorted({t.strip().lower() for t in topics if t.strip()}))
+    norm_sources = tuple(sorted(set(allowed_sources))) if allowed_sources else None
+    return (norm_topics, norm_sources, int(max_articles), int(snapshot_version), ranking)
+
+
+class DigestCache:
+    """
+    TTL + size-bounded cache of finished digests. Concurrent requests for
+    the same key wait for the first one's result instead of recomputing it.
+    """
+
+    def __init__(self, ttl_seconds: float = DIGEST_CACHE_TTL, max_entries: int = DIGEST_CACHE_MAX_ENTRIES) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = Lock()
+        # key -> (expires_at, result)
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def _lookup(self, key: Hashable) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Future], bool]:
+        """
+        Returns (cached_result, future, is_leader). If there's no cached
+        result, the caller either waits on 'future' or (as leader) computes
+        and calls _finish().
+        """
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() >= entry[0]:
+                del self._entries[key]
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                cached, fut, leader, result = entry[1], None, False, "hit"
+            else:
+                fut = self._inflight.get(key)
+                leader = fut is None
+                if leader:
+                    fut = Future()
+                    self._inflight[key] = fut
+                    self._stats["misses"] += 1
+                else:
+                    self._stats["coalesced"] += 1
+                cached, result = None, "miss" if leader else "coalesced"
+
+        _observe_lookup(start, result)
+        return cached, fut, leader
+
+    def _finish(
+        self,
+        key: Hashable,
+        fut: Future,
+        result: Optional[List[Dict[str, Any]]] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            if error is None:
+                self._entries[key] = (time.time() + self.ttl_seconds, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+
+        # A follower's cancellation can't reach the future (shielded), but
+        # don't let an already-settled one fail the leader either
+        if fut.done():
+            return
+        if error is None:
+            fut.set_result(result)
+        else:
+            fut.set_exception(error)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the cached result for 'key', join an in-flight computation
+        for it, or run 'compute' and cache what it returns.
+        Errors are not cached; every waiter sees the leader's exception.
+        """
+        cached, fut, leader = self._lookup(key)
+        if cached is not None:
+            return _copy_result(cached)
+
+        if not leader:
+            return _copy_result(fut.result())
+
+        try:
+            result = compute()
+        except BaseException as e:
+            self._finish(key, fut, error=e)
+            raise
+
+        self._finish(key, fut, result=result)
+        return _copy_result(result)
+
+    async def get_or_compute_async(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[List[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of get_or_compute. Waiting on an in-flight computation
+        (sync or async) doesn't block the event loop, and a cancelled waiter
+        (client gone, deadline) doesn't cancel it for the others.
+        """
+        cached, fut, leader = self._lookup(key)
+        if cached is not None:
+            return _copy_result(cached)
+
+        if not leader:
+            return _copy_result(await asyncio.shield(asyncio.wrap_future(fut)))
+
+        try:
+            result = await compute()
+        except BaseException as e:
+            self._finish(key, fut, error=e)
+            raise
+
+        self._finish(key, fut, result=result)
+        return _copy_result(result)
+
+    def peek(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the cached result for 'key' (or None) without joining or
+        starting a computation.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() < entry[0]:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                result = _copy_result(entry[1])
+            else:
+                self._stats["misses"] += 1
+                result = None
+
+        _observe_lookup(start, "miss" if result is None else "hit")
+        return result
+
+    def store(self, key: Hashable, result: List[Dict[str, Any]]) -> None:
+        """
+        Cache a result computed outside get_or_compute().
+        """
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, _copy_result(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["inflight"] = len(self._inflight)
+        requests_total = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_rate"] = (
+            round((stats["hits"] + stats["coalesced"]) / requests_total, 4) if requests_total else 0.0
+        )
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+
+def _observe_lookup(start: float, result: str) -> None:
+    elapsed = time.perf_counter() - start
+    CACHE_LOOKUP_SECONDS.observe(elapsed, cache="digest", result=result)
+    record_span("digest_cache", elapsed)
+
+
+def _copy_result(result: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Callers get their own list/dicts so they can't mutate the cached copy
+    return [dict(a) for a in result]
+
+
+DIGEST_CACHE = DigestCache()
+
+
+def get_digest_cache_stats() -> Dict[str, Any]:
+    """
+    Return hit/miss/coalesced counters of the digest result cache.
+    """
+    return DIGEST_CACHE.stats()
@@ -0,0 +1,241 @@
+# backend/feed_parser.py
+
+"""
+Bounded RSS/Atom parsing.
+
+- parse_feed() normalizes the first 'limit' entries of a feed into our
+  article dicts
+- "incremental" mode (default) feeds the document to a stdlib pull parser
+  in chunks and stops as soon as 'limit' entries are complete, so a big
+  feed isn't fully parsed when we only use the first 20 items
+- Anything the incremental parser can't handle (malformed XML, unknown
+  format) falls back to feedparser, which parses the whole document
+- Atom title/summary/content with type="html" are entity-unescaped in
+  both paths, so "A &amp; B" reaches ranking and dedup as "A & B"
+- Optional process pool (FEED_PARSE_PROCESSES > 0): feeds larger than
+  FEED_PROCESS_MIN_BYTES are parsed in a worker process so heavy parsing
+  doesn't hold the GIL for other requests' threads or the event loop.
+  The app starts it at startup (start_pool, in main.lifespan) with the
+  "forkserver" start method: forking this multithreaded process could
+  hand the child locks (logging, SQLite, ...) held by other threads.
+  Without start_pool(), feeds are parsed in-process.
+"""
+
+import asyncio
+import html
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import List, Dict, Any, Optional
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+import feedparser
+
+FEED_PARSER_MODE = os.getenv("FEED_PARSER_MODE", "incremental")  # or "feedparser"
+FEED_PARSE_PROCESSES = int(os.getenv("FEED_PARSE_PROCESSES", "0"))
+FEED_PROCESS_MIN_BYTES = int(os.getenv("FEED_PROCESS_MIN_BYTES", str(256 * 1024)))
+
+_CHUNK_SIZE = 16 * 1024
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+_ITEM_TAGS = {"item", f"{_RSS1}item", f"{_ATOM}entry"}
+
+
+def _text(elem: Any, *tags: str) -> Optional[str]:
+    for tag in tags:
+        child = elem.find(tag)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _atom_text(elem: Any, *tags: str) -> Optional[str]:
+    """
+    Like _text(), but unescapes type="html" Atom text constructs.
+    """
+    for tag in tags:
+        child = elem.find(tag)
+        if child is not None and child.text and child.text.strip():
+            text = child.text.strip()
+            return html.unescape(text) if child.get("type") == "html" else text
+    return None
+
+
+def _atom_link(elem: Any) -> Optional[str]:
+    fallback = None
+    for link in elem.findall(f"{_ATOM}link"):
+        href = link.get("href")
+        if not href:
+            continue
+        rel = link.get("rel", "alternate")
+        if rel == "alternate":
+            return href
+        fallback = fallback or href
+    return fallback
+
+
+def _entry_from_element(elem: Any) -> Dict[str, Optional[str]]:
+    if elem.tag == f"{_ATOM}entry":
+        return {
+            "title": _atom_text(elem, f"{_ATOM}title"),
+            "link": _atom_link(elem),
+            "id": _text(elem, f"{_ATOM}id"),
+            "description": _atom_text(elem, f"{_ATOM}summary", f"{_ATOM}content"),
+        }
+
+    # RSS 2.0 (no namespace) or RSS 1.0 / RDF
+    return {
+        "title": _text(elem, "title", f"{_RSS1}title"),
+        "link": _text(elem, "link", f"{_RSS1}link"),
+        "id": _text(elem, "guid") or elem.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"),
+        "description": _text(elem, "description", f"{_RSS1}description", f"{_CONTENT}encoded"),
+    }
+
+
+def _iter_entries_incremental(content: bytes, limit: int) -> Optional[List[Dict[str, Optional[str]]]]:
+    """
+    Pull-parse up to 'limit' entries. Returns None if the document
+    isn't something we can handle here (caller falls back to feedparser).
+    """
+    parser = XMLPullParser(events=("end",))
+    entries: List[Dict[str, Optional[str]]] = []
+
+    try:
+        for offset in range(0, len(content), _CHUNK_SIZE):
+            parser.feed(content[offset:offset + _CHUNK_SIZE])
+            for _, elem in parser.read_events():
+                if elem.tag in _ITEM_TAGS:
+                    entries.append(_entry_from_element(elem))
+                    elem.clear()
+                    if len(entries) >= limit:
+                        return entries
+        parser.close()
+    except ParseError:
+        return None
+
+    # A well-formed document with no entries is probably a format we don't know
+    return entries or None
+
+
+def _feedparser_text(entry: Any, name: str, atom: bool) -> Optional[str]:
+    """
+    feedparser keeps html-typed text escaped; unescape it for Atom feeds,
+    like _atom_text() (RSS fields are all reported as html, so left alone).
+    """
+    value = getattr(entry, name, None)
+    detail = getattr(entry, f"{name}_detail", None) or {}
+    if value and atom and detail.get("type") == "text/html":
+        return html.unescape(value)
+    return value
+
+
+def _iter_entries_feedparser(content: bytes, content_type: str, limit: int) -> List[Dict[str, Optional[str]]]:
+    feed = feedparser.parse(content, response_headers={"content-type": content_type})
+    atom = (feed.get("version") or "").startswith("atom")
+    return [
+        {
+            "title": _feedparser_text(entry, "title", atom),
+            "link": getattr(entry, "link", None),
+            "id": getattr(entry, "id", None),
+            "description": _feedparser_text(entry, "summary", atom) or getattr(entry, "description", None),
+        }
+        for entry in feed.entries[:limit]
+    ]
+
+
+def parse_feed(
+    content: bytes,
+    content_type: str,
+    source_name: str,
+    limit: int,
+    mode: str = FEED_PARSER_MODE,
+) -> List[Dict[str, Any]]:
+    """
+    Parse a downloaded RSS/Atom document and normalize its first 'limit' entries.
+    Returns list of dicts with keys:
+        id, title, url, score, source, description
+    """
+    entries = _iter_entries_incremental(content, limit) if mode == "incremental" else None
+    if entries is None:
+        entries = _iter_entries_feedparser(content, content_type, limit)
+
+    articles: List[Dict[str, Any]] = []
+    for entry in entries:
+        link = entry["link"]
+        if not link:
+            # skip entries without URL
+            continue
+
+        articles.append(
+            {
+                "id": f"{source_name}-{entry['id'] or link}",
+                "title": entry["title"] or "(no title)",
+                "url": link,
+                "score": 0.0,  # RSS feeds don't have a native score
+                "source": source_name,
+                "description": entry["description"],
+            }
+        )
+
+    return articles
+
+
+# ---------- Process pool offload ---------- #
+
+_POOL_LOCK = Lock()
+_POOL: Optional[ProcessPoolExecutor] = None
+# forkserver where the platform has it (not on Windows)
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def start_pool() -> None:
+    """
+    Create the parse process pool (no-op if FEED_PARSE_PROCESSES <= 0 or
+    it already exists).
+    """
+    global _POOL
+    if FEED_PARSE_PROCESSES <= 0:
+        return
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=FEED_PARSE_PROCESSES,
+                mp_context=multiprocessing.get_context(_START_METHOD),
+            )
+
+
+def _use_pool(content: bytes) -> Optional[ProcessPoolExecutor]:
+    return _POOL if len(content) >= FEED_PROCESS_MIN_BYTES else None
+
+
+def parse_feed_offloaded(content: bytes, content_type: str, source_name: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    parse_feed(), run in the process pool for large feeds (when enabled).
+    """
+    pool = _use_pool(content)
+    if pool is None:
+        return parse_feed(content, content_type, source_name, limit)
+    return pool.submit(parse_feed, content, content_type, source_name, limit).result()
+
+
+async def parse_feed_async(content: bytes, content_type: str, source_name: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    parse_feed() off the event loop: in the process pool for large feeds
+    (when enabled), otherwise in a thread.
+    """
+    pool = _use_pool(content)
+    if pool is None:
+        return await asyncio.to_thread(parse_feed, content, content_type, source_name, limit)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, parse_feed, content, content_type, source_name, limit)
+
+
+def shutdown_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
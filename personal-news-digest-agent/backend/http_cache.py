@@ -0,0 +1,194 @@
+# backend/http_cache.py
+
+"""
+HTTP-level cache for news source requests.
+
+- Conditional GET: stores ETag / Last-Modified + body per URL and sends
+  If-None-Match / If-Modified-Since next time; a 304 reuses the stored body
+  (and any parse results stored alongside it, so unchanged feeds aren't
+  re-parsed); the least recently used URLs are dropped beyond
+  VALIDATOR_MAX_ENTRIES
+- TTL cache for immutable-ish JSON (HN items keyed by story ID), so repeated
+  ingestion cycles don't re-download every item
+- Per-source counters: requests, 304s, TTL hits, full downloads, bytes
+- Sync (requests) and async (httpx) variants share the same stored entries
+"""
+
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Dict, Any, Tuple, Hashable
+
+import httpx
+import requests
+
+from metrics import CACHE_LOOKUP_SECONDS
+
+HN_ITEM_TTL = float(os.getenv("HN_ITEM_TTL", "300"))
+TTL_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_TTL_CACHE_MAX_ENTRIES", "2000"))
+VALIDATOR_MAX_ENTRIES = int(os.getenv("HTTP_VALIDATOR_MAX_ENTRIES", "2000"))
+
+
+class HttpCache:
+    def __init__(self, max_validators: int = VALIDATOR_MAX_ENTRIES) -> None:
+        self._lock = Lock()
+        self.max_validators = max_validators
+        # url -> {"etag", "last_modified", "body", "content_type", "parsed": {key: value}}, LRU order
+        self._validators: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # key -> (expires_at, value)
+        self._ttl: Dict[Hashable, Tuple[float, Any]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    # ---------- stats ---------- #
+
+    def _count(self, source: str, field: str, amount: int = 1) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                source,
+                {"requests": 0, "not_modified": 0, "ttl_hits": 0, "downloads": 0, "bytes_downloaded": 0},
+            )
+            stats[field] += amount
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-source counters plus hit_rate = (304s + TTL hits) / requests.
+        """
+        with self._lock:
+            out = {src: dict(s) for src, s in self._stats.items()}
+        for s in out.values():
+            hits = s["not_modified"] + s["ttl_hits"]
+            s["hit_rate"] = round(hits / s["requests"], 4) if s["requests"] else 0.0
+        return out
+
+    # ---------- conditional GET ---------- #
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._validators.get(url)
+            if not entry:
+                return {}
+            self._validators.move_to_end(url)
+            headers = {}
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            return headers
+
+    def _handle_response(
+        self, url: str, source: str, status: int, headers: Any, content: bytes
+    ) -> Tuple[bytes, str, bool]:
+        if status == 304:
+            with self._lock:
+                entry = self._validators.get(url)
+            if entry is not None:
+                self._count(source, "not_modified")
+                return entry["body"], entry["content_type"], False
+            # 304 without a stored body shouldn't happen; treat as empty download
+            self._count(source, "downloads")
+            return content, headers.get("content-type", ""), True
+
+        content_type = headers.get("content-type", "")
+        self._count(source, "downloads")
+        self._count(source, "bytes_downloaded", len(content))
+
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        with self._lock:
+            if etag or last_modified:
+                self._validators[url] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "body": content,
+                    "content_type": content_type,
+                    "parsed": {},
+                }
+                self._validators.move_to_end(url)
+                while len(self._validators) > self.max_validators:
+                    self._validators.popitem(last=False)
+            else:
+                self._validators.pop(url, None)
+        return content, content_type, True
+
+    def get(self, url: str, source: str, timeout: float) -> Tuple[bytes, str, bool]:
+        """
+        GET 'url' with conditional headers (requests).
+        Returns (body, content_type, changed); changed is False on a 304.
+        Raises requests.RequestException on failure.
+        """
+        self._count(source, "requests")
+        resp = requests.get(url, timeout=timeout, headers=self._conditional_headers(url))
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        return self._handle_response(url, source, resp.status_code, resp.headers, resp.content)
+
+    async def get_async(
+        self, client: httpx.AsyncClient, url: str, source: str, timeout: float
+    ) -> Tuple[bytes, str, bool]:
+        """
+        Async version of get() (httpx). Raises httpx.HTTPError on failure.
+        """
+        self._count(source, "requests")
+        resp = await client.get(
+            url, timeout=timeout, headers=self._conditional_headers(url), follow_redirects=True
+        )
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        return self._handle_response(url, source, resp.status_code, resp.headers, resp.content)
+
+    def get_parsed(self, url: str, key: Hashable) -> Optional[Any]:
+        """
+        Return a parse result stored for the current body of 'url', if any.
+        """
+        with self._lock:
+            entry = self._validators.get(url)
+            return entry["parsed"].get(key) if entry else None
+
+    def set_parsed(self, url: str, key: Hashable, value: Any) -> None:
+        with self._lock:
+            entry = self._validators.get(url)
+            if entry is not None:
+                entry["parsed"][key] = value
+
+    # ---------- TTL cache ---------- #
+
+    def ttl_get(self, key: Hashable, source: str) -> Optional[Any]:
+        """
+        Return a cached value that hasn't expired (counts as a request + TTL hit).
+        """
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._ttl.get(key)
+            if entry is not None and time.time() >= entry[0]:
+                del self._ttl[key]
+                entry = None
+        CACHE_LOOKUP_SECONDS.observe(
+            time.perf_counter() - start, cache="http_ttl", result="miss" if entry is None else "hit"
+        )
+        if entry is None:
+            return None
+        self._count(source, "requests")
+        self._count(source, "ttl_hits")
+        return entry[1]
+
+    def ttl_set(self, key: Hashable, value: Any, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            if len(self._ttl) >= TTL_CACHE_MAX_ENTRIES:
+                for k in [k for k, (exp, _) in self._ttl.items() if exp <= now]:
+                    del self._ttl[k]
+                if len(self._ttl) >= TTL_CACHE_MAX_ENTRIES:
+                    # Still full: drop the oldest inserted entry
+                    del self._ttl[next(iter(self._ttl))]
+            self._ttl[key] = (now + ttl, value)
+
+
+HTTP_CACHE = HttpCache()
+
+
+def get_http_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return per-source HTTP cache counters and hit rates.
+    """
+    return HTTP_CACHE.stats()
@@ -0,0 +1,313 @@
+# backend/ingestion.py
+
+"""
+Background ingestion of news sources into a shared in-memory article store.
+
+- A daemon thread calls fetch_all_sources_report() every INGEST_INTERVAL seconds
+- Each refresh replaces the store's snapshot atomically (readers never see a
+  half-built list)
+- Sources that fail or time out keep their articles from the last refresh
+  they succeeded in, for at most INGEST_MAX_STALE_SECONDS; after that the
+  source's articles are dropped (stats() lists it under "expired_sources").
+  A refresh where no source succeeds keeps the previous snapshot (same
+  version) instead of publishing an empty one
+- build_digest() reads the current snapshot instead of hitting upstreams
+- get_ingestion_stats() exposes snapshot age and refresh timings for tuning
+"""
+
+import asyncio
+import os
+import time
+from threading import Event, Lock, Thread
+from typing import Optional, List, Dict, Any, Tuple, Callable
+
+from news_sources import (
+    fetch_all_sources_report,
+    fetch_all_sources_report_async,
+    merge_source_articles,
+    AGGREGATE_BUDGET,
+)
+from http_cache import get_http_cache_stats
+
+INGEST_INTERVAL = float(os.getenv("INGEST_INTERVAL", "300"))
+INGEST_LIMIT_PER_SOURCE = int(os.getenv("INGEST_LIMIT_PER_SOURCE", "30"))
+INGEST_MAX_STALE_SECONDS = float(os.getenv("INGEST_MAX_STALE_SECONDS", "3600"))
+
+
+class ArticleStore:
+    """
+    Latest merged article snapshot, plus each source's own list so a
+    source that fails a refresh keeps its previous articles. Refreshes
+    are single-flight across threads and the event loop.
+    """
+
+    def __init__(self, max_stale_seconds: float = INGEST_MAX_STALE_SECONDS) -> None:
+        self.max_stale_seconds = max_stale_seconds
+        self._lock = Lock()
+        self._refresh_lock = Lock()
+        self._articles: List[Dict[str, Any]] = []
+        # source -> raw articles from the last refresh where that source succeeded
+        self._per_source: Dict[str, List[Dict[str, Any]]] = {}
+        # source -> time.time() of its last successful refresh
+        self._source_updated_at: Dict[str, float] = {}
+        self._stale_sources: List[str] = []
+        self._expired_sources: List[str] = []
+        self._version = 0
+        self._updated_at: Optional[float] = None
+        self._last_refresh_seconds: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._failed_sources: List[str] = []
+        self._timed_out_sources: List[str] = []
+        self._refreshes = 0
+        # In-flight refresh_async() task shared by concurrent async callers
+        self._async_flight: Optional["asyncio.Task[None]"] = None
+        # Full-budget refresh started by get_snapshot() on a cold store
+        self._sync_flight: Optional[Thread] = None
+
+    def refresh(self, limit_per_source: int = INGEST_LIMIT_PER_SOURCE, budget: float = AGGREGATE_BUDGET) -> None:
+        """
+        Fetch all sources (within 'budget' seconds) and swap in the new snapshot.
+        Concurrent callers wait (at most 'budget' seconds) for the in-flight
+        refresh instead of starting another.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            # Someone else is refreshing; wait for it and reuse its result
+            self._wait_for_refresh(budget)
+            return
+
+        try:
+            started = time.monotonic()
+            try:
+                report = fetch_all_sources_report(limit_per_source=limit_per_source, budget=budget)
+            except Exception as e:
+                print(f"[WARN] Ingestion refresh failed: {e}")
+                with self._lock:
+                    self._last_error = str(e)
+                    self._last_refresh_seconds = time.monotonic() - started
+                return
+
+            self._apply_report(report, time.monotonic() - started)
+        finally:
+            self._refresh_lock.release()
+
+    def _wait_for_refresh(self, budget: float) -> None:
+        if self._refresh_lock.acquire(timeout=max(0.0, budget)):
+            self._refresh_lock.release()
+
+    async def refresh_async(
+        self, limit_per_source: int = INGEST_LIMIT_PER_SOURCE, budget: float = AGGREGATE_BUDGET
+    ) -> None:
+        """
+        Async version of refresh(), using the non-blocking source fetchers.
+        Concurrent async callers share one in-flight refresh, and a refresh
+        already running on another thread is waited for (at most 'budget'
+        seconds, off the event loop) instead of starting another.
+        """
+        await asyncio.shield(self._start_async_refresh(limit_per_source, budget))
+
+    def _start_async_refresh(
+        self, limit_per_source: int = INGEST_LIMIT_PER_SOURCE, budget: float = AGGREGATE_BUDGET
+    ) -> "asyncio.Task[None]":
+        """
+        Return the in-flight refresh task on this loop, starting one if needed.
+        """
+        loop = asyncio.get_running_loop()
+        flight = self._async_flight
+        if flight is None or flight.done() or flight.get_loop() is not loop:
+            flight = loop.create_task(self._refresh_async_once(limit_per_source, budget))
+            self._async_flight = flight
+        return flight
+
+    async def _refresh_async_once(self, limit_per_source: int, budget: float) -> None:
+        if not self._refresh_lock.acquire(blocking=False):
+            await asyncio.to_thread(self._wait_for_refresh, budget)
+            return
+
+        try:
+            started = time.monotonic()
+            try:
+                report = await fetch_all_sources_report_async(limit_per_source=limit_per_source, budget=budget)
+            except Exception as e:
+                print(f"[WARN] Ingestion refresh failed: {e}")
+                with self._lock:
+                    self._last_error = str(e)
+                    self._last_refresh_seconds = time.monotonic() - started
+                return
+
+            self._apply_report(report, time.monotonic() - started)
+        finally:
+            self._refresh_lock.release()
+
+    def _apply_report(self, report: Dict[str, Any], elapsed: float) -> None:
+        fresh = report["per_source"]
+        missing = report["failed_sources"] + report["timed_out_sources"]
+
+        with self._lock:
+            self._failed_sources = report["failed_sources"]
+            self._timed_out_sources = report["timed_out_sources"]
+            self._last_refresh_seconds = elapsed
+            self._refreshes += 1
+            if not fresh:
+                # Outage (or every breaker open): keep serving the last snapshot
+                self._last_error = "No source succeeded; kept the previous snapshot."
+                return
+            now = time.time()
+            stale: Dict[str, List[Dict[str, Any]]] = {}
+            expired: List[str] = []
+            for name in missing:
+                if name not in self._source_updated_at:
+                    continue
+                if now - self._source_updated_at[name] > self.max_stale_seconds:
+                    expired.append(name)
+                elif name in self._per_source:
+                    stale[name] = self._per_source[name]
+
+        if stale:
+            articles = merge_source_articles(report["sources"], {**stale, **fresh})
+        else:
+            articles = report["articles"]
+
+        with self._lock:
+            self._per_source = {**stale, **fresh}
+            self._source_updated_at.update((name, now) for name in fresh)
+            self._stale_sources = [name for name in report["sources"] if name in stale]
+            self._expired_sources = [name for name in report["sources"] if name in expired]
+            self._articles = articles
+            self._version += 1
+            self._updated_at = time.time()
+            self._last_error = None
+
+    def get_snapshot(self, budget: float = AGGREGATE_BUDGET) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Return (version, articles) for the current snapshot, read atomically.
+        If nothing has been ingested yet (e.g. the background loop is not
+        running), start a refresh and wait at most 'budget' seconds for it.
+        The refresh itself always gets the full AGGREGATE_BUDGET and keeps
+        going after a short-deadline caller gives up, so one request's
+        deadline never decides what goes into the shared snapshot.
+        """
+        with self._lock:
+            empty = self._updated_at is None
+            if empty and not (self._sync_flight and self._sync_flight.is_alive()):
+                self._sync_flight = Thread(target=self.refresh, name="news-ingestion-cold", daemon=True)
+                self._sync_flight.start()
+            flight = self._sync_flight
+        if empty and flight is not None:
+            flight.join(timeout=max(0.0, budget))
+
+        with self._lock:
+            return self._version, list(self._articles)
+
+    async def get_snapshot_async(self, budget: float = AGGREGATE_BUDGET) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Async version of get_snapshot() (the shared full-budget refresh
+        keeps running if this caller stops waiting).
+        """
+        with self._lock:
+            empty = self._updated_at is None
+        if empty:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._start_async_refresh()), timeout=max(0.0, budget))
+            except asyncio.TimeoutError:
+                pass
+
+        with self._lock:
+            return self._version, list(self._articles)
+
+    def get_articles(self) -> List[Dict[str, Any]]:
+        """
+        Return the articles of the current snapshot (see get_snapshot).
+        """
+        return self.get_snapshot()[1]
+
+    async def get_articles_async(self) -> List[Dict[str, Any]]:
+        """
+        Async version of get_articles().
+        """
+        return (await self.get_snapshot_async())[1]
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            age = time.time() - self._updated_at if self._updated_at is not None else None
+            return {
+                "version": self._version,
+                "articles": len(self._articles),
+                "refreshes": self._refreshes,
+                "snapshot_age_seconds": round(age, 3) if age is not None else None,
+                "last_refresh_seconds": (
+                    round(self._last_refresh_seconds, 3) if self._last_refresh_seconds is not None else None
+                ),
+                "last_error": self._last_error,
+                "failed_sources": list(self._failed_sources),
+                "timed_out_sources": list(self._timed_out_sources),
+                "stale_sources": list(self._stale_sources),
+                "expired_sources": list(self._expired_sources),
+                "max_stale_seconds": self.max_stale_seconds,
+                "interval_seconds": INGEST_INTERVAL,
+            }
+
+
+ARTICLE_STORE = ArticleStore()
+
+
+# ---------- Background loop ---------- #
+
+
+class IngestionService:
+    """
+    Periodically refreshes ARTICLE_STORE on a daemon thread.
+    Listeners are called with (version, articles) after every refresh
+    (e.g. the summary warmer); they should return quickly.
+    """
+
+    def __init__(self, store: ArticleStore, interval: float = INGEST_INTERVAL) -> None:
+        self.store = store
+        self.interval = interval
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._listeners: List[Callable[[int, List[Dict[str, Any]]], None]] = []
+
+    def add_listener(self, listener: Callable[[int, List[Dict[str, Any]]], None]) -> None:
+        self._listeners.append(listener)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.store.refresh()
+            version, articles = self.store.get_snapshot() if self.store.version else (0, [])
+            for listener in self._listeners if version else ():
+                try:
+                    listener(version, articles)
+                except Exception as e:
+                    print(f"[WARN] Ingestion listener failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="news-ingestion", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+
+INGESTION_SERVICE = IngestionService(ARTICLE_STORE)
+
+
+def get_ingestion_stats() -> Dict[str, Any]:
+    """
+    Return snapshot age, size and refresh timings of the shared article store,
+    plus per-source HTTP cache hit rates.
+    """
+    stats = ARTICLE_STORE.stats()
+    stats["http_cache"] = get_http_cache_stats()
+    return stats
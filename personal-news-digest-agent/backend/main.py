@@ -1,18 +1,55 @@
 # backend/main.py
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+
+import json
+import os
+import threading
+import time
 
-from typing import List
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse
+
+from typing import List, Iterator, Dict, Any, Optional
+
+from schemas import DigestRequest, DigestResponse, DigestPageRequest, DigestPageResponse, ArticleSummary
+from agent import build_digest_async, build_digest_page_async, stream_digest
+from ai_client import get_usage_stats, warm_model
+from ingestion import INGESTION_SERVICE, get_ingestion_stats
+from digest_cache import get_digest_cache_stats
+from feed_parser import start_pool, shutdown_pool
+from circuit_breaker import get_breaker_stats
+from warmer import SUMMARY_WARMER, get_warmer_stats
+from pagination import InvalidCursorError, ExpiredCursorError, get_pagination_stats
+from metrics import render_metrics, request_timing, server_timing_header, timed, DIGEST_STAGE_SECONDS
+
+# Add a Server-Timing header (per-stage durations) to /digest responses
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Feed parsing workers (FEED_PARSE_PROCESSES), before fetch threads need them
+    start_pool()
+    # Keep the article snapshot fresh for the lifetime of the app,
+    # pre-warming summaries of trending articles after each refresh
+    INGESTION_SERVICE.add_listener(SUMMARY_WARMER.schedule)
+    INGESTION_SERVICE.start()
+    # Import/configure the Gemini SDK now, off the event loop and without
+    # delaying startup, instead of on the first summary request
+    threading.Thread(target=warm_model, name="gemini-warm", daemon=True).start()
+    yield
+    INGESTION_SERVICE.stop()
+    SUMMARY_WARMER.stop()
+    shutdown_pool()
 
-from schemas import DigestRequest, DigestResponse, ArticleSummary
-from agent import build_digest
-from ai_client import get_usage_stats
 
 app = FastAPI(
     title="Personal News Digest Agent",
     description="Fetches recent news from multiple sources and creates a personalized digest with AI summaries.",
     version="0.2.0",
+    lifespan=lifespan,
 )
 
 # Allow Streamlit on localhost to call this API
@@ -32,16 +69,30 @@ app.add_middleware(
 )
 
 
+def _deadline_at(payload: DigestRequest) -> Optional[float]:
+    """
+    Absolute time.monotonic() deadline for a request's optional deadline_ms.
+    """
+    if payload.deadline_ms is None:
+        return None
+    return time.monotonic() + payload.deadline_ms / 1000.0
+
+
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
 
 @app.post("/digest", response_model=DigestResponse)
-def create_digest(payload: DigestRequest):
+async def create_digest(payload: DigestRequest, response: Response):
     """
     Main endpoint: build a personalized digest for the given topics.
+    Runs on the event loop (non-blocking fetches and Gemini calls),
+    so it doesn't hold a threadpool worker while waiting on upstreams.
+    With SERVER_TIMING_ENABLED=1, stage durations are returned in a
+    Server-Timing header.
     """
+    deadline_at = _deadline_at(payload)
     topics = [t.strip() for t in payload.topics if t.strip()]
     if not topics:
         raise HTTPException(status_code=400, detail="At least one non-empty topic is required.")
@@ -49,23 +100,135 @@ def create_digest(payload: DigestRequest):
     allowed_sources = payload.sources  # may be None
 
     try:
-        digest_articles = build_digest(
-            topics=topics,
-            max_articles=payload.max_articles,
-            allowed_sources=allowed_sources,
-        )
+        with request_timing() as spans, timed(DIGEST_STAGE_SECONDS, span="total", stage="total"):
+            digest_articles = await build_digest_async(
+                topics=topics,
+                max_articles=payload.max_articles,
+                allowed_sources=allowed_sources,
+                ranking=payload.ranking,
+                deadline_at=deadline_at,
+            )
     except Exception as e:
         # Catch-all for upstream/source errors
         raise HTTPException(status_code=502, detail=f"Failed to build digest: {e}")
 
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = server_timing_header(spans)
+
     articles = [ArticleSummary(**a) for a in digest_articles]
     return DigestResponse(topics=topics, articles=articles)
 
+
+@app.post("/digest/page", response_model=DigestPageResponse)
+async def create_digest_page(payload: DigestPageRequest):
+    """
+    Paginated variant of /digest: max_articles is the page size.
+    The first call (no cursor) ranks once and returns a next_cursor;
+    following it returns the next slice of the same ranked list, so
+    only that slice is summarized. Expired cursors get a 410.
+    Ranked lists are kept per process (pagination.py), so with several
+    workers a cursor must reach the worker that issued it.
+    """
+    deadline_at = _deadline_at(payload)
+    topics = [t.strip() for t in payload.topics if t.strip()]
+    if not topics and payload.cursor is None:
+        raise HTTPException(status_code=400, detail="At least one non-empty topic is required.")
+
+    try:
+        page = await build_digest_page_async(
+            topics=topics,
+            page_size=payload.max_articles,
+            allowed_sources=payload.sources,
+            ranking=payload.ranking,
+            cursor=payload.cursor,
+            deadline_at=deadline_at,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExpiredCursorError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Failed to build digest: {e}")
+
+    return DigestPageResponse(
+        topics=page["topics"],
+        articles=[ArticleSummary(**a) for a in page["articles"]],
+        next_cursor=page["next_cursor"],
+        total=page["total"],
+    )
+
+
+@app.post("/digest/stream")
+def create_digest_stream(payload: DigestRequest):
+    """
+    Streaming variant of /digest (NDJSON, one event per line):
+    the ranked article list first, then each summary as it completes.
+    The list event carries a next_cursor for /digest/page when more
+    articles are ranked. See agent.stream_digest for the event shapes.
+    """
+    deadline_at = _deadline_at(payload)
+    topics = [t.strip() for t in payload.topics if t.strip()]
+    if not topics:
+        raise HTTPException(status_code=400, detail="At least one non-empty topic is required.")
+
+    events = stream_digest(
+        topics=topics,
+        max_articles=payload.max_articles,
+        allowed_sources=payload.sources,
+        ranking=payload.ranking,
+        deadline_at=deadline_at,
+    )
+
+    # Run ranking before the response starts so failures still map to a 502
+    try:
+        first = next(events)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Failed to build digest: {e}")
+
+    def _ndjson(first_event: Dict[str, Any], rest: Iterator[Dict[str, Any]]) -> Iterator[str]:
+        yield json.dumps(first_event) + "\n"
+        try:
+            for event in rest:
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": f"Failed to build digest: {e}"}) + "\n"
+
+    return StreamingResponse(_ndjson(first, events), media_type="application/x-ndjson")
+
+
 @app.get("/usage")
 def usage():
     """
-    Return aggregate Gemini usage stats (calls, tokens, estimated cost).
+    Return aggregate Gemini usage stats (calls, tokens, estimated cost),
+    plus digest result cache counters, summary pre-warming and
+    pagination cursor stats.
+    """
+    stats = get_usage_stats()   # 👈 returns dict from ai_client
+    stats["digest_cache"] = get_digest_cache_stats()
+    stats["warmer"] = get_warmer_stats()
+    stats["pagination"] = get_pagination_stats()
+    return stats
+
+
+@app.get("/ingestion")
+def ingestion():
+    """
+    Return article snapshot age, size and refresh timings.
     """
-    return get_usage_stats()   # 👈 returns dict from ai_client
+    return get_ingestion_stats()
 
 
+@app.get("/sources/health")
+def sources_health():
+    """
+    Return per-source circuit breaker state, error rate and latency percentiles.
+    """
+    return get_breaker_stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Stage timings, cache lookups and Gemini call metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
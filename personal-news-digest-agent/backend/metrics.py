@@ -0,0 +1,212 @@
+# backend/metrics.py
+
+"""
+Stage-level timing metrics for the digest pipeline.
+
+- Histograms / counters rendered in the Prometheus text format
+  (render_metrics(), served at GET /metrics); no client library needed
+- timed() times a block into a histogram (with an "outcome" label of
+  "ok" / "error" when the histogram has one) and, optionally, into the
+  current request's spans
+- Per-request spans (request_timing()) live in a ContextVar, so they are
+  collected across the asyncio tasks of one /digest request and rendered
+  as a Server-Timing header. Work on plain worker threads is not included
+  in the spans (it still lands in the histograms).
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, List, Tuple, Optional, Iterator
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self._header()
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(list(zip(self.labelnames, key)))} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = self._header()
+        for key, values in series:
+            pairs = list(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', repr(bound))])} {_format_value(count)}")
+            lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {repr(values[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {_format_value(values[-1])}")
+        return lines
+
+
+_REGISTRY: List[_Metric] = []
+
+
+# ---------- Pipeline metrics ---------- #
+
+SOURCE_FETCH_SECONDS = Histogram(
+    "news_source_fetch_seconds", "Time to fetch one news source (all of its requests).", ("source", "outcome")
+)
+RSS_PARSE_SECONDS = Histogram("rss_parse_seconds", "Time to parse one downloaded RSS/Atom feed.", ("source",))
+DIGEST_STAGE_SECONDS = Histogram(
+    "digest_stage_seconds", "Time spent in each digest pipeline stage.", ("stage", "outcome")
+)
+CACHE_LOOKUP_SECONDS = Histogram(
+    "cache_lookup_seconds", "Cache lookup latency by cache and result (hit/miss).", ("cache", "result")
+)
+GEMINI_CALL_SECONDS = Histogram(
+    "gemini_call_seconds", "Latency of each Gemini API attempt (retries are separate attempts).", ("outcome",)
+)
+GEMINI_RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "gemini_rate_limit_wait_seconds", "Time spent waiting on the Gemini rate limiter per attempt."
+)
+GEMINI_RETRIES_TOTAL = Counter("gemini_retries_total", "Gemini attempts that failed and were retried.")
+
+
+def render_metrics() -> str:
+    """
+    All registered metrics in the Prometheus text exposition format.
+    """
+    lines: List[str] = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------- Per-request spans (Server-Timing) ---------- #
+
+# span name -> [total seconds, count]; None outside request_timing()
+_REQUEST_SPANS: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("request_spans", default=None)
+
+
+@contextmanager
+def request_timing() -> Iterator[Dict[str, List[float]]]:
+    """
+    Collect spans recorded (in this context) while the block runs.
+    """
+    spans: Dict[str, List[float]] = {}
+    token = _REQUEST_SPANS.set(spans)
+    try:
+        yield spans
+    finally:
+        _REQUEST_SPANS.reset(token)
+
+
+def record_span(name: str, seconds: float) -> None:
+    spans = _REQUEST_SPANS.get()
+    if spans is None:
+        return
+    entry = spans.setdefault(name, [0.0, 0])
+    entry[0] += seconds
+    entry[1] += 1
+
+
+def server_timing_header(spans: Dict[str, List[float]]) -> str:
+    """
+    Render spans as a Server-Timing header value (durations in ms).
+    """
+    parts = []
+    for name, (seconds, count) in spans.items():
+        part = f"{name};dur={seconds * 1000:.1f}"
+        if count > 1:
+            part += f';desc="{int(count)}x"'
+        parts.append(part)
+    return ", ".join(parts)
+
+
+@contextmanager
+def timed(histogram: Histogram, span: Optional[str] = None, **labels: str) -> Iterator[None]:
+    """
+    Time the block into 'histogram' (and the request span 'span', if given).
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        if "outcome" in histogram.labelnames:
+            labels["outcome"] = outcome
+        histogram.observe(elapsed, **labels)
+        if span is not None:
+            record_span(span, elapsed)
@@ -1,12 +1,41 @@
 # backend/news_sources.py
 
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+
 import requests
-import feedparser
-from typing import List, Dict, Any
+import httpx
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+
+from dedup import canonicalize_url, cluster_articles
+from http_cache import HTTP_CACHE, HN_ITEM_TTL
+from feed_parser import parse_feed_offloaded, parse_feed_async
+from circuit_breaker import get_breaker, CircuitOpenError
+from metrics import timed, SOURCE_FETCH_SECONDS, RSS_PARSE_SECONDS
 
 HN_TOPSTORIES_URL = "https://hacker-news.firebaseio.com/v0/topstories.json"
 HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{id}.json"
 
+# Item fetches run on a bounded worker pool. Items that have not arrived
+# when the deadline (seconds, counted from the start of the call, so it
+# includes the topstories request) expires are skipped like failed items.
+HN_MAX_WORKERS = int(os.getenv("HN_MAX_WORKERS", "10"))
+HN_BATCH_DEADLINE = float(os.getenv("HN_BATCH_DEADLINE", "8"))
+HN_TOPSTORIES_TIMEOUT = 5.0
+
+# Per-source HTTP timeout for RSS feeds, and the overall time budget
+# (seconds) for fetch_all_sources. Sources still running when the budget
+# is spent are reported as timed out and their results are dropped.
+# Hacker News gets the budget (less _HN_BUDGET_MARGIN) as its deadline,
+# so it returns the items it has instead of timing out as a whole.
+RSS_TIMEOUT = float(os.getenv("RSS_TIMEOUT", "5"))
+AGGREGATE_BUDGET = float(os.getenv("AGGREGATE_BUDGET", "10"))
+_HN_BUDGET_MARGIN = 0.25
+
 
 class NewsSourceError(Exception):
     """
@@ -15,89 +44,170 @@ class NewsSourceError(Exception):
     pass
 
 
+# ---------- Circuit-breaker guarded requests ---------- #
+#
+# Every upstream request goes through its source's breaker (see
+# circuit_breaker.py): outcomes and latency are recorded, and while the
+# breaker is open requests fail fast with CircuitOpenError instead of
+# waiting on a source that is down.
+
+
+def _guarded_get(url: str, source: str, timeout: float) -> Tuple[bytes, str, bool]:
+    breaker = get_breaker(source)
+    breaker.before_request()
+    start = time.monotonic()
+    try:
+        result = HTTP_CACHE.get(url, source, timeout=timeout)
+    except BaseException:
+        breaker.record_failure(time.monotonic() - start)
+        raise
+    breaker.record_success(time.monotonic() - start)
+    return result
+
+
+async def _guarded_get_async(
+    client: httpx.AsyncClient, url: str, source: str, timeout: float
+) -> Tuple[bytes, str, bool]:
+    breaker = get_breaker(source)
+    breaker.before_request()
+    start = time.monotonic()
+    try:
+        result = await HTTP_CACHE.get_async(client, url, source, timeout=timeout)
+    except asyncio.CancelledError:
+        # Cancelled by our own deadline, not an upstream failure
+        breaker.release()
+        raise
+    except BaseException:
+        breaker.record_failure(time.monotonic() - start)
+        raise
+    breaker.record_success(time.monotonic() - start)
+    return result
+
+
 # ---------- Hacker News ---------- #
 
 
-def fetch_hn_top_stories(limit: int = 50) -> List[Dict[str, Any]]:
+def _fetch_hn_item(story_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a single HN item and normalize it.
+    Returns None if the request fails or the item is not a story.
+    """
+    item = HTTP_CACHE.ttl_get(("hn-item", story_id), "hackernews")
+    if item is None:
+        try:
+            body, _, _ = _guarded_get(HN_ITEM_URL.format(id=story_id), "hackernews", timeout=5)
+            item = json.loads(body) or {}
+        except (requests.RequestException, CircuitOpenError, ValueError):
+            return None
+        HTTP_CACHE.ttl_set(("hn-item", story_id), item, HN_ITEM_TTL)
+
+    return _normalize_hn_item(story_id, item)
+
+
+def _normalize_hn_item(story_id: int, item: Any) -> Optional[Dict[str, Any]]:
+    """
+    Turn a raw HN item into our article dict (None if it isn't a story).
+    """
+    if not item or item.get("type") != "story":
+        return None
+
+    title = item.get("title") or "(no title)"
+    url = item.get("url") or f"https://news.ycombinator.com/item?id={story_id}"
+    score = float(item.get("score") or 0)
+
+    return {
+        "id": f"hn-{story_id}",
+        "title": title,
+        "url": url,
+        "score": score,
+        "source": "hackernews",
+        "description": None,  # HN doesn't provide summary
+    }
+
+
+def fetch_hn_top_stories(
+    limit: int = 50,
+    max_workers: int = HN_MAX_WORKERS,
+    deadline: float = HN_BATCH_DEADLINE,
+) -> List[Dict[str, Any]]:
     """
     Fetch top stories from Hacker News (up to 'limit').
+
+    Items are fetched concurrently (at most 'max_workers' at a time).
+    Anything that fails or is still pending 'deadline' seconds after the
+    call started is skipped. Results keep the HN rank order.
+
     Returns a list of dicts with keys:
         id, title, url, score, source, description
     """
+    deadline_at = time.monotonic() + deadline
     try:
-        resp = requests.get(HN_TOPSTORIES_URL, timeout=5)
-        resp.raise_for_status()
-    except requests.RequestException as e:
+        body, _, _ = _guarded_get(
+            HN_TOPSTORIES_URL, "hackernews", timeout=max(0.05, min(HN_TOPSTORIES_TIMEOUT, deadline))
+        )
+    except (requests.RequestException, CircuitOpenError) as e:
         raise NewsSourceError(f"Failed to fetch top story IDs: {e}")
 
     try:
-        ids = resp.json()
+        ids = json.loads(body)
     except ValueError as e:
         raise NewsSourceError(f"Invalid JSON from HN: {e}")
 
-    articles: List[Dict[str, Any]] = []
-    for story_id in ids[:limit]:
-        try:
-            item_resp = requests.get(HN_ITEM_URL.format(id=story_id), timeout=5)
-            item_resp.raise_for_status()
-            item = item_resp.json()
-        except (requests.RequestException, ValueError):
-            continue
-
-        if not item or item.get("type") != "story":
-            continue
-
-        title = item.get("title") or "(no title)"
-        url = item.get("url") or f"https://news.ycombinator.com/item?id={story_id}"
-        score = float(item.get("score") or 0)
-
-        articles.append(
-            {
-                "id": f"hn-{story_id}",
-                "title": title,
-                "url": url,
-                "score": score,
-                "source": "hackernews",
-                "description": None,  # HN doesn't provide summary
-            }
-        )
+    ids = ids[:limit]
+    if not ids:
+        return []
 
-    return articles
+    results: List[Optional[Dict[str, Any]]] = [None] * len(ids)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids))))
+    try:
+        futures = {executor.submit(_fetch_hn_item, story_id): idx for idx, story_id in enumerate(ids)}
+        done, not_done = wait(futures, timeout=max(0.0, deadline_at - time.monotonic()))
+
+        for fut in done:
+            results[futures[fut]] = fut.result()
+
+        if not_done:
+            print(f"[WARN] {len(not_done)} HN items missed the {deadline}s deadline; skipping.")
+    finally:
+        # Don't block on stragglers; queued items are dropped.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return [a for a in results if a is not None]
 
 
 # ---------- Generic RSS Fetcher ---------- #
 
 
-def fetch_rss_feed(url: str, source_name: str, limit: int = 20) -> List[Dict[str, Any]]:
+def fetch_rss_feed(
+    url: str,
+    source_name: str,
+    limit: int = 20,
+    timeout: float = RSS_TIMEOUT,
+) -> List[Dict[str, Any]]:
     """
     Fetch articles from an RSS/Atom feed and normalize them.
+    The download is done with requests so it honours 'timeout'
+    (feedparser.parse(url) has no timeout of its own), as a conditional
+    GET through HTTP_CACHE; an unchanged feed reuses its last parse.
     Returns list of dicts with keys:
         id, title, url, score, source, description
     """
-    feed = feedparser.parse(url)
-    articles: List[Dict[str, Any]] = []
-
-    for entry in feed.entries[:limit]:
-        title = getattr(entry, "title", "(no title)")
-        link = getattr(entry, "link", None)
-        if not link:
-            # skip entries without URL
-            continue
-
-        desc = getattr(entry, "summary", None) or getattr(entry, "description", None)
-
-        articles.append(
-            {
-                "id": f"{source_name}-{getattr(entry, 'id', link)}",
-                "title": title,
-                "url": link,
-                "score": 0.0,  # RSS feeds don't have a native score
-                "source": source_name,
-                "description": desc,
-            }
-        )
+    try:
+        body, content_type, changed = _guarded_get(url, source_name, timeout=timeout)
+    except (requests.RequestException, CircuitOpenError) as e:
+        raise NewsSourceError(f"Failed to fetch feed '{source_name}': {e}")
 
-    return articles
+    # Unchanged feed (304): reuse the articles parsed from this body last time
+    if not changed:
+        cached = HTTP_CACHE.get_parsed(url, limit)
+        if cached is not None:
+            return list(cached)
+
+    with timed(RSS_PARSE_SECONDS, span="rss_parse", source=source_name):
+        articles = parse_feed_offloaded(body, content_type, source_name, limit)
+    HTTP_CACHE.set_parsed(url, limit, articles)
+    return list(articles)
 
 
 # ---------- Multi-source Aggregator ---------- #
@@ -112,34 +222,275 @@ RSS_FEEDS = [
 ]
 
 
-def fetch_all_sources(limit_per_source: int = 20) -> List[Dict[str, Any]]:
+def _hn_deadline(budget: float) -> float:
+    """
+    HN deadline that ends inside an aggregate budget of 'budget' seconds.
+    """
+    return max(0.0, min(HN_BATCH_DEADLINE, budget - _HN_BUDGET_MARGIN))
+
+
+def _source_fetchers(limit_per_source: int, budget: float) -> List[Tuple[str, Callable[[], List[Dict[str, Any]]]]]:
+    """
+    Return (source_name, fetch_fn) pairs in the canonical merge order:
+    Hacker News first, then RSS_FEEDS in the order they are listed.
+    """
+    fetchers: List[Tuple[str, Callable[[], List[Dict[str, Any]]]]] = [
+        ("hackernews", partial(fetch_hn_top_stories, limit=limit_per_source, deadline=_hn_deadline(budget))),
+    ]
+    for feed_url, source_name in RSS_FEEDS:
+        fetchers.append((source_name, partial(fetch_rss_feed, feed_url, source_name, limit=limit_per_source)))
+    return fetchers
+
+
+def _timed_fetch(name: str, fn: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    with timed(SOURCE_FETCH_SECONDS, span="fetch", source=name):
+        return fn()
+
+
+def fetch_all_sources_report(
+    limit_per_source: int = 20,
+    budget: float = AGGREGATE_BUDGET,
+) -> Dict[str, Any]:
+    """
+    Fetch all sources concurrently within 'budget' seconds.
+
+    Returns a dict with:
+      - articles: combined list, deduplicated by URL
+      - sources: every source, in canonical order
+      - per_source: raw articles of each source that succeeded
+      - failed_sources: sources that raised an error
+      - timed_out_sources: sources that had not finished when the budget ran out
+
+    Articles are merged in the canonical source order (see _source_fetchers),
+    not in completion order, so rankings are stable between runs.
+    """
+    fetchers = _source_fetchers(limit_per_source, budget)
+    per_source: Dict[str, List[Dict[str, Any]]] = {}
+    failed_sources: List[str] = []
+    timed_out_sources: List[str] = []
+
+    executor = ThreadPoolExecutor(max_workers=len(fetchers))
+    try:
+        futures = {executor.submit(_timed_fetch, name, fn): name for name, fn in fetchers}
+        done, not_done = wait(futures, timeout=budget)
+
+        for fut in done:
+            name = futures[fut]
+            try:
+                per_source[name] = fut.result()
+            except Exception as e:
+                print(f"[WARN] Source '{name}' failed: {e}")
+                failed_sources.append(name)
+
+        for fut in not_done:
+            name = futures[fut]
+            print(f"[WARN] Source '{name}' missed the {budget}s budget; skipping.")
+            timed_out_sources.append(name)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return _merge_report([name for name, _ in fetchers], per_source, failed_sources, timed_out_sources)
+
+
+def _merge_report(
+    order: List[str],
+    per_source: Dict[str, List[Dict[str, Any]]],
+    failed_sources: List[str],
+    timed_out_sources: List[str],
+) -> Dict[str, Any]:
+    """
+    Build the fetch_all_sources_report() result (see merge_source_articles).
+    'per_source' holds the raw articles of every source that succeeded.
+    """
+    return {
+        "articles": merge_source_articles(order, per_source),
+        "sources": list(order),
+        "per_source": per_source,
+        "failed_sources": sorted(failed_sources, key=order.index),
+        "timed_out_sources": sorted(timed_out_sources, key=order.index),
+    }
+
+
+def merge_source_articles(order: List[str], per_source: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Dedupe by canonical URL while walking sources in canonical order,
+    then collapse near-duplicate stories (see dedup.py). The canonical
+    form is only the dedup key; articles keep the URL their source gave.
+    """
+    deduped: Dict[str, Dict[str, Any]] = {}
+    for name in order:
+        for a in per_source.get(name, []):
+            key = canonicalize_url(a["url"])
+            if key not in deduped:
+                deduped[key] = a
+
+    return cluster_articles(list(deduped.values()))
+
+
+def fetch_all_sources(
+    limit_per_source: int = 20,
+    budget: float = AGGREGATE_BUDGET,
+) -> List[Dict[str, Any]]:
     """
     Fetch articles from multiple sources (Hacker News + RSS feeds)
     and return a combined, deduplicated list.
     """
-    all_articles: List[Dict[str, Any]] = []
+    return fetch_all_sources_report(limit_per_source=limit_per_source, budget=budget)["articles"]
 
-    # 1. Hacker News
-    try:
-        hn_articles = fetch_hn_top_stories(limit=limit_per_source)
-        all_articles.extend(hn_articles)
-    except NewsSourceError as e:
-        print(f"[WARN] Hacker News source failed: {e}")
 
-    # 2. RSS feeds
-    for feed_url, source_name in RSS_FEEDS:
+# ---------- Async variants ---------- #
+#
+# Same behaviour as the functions above, but non-blocking (httpx), so an
+# asyncio caller never ties up a worker thread waiting on the network.
+# Feed parsing is CPU work and runs off the loop (see feed_parser.parse_feed_async).
+
+
+async def _fetch_hn_item_async(client: httpx.AsyncClient, story_id: int) -> Optional[Dict[str, Any]]:
+    item = HTTP_CACHE.ttl_get(("hn-item", story_id), "hackernews")
+    if item is None:
         try:
-            rss_articles = fetch_rss_feed(feed_url, source_name, limit=limit_per_source)
-            all_articles.extend(rss_articles)
-        except Exception as e:
-            print(f"[WARN] RSS source '{source_name}' failed: {e}")
+            body, _, _ = await _guarded_get_async(client, HN_ITEM_URL.format(id=story_id), "hackernews", timeout=5)
+            item = json.loads(body) or {}
+        except (httpx.HTTPError, CircuitOpenError, ValueError):
+            return None
+        HTTP_CACHE.ttl_set(("hn-item", story_id), item, HN_ITEM_TTL)
 
-    # Deduplicate by URL
-    deduped: Dict[str, Dict[str, Any]] = {}
-    for a in all_articles:
-        url = a["url"]
-        if url not in deduped:
-            deduped[url] = a
+    return _normalize_hn_item(story_id, item)
+
+
+async def fetch_hn_top_stories_async(
+    limit: int = 50,
+    max_concurrency: int = HN_MAX_WORKERS,
+    deadline: float = HN_BATCH_DEADLINE,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_hn_top_stories (same ordering and deadline rules).
+    """
+    if client is None:
+        async with httpx.AsyncClient() as own_client:
+            return await fetch_hn_top_stories_async(limit, max_concurrency, deadline, own_client)
 
-    return list(deduped.values())
+    deadline_at = time.monotonic() + deadline
+    try:
+        body, _, _ = await _guarded_get_async(
+            client, HN_TOPSTORIES_URL, "hackernews", timeout=max(0.05, min(HN_TOPSTORIES_TIMEOUT, deadline))
+        )
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        raise NewsSourceError(f"Failed to fetch top story IDs: {e}")
 
+    try:
+        ids = json.loads(body)
+    except ValueError as e:
+        raise NewsSourceError(f"Invalid JSON from HN: {e}")
+
+    ids = ids[:limit]
+    if not ids:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _bounded(story_id: int) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await _fetch_hn_item_async(client, story_id)
+
+    tasks = [asyncio.create_task(_bounded(story_id)) for story_id in ids]
+    done, not_done = await asyncio.wait(tasks, timeout=max(0.0, deadline_at - time.monotonic()))
+    for task in not_done:
+        task.cancel()
+    if not_done:
+        await asyncio.gather(*not_done, return_exceptions=True)
+        print(f"[WARN] {len(not_done)} HN items missed the {deadline}s deadline; skipping.")
+
+    # tasks is in rank order; keep only the ones that finished with a story
+    return [task.result() for task in tasks if task in done and task.result() is not None]
+
+
+async def fetch_rss_feed_async(
+    url: str,
+    source_name: str,
+    limit: int = 20,
+    timeout: float = RSS_TIMEOUT,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_rss_feed.
+    """
+    if client is None:
+        async with httpx.AsyncClient() as own_client:
+            return await fetch_rss_feed_async(url, source_name, limit, timeout, own_client)
+
+    try:
+        body, content_type, changed = await _guarded_get_async(client, url, source_name, timeout=timeout)
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        raise NewsSourceError(f"Failed to fetch feed '{source_name}': {e}")
+
+    if not changed:
+        cached = HTTP_CACHE.get_parsed(url, limit)
+        if cached is not None:
+            return list(cached)
+
+    with timed(RSS_PARSE_SECONDS, span="rss_parse", source=source_name):
+        articles = await parse_feed_async(body, content_type, source_name, limit)
+    HTTP_CACHE.set_parsed(url, limit, articles)
+    return list(articles)
+
+
+async def _timed_fetch_async(name: str, coro: Awaitable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    with timed(SOURCE_FETCH_SECONDS, span="fetch", source=name):
+        return await coro
+
+
+async def fetch_all_sources_report_async(
+    limit_per_source: int = 20,
+    budget: float = AGGREGATE_BUDGET,
+) -> Dict[str, Any]:
+    """
+    Async version of fetch_all_sources_report (same result shape and merge order).
+    """
+    async with httpx.AsyncClient() as client:
+        coros = {
+            "hackernews": fetch_hn_top_stories_async(
+                limit=limit_per_source, deadline=_hn_deadline(budget), client=client
+            )
+        }
+        for feed_url, source_name in RSS_FEEDS:
+            coros[source_name] = fetch_rss_feed_async(feed_url, source_name, limit=limit_per_source, client=client)
+
+        order = list(coros)
+        tasks = {asyncio.create_task(_timed_fetch_async(name, coro)): name for name, coro in coros.items()}
+        done, not_done = await asyncio.wait(tasks, timeout=budget)
+
+        per_source: Dict[str, List[Dict[str, Any]]] = {}
+        failed_sources: List[str] = []
+        timed_out_sources: List[str] = []
+
+        for task in done:
+            name = tasks[task]
+            try:
+                per_source[name] = task.result()
+            except Exception as e:
+                print(f"[WARN] Source '{name}' failed: {e}")
+                failed_sources.append(name)
+
+        for task in not_done:
+            name = tasks[task]
+            task.cancel()
+            print(f"[WARN] Source '{name}' missed the {budget}s budget; skipping.")
+            timed_out_sources.append(name)
+
+        if not_done:
+            await asyncio.gather(*not_done, return_exceptions=True)
+
+    return _merge_report(order, per_source, failed_sources, timed_out_sources)
+
+
+async def fetch_all_sources_async(
+    limit_per_source: int = 20,
+    budget: float = AGGREGATE_BUDGET,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_all_sources.
+    """
+    report = await fetch_all_sources_report_async(limit_per_source=limit_per_source, budget=budget)
+    return report["articles"]
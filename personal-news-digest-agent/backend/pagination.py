@@ -0,0 +1,126 @@
+# backend/pagination.py
+
+"""
+Cursor store for paginated digests.
+
+- The first page request ranks up to PAGE_MAX_RANKED articles once and
+  stores the ranked list under a random token for PAGE_CURSOR_TTL seconds
+- A cursor is "<token>.<offset>"; following it slices the stored list,
+  so later pages only pay for summarizing their own articles
+- Oldest lists are dropped beyond PAGE_CURSOR_MAX_ENTRIES
+- Lists live in this process's memory only. With several uvicorn/gunicorn
+  workers, cursors need sticky routing (or a single worker): a cursor that
+  lands on a worker which didn't create it gets ExpiredCursorError (410),
+  and the client has to start over from the first page
+"""
+
+import os
+import secrets
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Dict, Any, Optional, Tuple
+
+PAGE_CURSOR_TTL = float(os.getenv("PAGE_CURSOR_TTL", "600"))
+PAGE_CURSOR_MAX_ENTRIES = int(os.getenv("PAGE_CURSOR_MAX_ENTRIES", "256"))
+# How many ranked articles a paginated digest can reach in total
+PAGE_MAX_RANKED = int(os.getenv("PAGE_MAX_RANKED", "500"))
+
+
+class InvalidCursorError(ValueError):
+    """
+    The cursor is malformed.
+    """
+    pass
+
+
+class ExpiredCursorError(Exception):
+    """
+    The cursor's ranked list has expired (or was evicted).
+    """
+    pass
+
+
+class RankedListStore:
+    """
+    In-memory token -> ranked list map with a TTL and an entry cap.
+    """
+
+    def __init__(self, ttl_seconds: float = PAGE_CURSOR_TTL, max_entries: int = PAGE_CURSOR_MAX_ENTRIES) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = Lock()
+        # token -> (expires_at, {"topics", "articles"})
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._stats = {"lists": 0, "pages": 0, "expired": 0}
+
+    def put(self, topics: List[str], articles: List[Dict[str, Any]]) -> str:
+        """
+        Store a ranked list; returns its token.
+        """
+        token = secrets.token_urlsafe(12)
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                del self._entries[key]
+            self._entries[token] = (now + self.ttl_seconds, {"topics": list(topics), "articles": articles})
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._stats["lists"] += 1
+        return token
+
+    def get(self, cursor: str) -> Tuple[str, int, List[str], List[Dict[str, Any]]]:
+        """
+        Resolve a cursor into (token, offset, topics, ranked articles).
+        Raises InvalidCursorError or ExpiredCursorError.
+        """
+        token, _, offset_str = cursor.rpartition(".")
+        try:
+            offset = int(offset_str)
+        except ValueError:
+            raise InvalidCursorError(f"Malformed cursor: {cursor!r}")
+        if not token or offset < 0:
+            raise InvalidCursorError(f"Malformed cursor: {cursor!r}")
+
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or time.time() >= entry[0]:
+                self._entries.pop(token, None)
+                self._stats["expired"] += 1
+                raise ExpiredCursorError("Cursor expired; request the first page again.")
+            self._stats["pages"] += 1
+            data = entry[1]
+        return token, offset, data["topics"], data["articles"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+
+def make_cursor(token: str, offset: int) -> str:
+    return f"{token}.{offset}"
+
+
+RANKED_LISTS = RankedListStore()
+
+
+def page_slice(
+    token: str, articles: List[Dict[str, Any]], offset: int, page_size: int
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Return (articles on this page, cursor for the next page or None).
+    """
+    page = articles[offset:offset + page_size]
+    next_offset = offset + len(page)
+    next_cursor = make_cursor(token, next_offset) if page and next_offset < len(articles) else None
+    return page, next_cursor
+
+
+def get_pagination_stats() -> Dict[str, Any]:
+    """
+    Return stored ranked-list counts and cursor hits/expiries.
+    """
+    return RANKED_LISTS.stats()
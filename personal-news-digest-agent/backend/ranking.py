@@ -0,0 +1,184 @@
+# backend/ranking.py
+
+"""
+BM25 relevance ranking over the article snapshot (NumPy).
+
+- Title + description (HTML stripped) are tokenized into a sparse
+  term matrix stored as COO arrays (doc id, term id, term frequency)
+- The index is built once per article snapshot version and reused
+  by every request until the next ingestion cycle
+- All topic terms are scored against all articles in one vectorized
+  pass (mask + np.bincount over the non-zero entries)
+- Source scores (HN points; 0 for RSS) are normalized per source to
+  [0, 1] with log scaling, so HN points don't swamp relevance
+"""
+
+import os
+import re
+from threading import Lock
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from dedup import in_sources
+
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+# Title terms count this many times (titles are short and precise)
+BM25_TITLE_BOOST = int(os.getenv("BM25_TITLE_BOOST", "2"))
+# Weight of the normalized source score in combined_score
+BM25_SOURCE_WEIGHT = float(os.getenv("BM25_SOURCE_WEIGHT", "1.0"))
+
+_TOKEN_RE = re.compile(r"\w+")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return _TOKEN_RE.findall(_TAG_RE.sub(" ", text).lower())
+
+
+class BM25Index:
+    """
+    Sparse term matrix + BM25 statistics for one list of articles.
+    Immutable once built, so it can be shared across threads.
+    """
+
+    def __init__(self, articles: List[Dict[str, Any]], k1: float = BM25_K1, b: float = BM25_B) -> None:
+        self.k1 = k1
+        self.b = b
+        self.n_docs = len(articles)
+        self.vocab: Dict[str, int] = {}
+
+        doc_ids: List[int] = []
+        term_ids: List[int] = []
+        counts: List[int] = []
+        doc_len = np.zeros(self.n_docs, dtype=np.float64)
+
+        for d, a in enumerate(articles):
+            tf: Dict[int, int] = {}
+            tokens = _tokenize(a.get("title")) * BM25_TITLE_BOOST + _tokenize(a.get("description"))
+            for tok in tokens:
+                t = self.vocab.setdefault(tok, len(self.vocab))
+                tf[t] = tf.get(t, 0) + 1
+            doc_len[d] = len(tokens)
+            for t, c in tf.items():
+                doc_ids.append(d)
+                term_ids.append(t)
+                counts.append(c)
+
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        self.term_ids = np.asarray(term_ids, dtype=np.int64)
+        tf_arr = np.asarray(counts, dtype=np.float64)
+
+        df = np.bincount(self.term_ids, minlength=len(self.vocab)).astype(np.float64)
+        self.idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5))
+
+        avgdl = float(doc_len.mean()) if self.n_docs else 0.0
+        norm = 1.0 - b + b * (doc_len / avgdl) if avgdl > 0 else np.ones(self.n_docs)
+
+        # Per-(doc, term) BM25 weight, precomputed so queries only gather + sum
+        self.weights = (
+            self.idf[self.term_ids] * tf_arr * (k1 + 1.0) / (tf_arr + k1 * norm[self.doc_ids])
+            if len(tf_arr)
+            else np.zeros(0)
+        )
+
+    def score(self, topics: List[str]) -> np.ndarray:
+        """
+        BM25 score of every article against the union of topic terms.
+        Returns an array of length n_docs.
+        """
+        query_weight = np.zeros(len(self.vocab), dtype=np.float64)
+        for topic in topics:
+            for tok in _tokenize(topic):
+                t = self.vocab.get(tok)
+                if t is not None:
+                    query_weight[t] += 1.0
+
+        if not self.n_docs or not query_weight.any():
+            return np.zeros(self.n_docs)
+
+        mask = query_weight[self.term_ids] > 0
+        return np.bincount(
+            self.doc_ids[mask],
+            weights=self.weights[mask] * query_weight[self.term_ids[mask]],
+            minlength=self.n_docs,
+        )
+
+
+def normalized_source_scores(articles: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Scale each article's native score to [0, 1] within its source
+    (log1p(score) / log1p(max score of that source)).
+    """
+    raw = np.log1p(np.asarray([max(0.0, float(a.get("score", 0.0) or 0.0)) for a in articles], dtype=np.float64))
+    sources = [a["source"] for a in articles]
+
+    out = np.zeros(len(articles), dtype=np.float64)
+    for src in set(sources):
+        idx = np.fromiter((i for i, s in enumerate(sources) if s == src), dtype=np.int64)
+        top = raw[idx].max()
+        if top > 0:
+            out[idx] = raw[idx] / top
+    return out
+
+
+# ---------- Per-snapshot index cache ---------- #
+
+_INDEX_LOCK = Lock()
+_INDEX_CACHE: Dict[str, Any] = {"version": None, "index": None, "source_scores": None}
+
+
+def _get_index(articles: List[Dict[str, Any]], version: int):
+    with _INDEX_LOCK:
+        if _INDEX_CACHE["version"] == version and _INDEX_CACHE["index"] is not None:
+            return _INDEX_CACHE["index"], _INDEX_CACHE["source_scores"]
+
+    index = BM25Index(articles)
+    source_scores = normalized_source_scores(articles)
+
+    with _INDEX_LOCK:
+        _INDEX_CACHE.update(version=version, index=index, source_scores=source_scores)
+    return index, source_scores
+
+
+def bm25_rank(
+    articles: List[Dict[str, Any]],
+    topics: List[str],
+    snapshot_version: int,
+    allowed_sources: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score the full snapshot with BM25 and return relevant articles
+    (relevance_score > 0), best first, with relevance_score and
+    combined_score = relevance + BM25_SOURCE_WEIGHT * normalized source score.
+
+    'articles' must be the snapshot identified by 'snapshot_version'
+    (the index is cached per version).
+    """
+    if not articles:
+        return []
+
+    index, source_scores = _get_index(articles, snapshot_version)
+    relevance = index.score(topics)
+    combined = relevance + BM25_SOURCE_WEIGHT * source_scores
+
+    keep = relevance > 0
+    if allowed_sources:
+        allowed_set = set(allowed_sources)
+        keep &= np.fromiter((in_sources(a, allowed_set) for a in articles), dtype=bool, count=len(articles))
+
+    candidates = np.flatnonzero(keep)
+    # Stable sort so ties keep snapshot order
+    order = candidates[np.argsort(-combined[candidates], kind="stable")]
+
+    return [
+        {
+            **articles[i],
+            "relevance_score": float(relevance[i]),
+            "combined_score": float(round(combined[i], 4)),
+        }
+        for i in order
+    ]
@@ -0,0 +1,80 @@
+# backend/rate_limit.py
+
+"""
+Rate limiting and retry helpers for upstream API calls.
+
+- TokenBucket: thread-safe token bucket; acquire() blocks until a token is
+  free, acquire_async() waits without blocking the event loop
+- backoff_delay(): exponential backoff with full jitter
+"""
+
+import asyncio
+import random
+import time
+from threading import Lock
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at 'rate' tokens/second up to 'capacity'.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take 'tokens' if available and return 0.0, otherwise return
+        how many seconds to wait before trying again.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block until 'tokens' are available. Returns False if 'timeout'
+        seconds pass first.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """
+        Async version of acquire() (no timeout).
+        """
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 30.0) -> float:
+    """
+    Exponential backoff with full jitter for the given 1-based attempt:
+    a random delay in [0, min(cap, base * 2 ** (attempt - 1))].
+    """
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Literal
 
 
 class DigestRequest(BaseModel):
@@ -9,6 +9,33 @@ class DigestRequest(BaseModel):
         None,
         description="Optional list of source names to filter by (e.g. ['hackernews', 'bbc-tech']). If omitted, use all sources.",
     )
+    ranking: Literal["keyword", "bm25"] = Field(
+        "keyword",
+        description="Ranking mode: 'keyword' (topic matches in titles * 10 + source score) or 'bm25' (BM25 over title + description, per-source normalized scores).",
+    )
+    deadline_ms: Optional[int] = Field(
+        None,
+        ge=100,
+        le=120_000,
+        description="Optional latency budget in milliseconds. Near the deadline, pending AI summaries are replaced by cached or snippet summaries (marked 'degraded').",
+    )
+
+
+class DigestPageRequest(DigestRequest):
+    topics: List[str] = Field(
+        default_factory=list,
+        description="List of topics/keywords. Required for the first page; ignored when 'cursor' is set.",
+    )
+    max_articles: int = Field(10, ge=1, le=50, description="Page size: articles returned per page")
+    cursor: Optional[str] = Field(
+        None,
+        description="next_cursor from the previous page. Omit for the first page; when set, topics/sources/ranking of the first request are reused.",
+    )
+
+
+class AlternateSource(BaseModel):
+    source: str
+    url: str
 
 
 class ArticleSummary(BaseModel):
@@ -18,8 +45,21 @@ class ArticleSummary(BaseModel):
     score: float
     source: str
     summary: Optional[str] = None   # For future LLM summaries
+    alternates: List[AlternateSource] = Field(
+        default_factory=list,
+        description="Other sources carrying the same story (near-duplicates collapsed into this article).",
+    )
+    degraded: bool = Field(
+        False,
+        description="True if the summary is a snippet because the request's deadline ran out before the AI summary was ready.",
+    )
 
 
 class DigestResponse(BaseModel):
     topics: List[str]
     articles: List[ArticleSummary]
+
+
+class DigestPageResponse(DigestResponse):
+    next_cursor: Optional[str] = Field(None, description="Pass as 'cursor' to get the next page; null on the last page.")
+    total: int = Field(..., description="Number of ranked articles available across all pages.")
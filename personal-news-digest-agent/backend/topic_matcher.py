@@ -0,0 +1,136 @@
+# backend/topic_matcher.py
+
+"""
+Compiled multi-topic matcher for relevance scoring.
+
+- Topics are normalized (strip + lowercase + tokenize) once per request,
+  not once per article
+- Topics are stored in a token trie, so "machine learning" is matched as
+  a phrase and "ai" only matches the word "ai" (not "said")
+- Scoring a title is a single pass over its tokens, independent of how
+  many topics there are
+- Simple English plurals on a title word are tolerated: "-s" ("startups"
+  matches the topic "startup"), "-es" after s/x/z/ch/sh ("buses" -> "bus")
+  and "-ies" ("companies" -> "company"), except for words that aren't
+  plurals ("news", "status", "analysis", ...)
+- Topics with symbols that tokenizing would drop ("C++", "C#", ".NET")
+  are matched as exact substrings instead, so "C++" doesn't match a lone "c"
+
+Score = number of distinct topics found in the text, which is what
+agent.compute_topic_score returns for substring matches.
+"""
+
+import re
+from typing import List, Dict, Any, Iterable, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+# Anything but word characters, whitespace and hyphens
+_SYMBOL_RE = re.compile(r"[^\w\s-]")
+_END = "\0"  # trie key marking "a topic ends here"; never a token
+
+# Words ending in "s" that are not plurals of the word without it
+_NOT_PLURAL = {
+    "news", "always", "perhaps", "lens", "chaos", "canvas", "atlas", "alias",
+    "bias", "thus", "plus", "does", "this", "series", "species", "status",
+    "virus", "focus", "bonus", "campus", "census", "corpus", "nexus",
+}
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _singulars(tok: str) -> Tuple[str, ...]:
+    """
+    Possible singular forms of 'tok' (most specific first), or () if it
+    doesn't look like a plural.
+    """
+    if len(tok) <= 3 or tok[-1] != "s" or tok.endswith(("ss", "sis", "ous")) or tok in _NOT_PLURAL:
+        return ()
+    if tok.endswith("ies") and len(tok) > 4:
+        return (tok[:-3] + "y", tok[:-1])
+    if tok.endswith("es") and tok[:-2].endswith(("s", "x", "z", "ch", "sh")):
+        return (tok[:-2], tok[:-1])
+    return (tok[:-1],)
+
+
+class TopicMatcher:
+    """
+    Build once per request with the user's topics, then call score()
+    for every article.
+    """
+
+    def __init__(self, topics: Iterable[str]) -> None:
+        self._trie: Dict[str, Any] = {}
+        self.topics: List[str] = []
+        # (topic_id, lowercased topic) for topics matched by substring
+        self._literals: List[Tuple[int, str]] = []
+
+        for topic in topics:
+            literal = topic.strip().lower()
+            if _SYMBOL_RE.search(literal):
+                if literal not in self.topics:
+                    self._literals.append((len(self.topics), literal))
+                    self.topics.append(literal)
+                continue
+
+            tokens = _tokenize(topic)
+            if not tokens:
+                continue
+            key = " ".join(tokens)
+            if key in self.topics:
+                continue
+            topic_id = len(self.topics)
+            self.topics.append(key)
+
+            node = self._trie
+            for tok in tokens:
+                node = node.setdefault(tok, {})
+            node.setdefault(_END, []).append(topic_id)
+
+    def _match_ids(self, text: str) -> set:
+        trie = self._trie
+        lowered = text.lower()
+        found = {topic_id for topic_id, literal in self._literals if literal in lowered}
+        tokens = _TOKEN_RE.findall(lowered)
+        n = len(tokens)
+
+        for start in range(n):
+            node = trie
+            pos = start
+            while pos < n:
+                tok = tokens[pos]
+                nxt = node.get(tok)
+                if nxt is None:
+                    for singular in _singulars(tok):
+                        nxt = node.get(singular)
+                        if nxt is not None:
+                            break
+                if nxt is None:
+                    break
+                ends = nxt.get(_END)
+                if ends:
+                    found.update(ends)
+                node = nxt
+                pos += 1
+
+        return found
+
+    def matches(self, text: str) -> List[str]:
+        """
+        Return the distinct topics that occur in 'text', in topic order.
+        """
+        if not self.topics or not text:
+            return []
+        return [self.topics[i] for i in sorted(self._match_ids(text))]
+
+    def score(self, text: str) -> float:
+        """
+        Number of distinct topics found in 'text'.
+        """
+        if not self.topics or not text:
+            return 0.0
+        return float(len(self._match_ids(text)))
+
+    def score_many(self, texts: Iterable[str]) -> List[float]:
+        return [self.score(t) for t in texts]
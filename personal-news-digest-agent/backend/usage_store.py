@@ -0,0 +1,152 @@
+# backend/usage_store.py
+
+"""
+Gemini usage counters shared by every backend process.
+
+- Stored in SQLite (WAL mode) at USAGE_DB_PATH, so uvicorn/gunicorn
+  workers all add to, and report, the same totals
+- Each record is one atomic "UPDATE ... SET x = x + ?" statement, so
+  concurrent writers from different processes never lose increments
+- One connection per thread (connections can't be shared across threads)
+- Counters persist across restarts; delete the DB file to reset them
+- Per-minute buckets (kept for USAGE_WINDOW_RETENTION_MINUTES) back the
+  sliding-window usage read by the budget controller (budget.py)
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock, local
+from typing import Dict
+
+USAGE_DB_PATH = Path(os.getenv("USAGE_DB_PATH", str(Path(__file__).parent / "usage_stats.db")))
+USAGE_WINDOW_RETENTION_MINUTES = int(os.getenv("USAGE_WINDOW_RETENTION_MINUTES", str(2 * 24 * 60)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    calls INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    response_tokens INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS usage_minutes (
+    minute INTEGER PRIMARY KEY,
+    calls INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    response_tokens INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_INIT_LOCK = Lock()
+_THREAD_LOCAL = local()
+_INITIALIZED = False
+_LAST_PRUNE_MINUTE = 0
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(str(USAGE_DB_PATH), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Return this thread's connection, creating the schema the first time.
+    """
+    global _INITIALIZED
+
+    conn = getattr(_THREAD_LOCAL, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _THREAD_LOCAL.conn = conn
+
+    if not _INITIALIZED:
+        with _INIT_LOCK:
+            if not _INITIALIZED:
+                with conn:
+                    conn.executescript(_SCHEMA)
+                with conn:
+                    # Safe if another process created the row first
+                    conn.execute("INSERT OR IGNORE INTO usage_totals (id) VALUES (1)")
+                _INITIALIZED = True
+
+    return conn
+
+
+def _current_minute() -> int:
+    return int(time.time() // 60)
+
+
+def record_usage(prompt_tokens: int, response_tokens: int) -> None:
+    """
+    Add one Gemini call and its token counts to the shared totals
+    and to the current minute's bucket.
+    """
+    global _LAST_PRUNE_MINUTE
+
+    minute = _current_minute()
+    tokens = (int(prompt_tokens), int(response_tokens))
+    try:
+        with _get_conn() as conn:
+            conn.execute(
+                "UPDATE usage_totals SET calls = calls + 1, "
+                "prompt_tokens = prompt_tokens + ?, response_tokens = response_tokens + ? "
+                "WHERE id = 1",
+                tokens,
+            )
+            conn.execute(
+                "INSERT INTO usage_minutes (minute, calls, prompt_tokens, response_tokens) "
+                "VALUES (?, 1, ?, ?) "
+                "ON CONFLICT(minute) DO UPDATE SET calls = calls + 1, "
+                "prompt_tokens = prompt_tokens + excluded.prompt_tokens, "
+                "response_tokens = response_tokens + excluded.response_tokens",
+                (minute, *tokens),
+            )
+            # Drop old buckets at most once a minute per process
+            if minute != _LAST_PRUNE_MINUTE:
+                _LAST_PRUNE_MINUTE = minute
+                conn.execute(
+                    "DELETE FROM usage_minutes WHERE minute < ?",
+                    (minute - USAGE_WINDOW_RETENTION_MINUTES,),
+                )
+    except sqlite3.Error as e:
+        print(f"[WARN] Usage counter update failed: {e}")
+
+
+def read_usage() -> Dict[str, int]:
+    """
+    Return the shared totals: calls, prompt_tokens, response_tokens.
+    """
+    try:
+        row = _get_conn().execute(
+            "SELECT calls, prompt_tokens, response_tokens FROM usage_totals WHERE id = 1"
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"[WARN] Usage counter read failed: {e}")
+        row = None
+
+    calls, prompt_tokens, response_tokens = row or (0, 0, 0)
+    return {"calls": calls, "prompt_tokens": prompt_tokens, "response_tokens": response_tokens}
+
+
+def read_minutes(first_minute: int, last_minute: int) -> Dict[int, Dict[str, int]]:
+    """
+    Return per-minute buckets (minute = unix time // 60) in the given
+    inclusive range; minutes without usage are omitted.
+    """
+    try:
+        rows = _get_conn().execute(
+            "SELECT minute, calls, prompt_tokens, response_tokens FROM usage_minutes "
+            "WHERE minute BETWEEN ? AND ?",
+            (first_minute, last_minute),
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"[WARN] Usage window read failed: {e}")
+        rows = []
+
+    return {
+        minute: {"calls": calls, "prompt_tokens": prompt_tokens, "response_tokens": response_tokens}
+        for minute, calls, prompt_tokens, response_tokens in rows
+    }
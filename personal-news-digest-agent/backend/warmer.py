@@ -0,0 +1,261 @@
+# backend/warmer.py
+
+"""
+Background summary pre-warming.
+
+- Off by default (WARM_MAX_ARTICLES=0): warming spends Gemini budget on
+  articles nobody may ask for, so operators opt in
+- After each ingestion cycle, the WARM_MAX_ARTICLES most "trending"
+  articles of the new snapshot are summarized with summarize_article(),
+  so the Gemini latency is paid before a user asks for them
+  * trending = per-source normalized score (HN points) + 1 per other
+    source carrying the same story (dedup alternates)
+- Budget: at most WARM_MAX_ARTICLES per cycle and WARM_MAX_COST_USD per
+  cycle (0 = no cost cap), WARM_CONCURRENCY calls at a time, and nothing
+  is warmed unless the Gemini budget tier is "full" (budget.py)
+- Runs on its own daemon thread; a newer snapshot replaces a pending one
+- note_requested() is called by the digest pipeline with the articles it
+  summarizes, giving:
+  * warm_hit_rate: requested articles that had been pre-warmed
+  * unrequested_cost_usd: spend on warmed articles that left the snapshot
+    without ever being requested
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+from typing import List, Dict, Any, Optional, Tuple
+
+from ai_client import (
+    summarize_article,
+    get_budget_tier,
+    GEMINI_API_KEY,
+    COST_INPUT_PER_M,
+    COST_OUTPUT_PER_M,
+)
+from cache import get_cached_summary, get_cached_usage
+from ranking import normalized_source_scores
+
+WARM_MAX_ARTICLES = int(os.getenv("WARM_MAX_ARTICLES", "0"))
+WARM_MAX_COST_USD = float(os.getenv("WARM_MAX_COST_USD", "0"))
+WARM_CONCURRENCY = int(os.getenv("WARM_CONCURRENCY", "2"))
+
+
+def _trending_order(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Articles sorted by trending score, best first (ties keep snapshot order).
+    """
+    if not articles:
+        return []
+    source_scores = normalized_source_scores(articles)
+    scored = [
+        (float(source_scores[i]) + len(a.get("alternates") or []), i)
+        for i, a in enumerate(articles)
+    ]
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return [articles[i] for _, i in scored]
+
+
+class SummaryWarmer:
+    """
+    Summarizes the top trending articles of each new snapshot on a
+    background thread, within the per-cycle article and cost caps, and
+    tracks how many warmed articles were later requested.
+    """
+
+    def __init__(
+        self,
+        max_articles: int = WARM_MAX_ARTICLES,
+        max_cost_usd: float = WARM_MAX_COST_USD,
+        concurrency: int = WARM_CONCURRENCY,
+    ) -> None:
+        self.max_articles = max_articles
+        self.max_cost_usd = max_cost_usd
+        self.concurrency = max(1, concurrency)
+
+        self._lock = Lock()
+        self._wake = Event()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._pending: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        self._last_version: Optional[int] = None
+
+        # url -> {"cost_usd": float, "requested": bool} for warmed articles still in the snapshot
+        self._warmed: Dict[str, Dict[str, Any]] = {}
+        self._stats = {
+            "cycles": 0,
+            "warmed": 0,
+            "tokens_spent": 0,
+            "cost_spent_usd": 0.0,
+            "requested_articles": 0,
+            "warm_hits": 0,
+            "unrequested_articles": 0,
+            "unrequested_cost_usd": 0.0,
+        }
+        self._last_cycle: Dict[str, Any] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_articles > 0 and bool(GEMINI_API_KEY)
+
+    # ---------- scheduling ---------- #
+
+    def schedule(self, version: int, articles: List[Dict[str, Any]]) -> None:
+        """
+        Queue a snapshot for warming (called after each ingestion refresh).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if version == self._last_version:
+                return
+            self._pending = (version, articles)
+        self._ensure_thread()
+        self._wake.set()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="summary-warmer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread:
+            thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                pending, self._pending = self._pending, None
+            if pending is not None and not self._stop.is_set():
+                self._warm(*pending)
+
+    # ---------- warming ---------- #
+
+    def _retire(self, snapshot_urls: set) -> None:
+        """
+        Close out warmed articles that left the snapshot (counting the
+        ones nobody requested as unrequested spend).
+        """
+        with self._lock:
+            for url in [u for u in self._warmed if u not in snapshot_urls]:
+                entry = self._warmed.pop(url)
+                if not entry["requested"]:
+                    self._stats["unrequested_articles"] += 1
+                    self._stats["unrequested_cost_usd"] += entry["cost_usd"]
+
+    def _warm_one(self, article: Dict[str, Any]) -> Tuple[int, float]:
+        summarize_article(
+            title=article["title"],
+            description=article.get("description"),
+            topics=[],
+            url=article["url"],
+        )
+        usage = get_cached_usage(article["url"])
+        if usage is None:
+            # Gemini failed (fallback summary, nothing cached)
+            return 0, 0.0
+        prompt_tokens, response_tokens = usage
+        cost = prompt_tokens / 1_000_000 * COST_INPUT_PER_M + response_tokens / 1_000_000 * COST_OUTPUT_PER_M
+        return prompt_tokens + response_tokens, cost
+
+    def _warm(self, version: int, articles: List[Dict[str, Any]]) -> None:
+        started = time.monotonic()
+        self._retire({a["url"] for a in articles})
+
+        cycle = {"version": version, "candidates": 0, "warmed": 0, "already_cached": 0, "stopped_by": None}
+        candidates = []
+        for a in _trending_order(articles)[: self.max_articles]:
+            if get_cached_summary(a["url"]) is not None:
+                cycle["already_cached"] += 1
+            else:
+                candidates.append(a)
+        cycle["candidates"] = len(candidates)
+
+        spent = 0.0
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            for start in range(0, len(candidates), self.concurrency):
+                if self._stop.is_set() or self._pending is not None:
+                    cycle["stopped_by"] = "newer_snapshot" if self._pending is not None else "shutdown"
+                    break
+                if get_budget_tier() != "full":
+                    cycle["stopped_by"] = "budget_tier"
+                    break
+                if self.max_cost_usd > 0 and spent >= self.max_cost_usd:
+                    cycle["stopped_by"] = "cost_cap"
+                    break
+
+                chunk = candidates[start:start + self.concurrency]
+                for a, (tokens, cost) in zip(chunk, executor.map(self._warm_one, chunk)):
+                    spent += cost
+                    if tokens == 0:
+                        continue
+                    cycle["warmed"] += 1
+                    with self._lock:
+                        self._warmed[a["url"]] = {"cost_usd": cost, "requested": False}
+                        self._stats["warmed"] += 1
+                        self._stats["tokens_spent"] += tokens
+                        self._stats["cost_spent_usd"] += cost
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        cycle["cost_usd"] = round(spent, 6)
+        cycle["seconds"] = round(time.monotonic() - started, 3)
+        with self._lock:
+            self._last_version = version
+            self._last_cycle = cycle
+            self._stats["cycles"] += 1
+
+    # ---------- request-side accounting ---------- #
+
+    def note_requested(self, articles: List[Dict[str, Any]]) -> None:
+        """
+        Record articles a digest is about to summarize.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for a in articles:
+                self._stats["requested_articles"] += 1
+                entry = self._warmed.get(a.get("url"))
+                if entry is not None:
+                    self._stats["warm_hits"] += 1
+                    entry["requested"] = True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["last_cycle"] = dict(self._last_cycle)
+            stats["tracked_articles"] = len(self._warmed)
+            stats["pending_unrequested_cost_usd"] = round(
+                sum(e["cost_usd"] for e in self._warmed.values() if not e["requested"]), 6
+            )
+        stats["enabled"] = self.enabled
+        stats["warm_hit_rate"] = (
+            round(stats["warm_hits"] / stats["requested_articles"], 4) if stats["requested_articles"] else 0.0
+        )
+        stats["cost_spent_usd"] = round(stats["cost_spent_usd"], 6)
+        stats["unrequested_cost_usd"] = round(stats["unrequested_cost_usd"], 6)
+        stats["max_articles_per_cycle"] = self.max_articles
+        stats["max_cost_usd_per_cycle"] = self.max_cost_usd
+        return stats
+
+
+SUMMARY_WARMER = SummaryWarmer()
+
+
+def get_warmer_stats() -> Dict[str, Any]:
+    """
+    Return warm-hit rate and pre-warming spend (total and unrequested).
+    """
+    return SUMMARY_WARMER.stats()
@@ -0,0 +1,381 @@
+# benchmarks/bench_digest.py
+
+"""
+Load and latency benchmark for POST /digest, fully local and reproducible.
+
+- Upstreams: stub_upstreams.py serves HN/RSS fixtures in-process, with
+  injected latency and failures
+- Backend: bench_server.py runs the real app in a subprocess with a fake
+  Gemini model and throw-away cache/usage databases (cold start each run)
+- Load: --concurrency clients send --requests digests, drawn (seeded)
+  from --payloads distinct topic sets, so the digest cache hit rate is
+  controlled by how many distinct payloads there are
+- Report: throughput, latency p50/p95/p99, cache hit rates (digest,
+  summary, HN item TTL) from /metrics deltas, Gemini calls, degraded
+  articles, upstream request counts
+
+Compare runs across commits:
+    python benchmarks/bench_digest.py --out bench-base.json
+    ... change / check out another commit ...
+    python benchmarks/bench_digest.py --compare bench-base.json
+
+An older tree can also be benchmarked with this harness through a git
+worktree:  --backend-dir ../other-worktree/personal-news-digest-agent/backend
+
+Backend settings can be overridden with --env KEY=VALUE. Defaults lift the
+Gemini rate limit, disable pre-warming and keep ingestion to one refresh,
+so runs measure the request path only.
+
+Run from the project root:
+    python benchmarks/bench_digest.py [--requests 200] [--concurrency 8] ...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import httpx
+
+from stub_upstreams import StubUpstreams, _SUBJECTS
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+DEFAULT_BACKEND_ENV = {
+    "GEMINI_RPM": "100000",
+    "GEMINI_BURST": "1000",
+    "INGEST_INTERVAL": "3600",
+    "WARM_MAX_ARTICLES": "0",
+}
+
+_COUNT_LINE = re.compile(r"^cache_lookup_seconds_count\{(.*)\} (\S+)$", re.MULTILINE)
+_LABEL = re.compile(r'(\w+)="([^"]*)"')
+
+
+# ---------- helpers ---------- #
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _git_info(path: Path) -> Dict[str, Any]:
+    def _git(*args: str) -> str:
+        out = subprocess.run(["git", *args], cwd=path, capture_output=True, text=True)
+        return out.stdout.strip() if out.returncode == 0 else ""
+
+    return {"commit": _git("rev-parse", "--short", "HEAD") or None, "dirty": bool(_git("status", "--porcelain", "."))}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile (values need not be sorted).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.4999)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _cache_counts(metrics_text: str) -> Dict[str, Dict[str, float]]:
+    """
+    {cache: {result: lookups}} from the cache_lookup_seconds histogram.
+    """
+    counts: Dict[str, Dict[str, float]] = {}
+    for labels, value in _COUNT_LINE.findall(metrics_text):
+        parsed = dict(_LABEL.findall(labels))
+        counts.setdefault(parsed.get("cache", "?"), {})[parsed.get("result", "?")] = float(value)
+    return counts
+
+
+def _cache_hit_rates(before: Dict[str, Dict[str, float]], after: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    rates: Dict[str, Any] = {}
+    for cache, results in after.items():
+        delta = {r: n - before.get(cache, {}).get(r, 0.0) for r, n in results.items()}
+        total = sum(delta.values())
+        if total <= 0:
+            continue
+        hits = total - delta.get("miss", 0.0)
+        rates[cache] = {"lookups": int(total), "hit_rate": round(hits / total, 4), "by_result": {k: int(v) for k, v in delta.items()}}
+    return rates
+
+
+def make_payloads(count: int, max_articles: int, ranking: str, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {"topics": rng.sample(_SUBJECTS, 2), "max_articles": max_articles, "ranking": ranking}
+        for _ in range(count)
+    ]
+
+
+# ---------- backend process ---------- #
+
+
+def start_backend(args: argparse.Namespace, stub_url: str, data_dir: str) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(DEFAULT_BACKEND_ENV)
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    env.update(
+        {
+            "BENCH_STUB_URL": stub_url,
+            "BENCH_DATA_DIR": data_dir,
+            "BENCH_PORT": str(port),
+            "FAKE_GEMINI_LATENCY_MS": str(args.gemini_latency_ms),
+            "FAKE_GEMINI_JITTER_MS": str(args.gemini_jitter_ms),
+            "FAKE_GEMINI_FAILURE_RATE": str(args.gemini_failure_rate),
+        }
+    )
+    if args.backend_dir:
+        env["BENCH_BACKEND_DIR"] = str(Path(args.backend_dir).resolve())
+
+    with open(Path(data_dir) / "backend.log", "w") as log:
+        proc = subprocess.Popen([sys.executable, str(BENCH_DIR / "bench_server.py")], env=env, stdout=log, stderr=subprocess.STDOUT)
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def wait_ready(base_url: str, proc: subprocess.Popen, timeout: float = 60.0) -> Dict[str, Any]:
+    """
+    Wait for /health, then for the first ingestion snapshot. Returns /ingestion stats.
+    """
+    deadline = time.monotonic() + timeout
+    with httpx.Client(timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError("backend exited during startup (see backend.log)")
+            try:
+                if client.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        else:
+            raise RuntimeError("backend did not become healthy")
+
+        while time.monotonic() < deadline:
+            resp = client.get(f"{base_url}/ingestion")
+            if resp.status_code == 404:
+                # Tree without background ingestion: first request fetches
+                return {}
+            stats = resp.json()
+            if stats.get("articles"):
+                return stats
+            time.sleep(0.1)
+    raise RuntimeError("no article snapshot before timeout")
+
+
+# ---------- load driver ---------- #
+
+
+async def run_load(base_url: str, payloads: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    plan = [rng.randrange(len(payloads)) for _ in range(args.requests)]
+    queue: asyncio.Queue = asyncio.Queue()
+    for idx in plan:
+        queue.put_nowait(idx)
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    degraded = 0
+
+    async def _worker(client: httpx.AsyncClient) -> None:
+        nonlocal degraded
+        while True:
+            try:
+                idx = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            body = dict(payloads[idx])
+            if args.deadline_ms:
+                body["deadline_ms"] = args.deadline_ms
+            start = time.perf_counter()
+            try:
+                resp = await client.post(f"{base_url}/digest", json=body)
+                status = str(resp.status_code)
+                if resp.status_code == 200:
+                    degraded += sum(1 for a in resp.json().get("articles", []) if a.get("degraded"))
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for _ in range(args.warmup):
+            await client.post(f"{base_url}/digest", json=payloads[0])
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    ms = [x * 1000 for x in latencies]
+    return {
+        "requests": len(latencies),
+        "ok": statuses.get("200", 0),
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "min": round(min(ms), 1) if ms else 0.0,
+            "mean": round(statistics.fmean(ms), 1) if ms else 0.0,
+            "p50": round(percentile(ms, 50), 1),
+            "p95": round(percentile(ms, 95), 1),
+            "p99": round(percentile(ms, 99), 1),
+            "max": round(max(ms), 1) if ms else 0.0,
+        },
+        "degraded_articles": degraded,
+    }
+
+
+def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    stub = StubUpstreams(
+        latency_ms=args.upstream_latency_ms,
+        jitter_ms=args.upstream_jitter_ms,
+        failure_rate=args.upstream_failure_rate,
+        failing_sources=args.fail_source,
+        seed=args.seed,
+    ).start()
+    payloads = make_payloads(args.payloads, args.max_articles, args.ranking, args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="bench_digest_") as data_dir:
+        proc, base_url = start_backend(args, stub.base_url, data_dir)
+        try:
+            ingestion = wait_ready(base_url, proc)
+            with httpx.Client(timeout=10.0) as client:
+                metrics_before = _cache_counts(client.get(f"{base_url}/metrics").text) if not args.no_metrics else {}
+                calls_before = client.get(f"{base_url}/usage").json().get("calls", 0)
+
+                load = asyncio.run(run_load(base_url, payloads, args))
+
+                metrics_after = _cache_counts(client.get(f"{base_url}/metrics").text) if not args.no_metrics else {}
+                calls_after = client.get(f"{base_url}/usage").json().get("calls", 0)
+        except Exception:
+            print((Path(data_dir) / "backend.log").read_text()[-4000:], file=sys.stderr)
+            raise
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            stub.stop()
+
+    load["cache"] = _cache_hit_rates(metrics_before, metrics_after)
+    load["gemini_calls"] = calls_after - calls_before
+    load["upstream_requests"] = stub.counts()
+    load["snapshot_articles"] = ingestion.get("articles")
+
+    config = {k: v for k, v in vars(args).items() if k not in ("out", "compare")}
+    config["backend_env"] = {**DEFAULT_BACKEND_ENV, **dict(item.partition("=")[::2] for item in args.env)}
+    return {
+        "benchmark": "digest",
+        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_info(Path(args.backend_dir) if args.backend_dir else BENCH_DIR.parent),
+        "python": sys.version.split()[0],
+        "config": config,
+        "results": load,
+    }
+
+
+# ---------- reporting ---------- #
+
+
+def _key_numbers(report: Dict[str, Any]) -> Dict[str, float]:
+    r = report["results"]
+    numbers = {
+        "throughput_rps": r["throughput_rps"],
+        "p50_ms": r["latency_ms"]["p50"],
+        "p95_ms": r["latency_ms"]["p95"],
+        "p99_ms": r["latency_ms"]["p99"],
+        "error_rate": round(1 - r["ok"] / r["requests"], 4) if r["requests"] else 0.0,
+        "gemini_calls": r["gemini_calls"],
+        "degraded_articles": r["degraded_articles"],
+    }
+    for cache, stats in r.get("cache", {}).items():
+        numbers[f"{cache}_hit_rate"] = stats["hit_rate"]
+    return numbers
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    r = report["results"]
+    git = report["git"]
+    print(f"commit {git['commit']}{' (dirty)' if git['dirty'] else ''}  python {report['python']}")
+    print(
+        f"requests={r['requests']} ok={r['ok']} statuses={r['statuses']}  "
+        f"throughput={r['throughput_rps']} req/s  elapsed={r['elapsed_s']} s"
+    )
+    lat = r["latency_ms"]
+    print(f"latency ms: p50={lat['p50']} p95={lat['p95']} p99={lat['p99']} (min={lat['min']} mean={lat['mean']} max={lat['max']})")
+    for cache, stats in r["cache"].items():
+        print(f"cache {cache:8s} hit_rate={stats['hit_rate']:.2%}  lookups={stats['lookups']}  {stats['by_result']}")
+    print(f"gemini_calls={r['gemini_calls']}  degraded_articles={r['degraded_articles']}  snapshot_articles={r['snapshot_articles']}")
+
+
+def print_comparison(base: Dict[str, Any], current: Dict[str, Any]) -> None:
+    before, after = _key_numbers(base), _key_numbers(current)
+    print(f"\n{'metric':20s} {'base ' + str(base['git']['commit']):>16s} {'current':>16s} {'change':>10s}")
+    for key in list(before) + [k for k in after if k not in before]:
+        b, a = before.get(key), after.get(key)
+        change = f"{(a - b) / b:+.1%}" if isinstance(a, (int, float)) and isinstance(b, (int, float)) and b else "-"
+        print(f"{key:20s} {str(b):>16s} {str(a):>16s} {change:>10s}")
+    if base["config"] != current["config"]:
+        print("\n[WARN] Benchmark settings differ between the two runs; numbers may not be comparable.")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    load = parser.add_argument_group("load")
+    load.add_argument("--requests", type=int, default=200)
+    load.add_argument("--concurrency", type=int, default=8)
+    load.add_argument("--payloads", type=int, default=5, help="Distinct topic sets (fewer = more digest cache hits)")
+    load.add_argument("--max-articles", type=int, default=8)
+    load.add_argument("--ranking", choices=["keyword", "bm25"], default="keyword")
+    load.add_argument("--deadline-ms", type=int, default=None)
+    load.add_argument("--warmup", type=int, default=0, help="Unmeasured requests sent before the run")
+    load.add_argument("--timeout", type=float, default=60.0)
+    load.add_argument("--seed", type=int, default=42)
+
+    stubs = parser.add_argument_group("stubs")
+    stubs.add_argument("--upstream-latency-ms", type=float, default=50.0)
+    stubs.add_argument("--upstream-jitter-ms", type=float, default=20.0)
+    stubs.add_argument("--upstream-failure-rate", type=float, default=0.0)
+    stubs.add_argument("--fail-source", action="append", default=[], help="Source that always fails (repeatable)")
+    stubs.add_argument("--gemini-latency-ms", type=float, default=300.0)
+    stubs.add_argument("--gemini-jitter-ms", type=float, default=100.0)
+    stubs.add_argument("--gemini-failure-rate", type=float, default=0.0)
+
+    backend = parser.add_argument_group("backend")
+    backend.add_argument("--backend-dir", default=None, help="Backend to benchmark (default: this tree)")
+    backend.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Backend env override (repeatable)")
+    backend.add_argument("--no-metrics", action="store_true", help="Skip /metrics (trees without it)")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--out", default=None, help="Write the JSON report here")
+    output.add_argument("--compare", default=None, help="JSON report of a previous run to compare against")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = benchmark(args)
+    print_report(report)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nReport written to {args.out}")
+    if args.compare:
+        print_comparison(json.loads(Path(args.compare).read_text()), report)
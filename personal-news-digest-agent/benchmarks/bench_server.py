@@ -0,0 +1,64 @@
+# benchmarks/bench_server.py
+
+"""
+Run the backend against local stubs (started by bench_digest.py).
+
+- Hacker News and RSS URLs are pointed at stub_upstreams.py (BENCH_STUB_URL)
+- Gemini is replaced by fake_gemini.FakeGenerativeModel
+  (FAKE_GEMINI_LATENCY_MS, FAKE_GEMINI_JITTER_MS, FAKE_GEMINI_FAILURE_RATE)
+  by patching google.generativeai itself: every tree builds its model
+  through genai.GenerativeModel (once, or on each call in older trees),
+  so no tree can reach the real API
+- Summary cache and usage databases live in BENCH_DATA_DIR, so every run
+  starts cold and the real databases are never touched
+- BENCH_BACKEND_DIR selects the backend to import (e.g. a git worktree of
+  another commit); patches are skipped for attributes that tree lacks
+
+Everything else (INGEST_INTERVAL, GEMINI_RPM, ...) is read by the backend
+from the environment as usual.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = Path(os.getenv("BENCH_BACKEND_DIR", str(BENCH_DIR.parent / "backend"))).resolve()
+DATA_DIR = Path(os.environ["BENCH_DATA_DIR"])
+STUB_URL = os.environ["BENCH_STUB_URL"].rstrip("/")
+PORT = int(os.getenv("BENCH_PORT", "8800"))
+
+os.environ.setdefault("GEMINI_API_KEY", "bench-dummy-key")
+os.environ.setdefault("USAGE_DB_PATH", str(DATA_DIR / "usage_stats.db"))
+
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+os.chdir(BACKEND_DIR)
+
+import cache  # noqa: E402
+
+cache.CACHE_DB_PATH = DATA_DIR / "summary_cache.db"
+cache.CACHE_FILE_PATH = DATA_DIR / "summary_cache.json"
+
+import news_sources  # noqa: E402
+
+news_sources.HN_TOPSTORIES_URL = f"{STUB_URL}/hn/topstories.json"
+news_sources.HN_ITEM_URL = f"{STUB_URL}/hn/item/{{id}}.json"
+news_sources.RSS_FEEDS = [(f"{STUB_URL}/rss/{source}.xml", source) for _, source in news_sources.RSS_FEEDS]
+
+import google.generativeai as genai  # noqa: E402
+from fake_gemini import FakeGenerativeModel  # noqa: E402
+
+fake_model = FakeGenerativeModel(
+    latency_ms=float(os.getenv("FAKE_GEMINI_LATENCY_MS", "300")),
+    jitter_ms=float(os.getenv("FAKE_GEMINI_JITTER_MS", "0")),
+    failure_rate=float(os.getenv("FAKE_GEMINI_FAILURE_RATE", "0")),
+)
+genai.configure = lambda *args, **kwargs: None
+genai.GenerativeModel = lambda *args, **kwargs: fake_model
+
+import main  # noqa: E402
+import uvicorn  # noqa: E402
+
+if __name__ == "__main__":
+    uvicorn.run(main.app, host="127.0.0.1", port=PORT, log_level="warning")
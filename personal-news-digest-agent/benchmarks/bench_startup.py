@@ -0,0 +1,94 @@
+# benchmarks/bench_startup.py
+
+"""
+Startup benchmark: time from a fresh interpreter to the first request
+served by the backend (GET /health through FastAPI's TestClient, without
+the lifespan, so no ingestion traffic), with and without an API key.
+
+Each scenario runs in new subprocesses so import caches don't carry over:
+  - no-key:     GEMINI_API_KEY unset
+  - key:        GEMINI_API_KEY set (dummy value, no Gemini call is made);
+                also times ai_client._get_model(), the one-time SDK
+                import/configure the app now runs in a background
+                thread at startup (warm_model) instead
+  - key+eager:  as "key", but google.generativeai is imported and
+                configured before main, like the old module-level setup
+
+Run from the project root:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+if EAGER:
+    import google.generativeai as genai
+    genai.configure(api_key="bench-dummy-key")
+import main
+t_import = time.perf_counter() - t0
+
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+assert client.get("/health").status_code == 200
+t_first = time.perf_counter() - t0
+
+t_model = None
+if WITH_KEY:
+    import ai_client
+    t1 = time.perf_counter()
+    ai_client._get_model()
+    t_model = time.perf_counter() - t1
+
+print(json.dumps({"import_s": t_import, "first_request_s": t_first, "first_model_s": t_model}))
+"""
+
+
+def run_once(with_key: bool, eager: bool) -> dict:
+    env = dict(os.environ)
+    env.pop("GEMINI_API_KEY", None)
+    env.pop("GOOGLE_API_KEY", None)
+    if with_key:
+        env["GEMINI_API_KEY"] = "bench-dummy-key"
+    # Keep benchmark runs away from the real usage/summary databases
+    env["USAGE_DB_PATH"] = str(Path(tempfile.gettempdir()) / "bench_startup_usage.db")
+
+    code = f"EAGER = {eager}\nWITH_KEY = {with_key}\n" + CHILD
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def bench(name: str, with_key: bool, eager: bool, runs: int) -> None:
+    results = [run_once(with_key, eager) for _ in range(runs)]
+
+    def med(key: str) -> str:
+        values = [r[key] for r in results if r[key] is not None]
+        return f"{statistics.median(values) * 1000:8.1f} ms" if values else "       - ms"
+
+    print(
+        f"{name:10s}  import={med('import_s')}  first_request={med('first_request_s')}  "
+        f"first_model_init={med('first_model_s')}  (median of {runs})"
+    )
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    bench("no-key", with_key=False, eager=False, runs=runs)
+    bench("key", with_key=True, eager=False, runs=runs)
+    bench("key+eager", with_key=True, eager=True, runs=runs)
@@ -0,0 +1,64 @@
+# benchmarks/bench_topic_matcher.py
+
+"""
+Micro-benchmark: agent.compute_topic_score (substring scan per topic)
+vs topic_matcher.TopicMatcher (compiled once, one pass per title).
+
+Run from the project root:
+    python benchmarks/bench_topic_matcher.py
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from agent import compute_topic_score  # noqa: E402
+from topic_matcher import TopicMatcher  # noqa: E402
+
+WORDS = (
+    "ai startup funding model data cloud security chip apple google open source "
+    "python rust climate energy robot quantum privacy regulation market launch "
+    "machine learning llm gpu battery phone browser network research policy said"
+).split()
+
+
+def make_titles(n: int, rng: random.Random):
+    return [" ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(6, 14))) for _ in range(n)]
+
+
+def make_topics(n: int, rng: random.Random):
+    topics = ["ai", "machine learning", "startup"]
+    while len(topics) < n:
+        topics.append(" ".join(rng.sample(WORDS, rng.randint(1, 2))))
+    return topics[:n]
+
+
+def bench(n_articles: int, n_topics: int, repeat: int = 5) -> None:
+    rng = random.Random(42)
+    titles = make_titles(n_articles, rng)
+    topics = make_topics(n_topics, rng)
+
+    def run_substring():
+        return [compute_topic_score(t, topics) for t in titles]
+
+    def run_matcher():
+        matcher = TopicMatcher(topics)  # built once per request, so timed here too
+        return matcher.score_many(titles)
+
+    number = 10
+    t_sub = min(timeit.repeat(run_substring, number=number, repeat=repeat)) / number
+    t_match = min(timeit.repeat(run_matcher, number=number, repeat=repeat)) / number
+
+    print(
+        f"articles={n_articles:5d} topics={n_topics:4d}  "
+        f"substring={t_sub * 1000:8.3f} ms  matcher={t_match * 1000:8.3f} ms  "
+        f"speedup={t_sub / t_match:5.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    for n_articles, n_topics in [(200, 3), (200, 20), (500, 50), (500, 200), (2000, 200)]:
+        bench(n_articles, n_topics)
@@ -0,0 +1,87 @@
+# benchmarks/fake_gemini.py
+
+"""
+Fake Gemini model for benchmarks: no network, no API cost.
+
+Drop-in for the google.generativeai GenerativeModel methods ai_client
+uses (generate_content / generate_content_async). Replies have the same
+shape: .text plus .usage_metadata token counts (about 4 chars per token),
+so usage tracking and budget tiers behave as with the real API.
+
+- Single-article prompts get a one-paragraph summary
+- Batch prompts (numbered "[n]" blocks) get the JSON array ai_client expects
+- Injected latency (base + jitter, in ms) and failures (exceptions)
+- generation_config's max_output_tokens caps the reported response tokens
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
+
+_BATCH_BLOCK = re.compile(r"^\[(\d+)\]$", re.MULTILINE)
+_TITLE = re.compile(r"^Title: (.*)$", re.MULTILINE)
+
+
+class FakeGeminiError(RuntimeError):
+    pass
+
+
+class FakeGenerativeModel:
+    """
+    Thread-safe; one instance is shared like the real model.
+    """
+
+    def __init__(self, latency_ms: float = 300.0, jitter_ms: float = 0.0, failure_rate: float = 0.0, seed: int = 42) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _plan(self) -> Tuple[float, bool]:
+        with self._lock:
+            self.calls += 1
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            fail = self._rng.random() < self.failure_rate
+        return delay / 1000.0, fail
+
+    def _reply(self, prompt: str, generation_config: Optional[Dict[str, Any]]) -> Any:
+        titles = _TITLE.findall(prompt)
+        numbers = _BATCH_BLOCK.findall(prompt)
+        if numbers:
+            text = json.dumps(
+                [
+                    {"id": int(n), "summary": f"Stub summary of '{title}': what happened and why it matters."}
+                    for n, title in zip(numbers, titles)
+                ]
+            )
+        else:
+            title = titles[0] if titles else "the article"
+            text = f"Stub summary of '{title}': what happened and why it matters."
+
+        response_tokens = max(1, len(text) // 4)
+        max_output = (generation_config or {}).get("max_output_tokens")
+        if max_output:
+            response_tokens = min(response_tokens, max_output)
+        usage = SimpleNamespace(prompt_token_count=max(1, len(prompt) // 4), candidates_token_count=response_tokens)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def generate_content(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> Any:
+        delay, fail = self._plan()
+        time.sleep(delay)
+        if fail:
+            raise FakeGeminiError("injected Gemini failure")
+        return self._reply(prompt, generation_config)
+
+    async def generate_content_async(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> Any:
+        delay, fail = self._plan()
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeGeminiError("injected Gemini failure")
+        return self._reply(prompt, generation_config)
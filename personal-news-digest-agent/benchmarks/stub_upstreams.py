@@ -0,0 +1,241 @@
+# benchmarks/stub_upstreams.py
+
+"""
+Local stand-in for Hacker News and the RSS feeds, for benchmarks.
+
+- Serves deterministic fixtures (same seed -> same stories):
+  * GET /hn/topstories.json, GET /hn/item/<id>.json
+  * GET /rss/<source>.xml for every source in news_sources.RSS_FEEDS
+  Some stories appear in several sources so dedup/alternates get exercised.
+- Injected latency (base + jitter, in ms) and failures (HTTP 500) per
+  request, optionally limited to some sources
+- ETag / If-None-Match like real feeds, so conditional GETs return 304
+- Counts requests per source and status for the benchmark report
+
+Standalone (point the backend at it with bench_server.py):
+    python benchmarks/stub_upstreams.py --port 8765 --latency-ms 50 --failure-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+RSS_SOURCES = ["nytimes-tech", "theverge", "bbc-tech", "ars-technica", "wired"]
+
+_SUBJECTS = [
+    "AI", "machine learning", "startup", "open source", "security", "chip", "cloud",
+    "climate tech", "robotics", "quantum computing", "privacy", "smartphone", "database",
+    "browser", "electric vehicle", "space", "gaming", "crypto", "programming language", "GPU",
+]
+_VERBS = [
+    "raises funding for", "launches", "rethinks", "struggles with", "bets big on", "open-sources",
+    "cuts prices on", "is sued over", "doubles down on", "quietly tests",
+]
+_ACTORS = [
+    "Researchers", "A new startup", "Regulators", "Engineers", "The EU", "A chipmaker",
+    "Developers", "A search giant", "Hospitals", "Universities",
+]
+
+
+def _title(rng: random.Random) -> str:
+    return f"{rng.choice(_ACTORS)} {rng.choice(_VERBS)} {rng.choice(_SUBJECTS)} {rng.choice(_SUBJECTS)}"
+
+
+def build_fixtures(seed: int = 42, stories: int = 60, items_per_feed: int = 30, shared: int = 8) -> Dict[str, Any]:
+    """
+    Build the HN items and RSS bodies served by the stub.
+    'shared' stories are reused (same title) across HN and several feeds.
+    """
+    rng = random.Random(seed)
+    shared_titles = [_title(rng) for _ in range(shared)]
+
+    hn_items: Dict[int, Dict[str, Any]] = {}
+    for n in range(stories):
+        story_id = 40000000 + n
+        title = shared_titles[n] if n < shared else _title(rng)
+        hn_items[story_id] = {
+            "id": story_id,
+            "type": "story",
+            "by": f"user{rng.randint(1, 999)}",
+            "title": title,
+            "url": f"https://example.com/hn/{story_id}",
+            "score": rng.randint(1, 800),
+            "time": 1700000000 + n * 60,
+            "descendants": rng.randint(0, 300),
+        }
+
+    feeds: Dict[str, bytes] = {}
+    for source in RSS_SOURCES:
+        items = []
+        for n in range(items_per_feed):
+            title = shared_titles[n] if n < shared and rng.random() < 0.5 else _title(rng)
+            description = " ".join(_title(rng) + "." for _ in range(3))
+            link = f"https://example.com/{source}/{n}"
+            items.append(
+                "<item>"
+                f"<title>{escape(title)}</title>"
+                f"<link>{link}</link>"
+                f"<guid>{link}</guid>"
+                f"<description>{escape(description)}</description>"
+                f"<pubDate>{formatdate(1700000000 + n * 600, usegmt=True)}</pubDate>"
+                "</item>"
+            )
+        feeds[source] = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<rss version="2.0"><channel><title>{source}</title><link>https://example.com/{source}</link>'
+            f"<description>Stub feed</description>{''.join(items)}</channel></rss>"
+        ).encode("utf-8")
+
+    return {
+        "topstories": json.dumps(list(hn_items)).encode("utf-8"),
+        "hn_items": {k: json.dumps(v).encode("utf-8") for k, v in hn_items.items()},
+        "feeds": feeds,
+    }
+
+
+class StubUpstreams:
+    """
+    Threaded HTTP server; start() runs it on a daemon thread.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        failing_sources: Optional[List[str]] = None,
+        seed: int = 42,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.failing_sources = set(failing_sources or [])
+        self.fixtures = build_fixtures(seed)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._counts_lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                stub._handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubUpstreams":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-upstreams", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def counts(self) -> Dict[str, int]:
+        with self._counts_lock:
+            return {f"{source}:{status}": n for (source, status), n in sorted(self._counts.items())}
+
+    # ---------- request handling ---------- #
+
+    def _route(self, path: str) -> Tuple[Optional[str], Optional[bytes], str]:
+        """
+        Return (source, body or None for 404, content type).
+        """
+        if path == "/hn/topstories.json":
+            return "hackernews", self.fixtures["topstories"], "application/json"
+        m = re.fullmatch(r"/hn/item/(\d+)\.json", path)
+        if m:
+            return "hackernews", self.fixtures["hn_items"].get(int(m.group(1)), b"null"), "application/json"
+        m = re.fullmatch(r"/rss/([\w-]+)\.xml", path)
+        if m:
+            return m.group(1), self.fixtures["feeds"].get(m.group(1)), "application/rss+xml"
+        return None, None, "text/plain"
+
+    def _handle(self, req: BaseHTTPRequestHandler) -> None:
+        source, body, content_type = self._route(req.path.split("?", 1)[0])
+
+        with self._rng_lock:
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            fail = self._rng.random() < self.failure_rate
+        if source in self.failing_sources:
+            fail = True
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        if body is None:
+            status, body, headers = 404, b"not found", {}
+        elif fail:
+            status, body, headers = 500, b"injected failure", {}
+        else:
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            headers = {"ETag": etag}
+            if req.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+            else:
+                status = 200
+
+        with self._counts_lock:
+            self._counts[(source or "unknown", status)] += 1
+
+        try:
+            req.send_response(status)
+            req.send_header("Content-Type", content_type)
+            req.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                req.send_header(name, value)
+            req.end_headers()
+            if body:
+                req.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (e.g. a request deadline cancelled it)
+            req.close_connection = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--fail-source", action="append", default=[], help="Source that always returns 500 (repeatable)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    stub = StubUpstreams(
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        failing_sources=args.fail_source,
+        seed=args.seed,
+    )
+    print(f"Stub upstreams on {stub.base_url} (Ctrl+C to stop)")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
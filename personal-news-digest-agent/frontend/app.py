@@ -1,11 +1,24 @@
 # frontend/app.py
 
+import copy
+import json
+import time
+
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 
-API_URL = "http://127.0.0.1:8000/digest"
+PAGE_API_URL = "http://127.0.0.1:8000/digest/page"
+STREAM_API_URL = "http://127.0.0.1:8000/digest/stream"
 USAGE_API_URL = "http://127.0.0.1:8000/usage"
 
+# Client-side caching, so reruns (any widget change) don't hit the backend:
+# the same digest request within DIGEST_CACHE_TTL is served from here
+# (keep it at or below the backend's PAGE_CURSOR_TTL so cached cursors stay
+# valid), and the usage panel is refetched at most every USAGE_REFRESH_SECONDS.
+DIGEST_CACHE_TTL = 120
+USAGE_REFRESH_SECONDS = 15
+
 # These must match the sources used in backend/news_sources.py
 available_sources = [
     "hackernews",
@@ -17,13 +30,30 @@ available_sources = [
 ]
 
 
+class DigestAPIError(Exception):
+    def __init__(self, status_code, text):
+        super().__init__(f"{status_code} - {text}")
+        self.status_code = status_code
+
+
+@st.cache_resource
+def get_http_session():
+    """
+    One keep-alive requests.Session shared by every rerun and user session.
+    """
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return session
+
+
+@st.cache_data(ttl=USAGE_REFRESH_SECONDS, show_spinner=False)
 def fetch_usage():
     """
     Call the backend /usage endpoint to get aggregate Gemini usage stats.
-    Returns a dict or None if not available.
+    Returns a dict or None if not available (cached for USAGE_REFRESH_SECONDS).
     """
     try:
-        resp = requests.get(USAGE_API_URL, timeout=3)
+        resp = get_http_session().get(USAGE_API_URL, timeout=3)
         if resp.status_code == 200:
             return resp.json()
         return None
@@ -31,14 +61,197 @@ def fetch_usage():
         return None
 
 
+@st.cache_data(ttl=DIGEST_CACHE_TTL, show_spinner=False)
+def post_digest_page(payload, cursor=None):
+    """
+    POST /digest/page, cached on (payload, cursor). Errors raise instead of
+    returning, so they are never cached.
+    """
+    body = dict(payload, cursor=cursor) if cursor else payload
+    resp = get_http_session().post(PAGE_API_URL, json=body, timeout=60)
+    if resp.status_code != 200:
+        raise DigestAPIError(resp.status_code, resp.text)
+    return resp.json()
+
+
+@st.cache_resource
+def _streamed_digests():
+    # payload key -> (stored_at, digest); results of completed /digest/stream calls
+    return {}
+
+
+def _payload_key(payload):
+    return json.dumps(payload, sort_keys=True)
+
+
+def get_streamed_digest(payload):
+    entry = _streamed_digests().get(_payload_key(payload))
+    if entry is None or time.time() - entry[0] >= DIGEST_CACHE_TTL:
+        return None
+    return copy.deepcopy(entry[1])
+
+
+def store_streamed_digest(payload, digest):
+    cache = _streamed_digests()
+    now = time.time()
+    for key in [k for k, (stored_at, _) in cache.items() if now - stored_at >= DIGEST_CACHE_TTL]:
+        cache.pop(key, None)
+    cache[_payload_key(payload)] = (now, copy.deepcopy(digest))
+
+
+def render_article_header(a):
+    st.markdown(f"### [{a['title']}]({a['url']})")
+    st.caption(f"Source: `{a['source']}` | Score: {a['score']:.2f}")
+
+    alternates = a.get("alternates") or []
+    if alternates:
+        links = ", ".join(f"[{alt['source']}]({alt['url']})" for alt in alternates)
+        st.caption(f"Also covered by: {links}")
+
+
+def fetch_digest_page(payload, cursor=None):
+    """
+    Call /digest/page for the first page (no cursor) or the next one.
+    Returns the response dict, or None after showing an error.
+    """
+    with st.spinner("Fetching, ranking, and summarizing news..." if cursor is None else "Summarizing more articles..."):
+        try:
+            return post_digest_page(payload, cursor)
+        except requests.RequestException as e:
+            st.error(f"Could not reach backend API: {e}")
+        except DigestAPIError as e:
+            if e.status_code == 410:
+                st.warning("These results have expired. Generate the digest again to see more.")
+            else:
+                st.error(f"API error: {e}")
+    return None
+
+
+def load_more():
+    """
+    "Load more" callback: append the next page to the digest in session state.
+    """
+    digest = st.session_state.get("digest")
+    if not digest or not digest.get("next_cursor"):
+        return
+    data = fetch_digest_page(digest["payload"], digest["next_cursor"])
+    if data is None:
+        digest["next_cursor"] = None
+        return
+    digest["articles"].extend(data.get("articles", []))
+    digest["next_cursor"] = data.get("next_cursor")
+
+
+def render_digest(digest):
+    """
+    Render the digest kept in session state, with a "Load more" button
+    while the backend has more ranked articles.
+    """
+    articles = digest["articles"]
+    if not articles:
+        st.info("No relevant articles found. Try different topics or sources.")
+        return
+
+    st.subheader("Your Personalized Digest")
+    st.caption(f"Topics: {', '.join(digest['topics'])} | Showing {len(articles)} of {digest['total']}")
+
+    for a in articles:
+        render_article_header(a)
+
+        summary = a.get("summary")
+        if summary:
+            st.write(summary)
+        else:
+            st.write("_No summary available for this article._")
+
+        st.markdown("---")
+
+    if digest.get("next_cursor"):
+        st.button("Load more", on_click=load_more)
+
+
+def render_digest_stream(payload):
+    """
+    Call /digest/stream and render incrementally: the ranked list shows up
+    as soon as ranking is done, and each summary fills in as it arrives.
+    The stream is the first page: "Load more" continues it via /digest/page.
+    Returns the completed digest (same shape as the paged one), or None
+    if it failed or found nothing.
+    """
+    try:
+        resp = get_http_session().post(STREAM_API_URL, json=payload, stream=True, timeout=(5, 60))
+    except requests.RequestException as e:
+        st.error(f"Could not reach backend API: {e}")
+        return None
+
+    if resp.status_code != 200:
+        st.error(f"API error: {resp.status_code} - {resp.text}")
+        return None
+
+    placeholders = {}
+    digest = None
+    by_id = {}
+    try:
+        with st.spinner("Fetching, ranking, and summarizing news..."):
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+
+                if event["type"] == "articles":
+                    articles = event.get("articles", [])
+                    if not articles:
+                        st.info("No relevant articles found. Try different topics or sources.")
+                        return None
+
+                    digest = {
+                        "payload": payload,
+                        "topics": event.get("topics", []),
+                        "articles": [dict(a) for a in articles],
+                        "next_cursor": event.get("next_cursor"),
+                        "total": event.get("total", len(articles)),
+                    }
+                    by_id = {a["id"]: a for a in digest["articles"]}
+
+                    st.subheader("Your Personalized Digest")
+                    st.caption(
+                        f"Topics: {', '.join(digest['topics'])} | Showing {len(articles)} of {digest['total']}"
+                    )
+
+                    for a in articles:
+                        render_article_header(a)
+                        placeholders[a["id"]] = st.empty()
+                        placeholders[a["id"]].write("_Summarizing..._")
+                        st.markdown("---")
+
+                elif event["type"] == "summary":
+                    placeholder = placeholders.get(event["id"])
+                    if placeholder is not None:
+                        placeholder.write(event.get("summary") or "_No summary available for this article._")
+                    if event["id"] in by_id:
+                        by_id[event["id"]]["summary"] = event.get("summary")
+                        by_id[event["id"]]["degraded"] = event.get("degraded", False)
+
+                elif event["type"] == "error":
+                    st.error(event.get("detail", "Digest failed."))
+                    digest = None
+    except requests.RequestException as e:
+        st.error(f"Lost connection to backend API: {e}")
+        digest = None
+    finally:
+        resp.close()
+
+    if digest is not None and digest.get("next_cursor"):
+        st.button("Load more", on_click=load_more)
+    return digest
+
+
 # ---------- Streamlit UI ---------- #
 
 st.set_page_config(page_title="Personal News Digest Agent", page_icon="📰")
 
-# Sidebar: API Usage / Cost
-with st.sidebar:
-    st.header("API Usage")
 
+def render_usage_panel():
     usage = fetch_usage()
     if usage is None:
         st.caption("Usage info not available yet.")
@@ -56,12 +269,29 @@ with st.sidebar:
         st.write(f"Prompt tokens: {prompt_tokens}")
         st.write(f"Response tokens: {response_tokens}")
 
+        budget = usage.get("budget") or {}
+        if budget.get("enabled"):
+            st.write(f"Budget tier: `{budget.get('tier')}` ({budget.get('fraction_used', 0.0):.0%} of {budget.get('binding_limit')})")
+
         st.caption(
             "Costs are approximate and based on configured per-million-token rates "
             "(GEMINI_COST_INPUT_PER_M, GEMINI_COST_OUTPUT_PER_M). "
-            "Counters reset when the backend restarts."
+            "Counters cover all backend workers and persist across restarts. "
+            f"Refreshed every {USAGE_REFRESH_SECONDS}s."
         )
 
+
+# Sidebar: API Usage / Cost
+with st.sidebar:
+    st.header("API Usage")
+
+    # On Streamlit versions with fragments, the panel refreshes on its own
+    # timer without rerunning (or blocking) the rest of the page
+    if hasattr(st, "fragment"):
+        st.fragment(run_every=USAGE_REFRESH_SECONDS)(render_usage_panel)()
+    else:
+        render_usage_panel()
+
 # Main page
 st.title("📰 Personal News Digest Agent")
 
@@ -77,7 +307,13 @@ topics_input = st.text_input(
     help="I'll look for these keywords in article titles.",
 )
 
-max_articles = st.slider("Max articles to show", min_value=3, max_value=20, value=8)
+max_articles = st.slider(
+    "Max articles to show",
+    min_value=3,
+    max_value=20,
+    value=8,
+    help="This is the page size: 'Load more' fetches the next batch.",
+)
 
 selected_sources = st.multiselect(
     "Filter by source (optional)",
@@ -86,6 +322,19 @@ selected_sources = st.multiselect(
     help="Unselect sources you want to exclude. If you keep all selected, all sources are used.",
 )
 
+ranking = st.selectbox(
+    "Ranking mode",
+    options=["keyword", "bm25"],
+    help="'keyword' counts topic matches in titles; 'bm25' scores title + description with BM25.",
+)
+
+stream_results = st.checkbox(
+    "Show articles as soon as they're ranked",
+    value=True,
+    help="Streams the digest: the ranked list appears first and summaries fill in as they finish.",
+)
+
+streamed_now = False
 if st.button("Generate Digest"):
     topics = [t.strip() for t in topics_input.split(",") if t.strip()]
     if not topics:
@@ -94,38 +343,36 @@ if st.button("Generate Digest"):
         payload = {
             "topics": topics,
             "max_articles": max_articles,
+            "ranking": ranking,
         }
 
         # Only send 'sources' if user deselected some sources
         if 0 < len(selected_sources) < len(available_sources):
             payload["sources"] = selected_sources
 
-        with st.spinner("Fetching, ranking, and summarizing news..."):
-            try:
-                resp = requests.post(API_URL, json=payload, timeout=60)
-            except requests.RequestException as e:
-                st.error(f"Could not reach backend API: {e}")
-            else:
-                if resp.status_code != 200:
-                    st.error(f"API error: {resp.status_code} - {resp.text}")
-                else:
-                    data = resp.json()
-                    articles = data.get("articles", [])
-                    if not articles:
-                        st.info("No relevant articles found. Try different topics or sources.")
-                    else:
-                        st.subheader("Your Personalized Digest")
-                        st.caption(f"Topics: {', '.join(data.get('topics', []))}")
-
-                        for a in articles:
-                            st.markdown(f"### [{a['title']}]({a['url']})")
-                            st.caption(f"Source: `{a['source']}` | Score: {a['score']:.2f}")
-
-                            summary = a.get("summary")
-                            if summary:
-                                st.write(summary)
-                            else:
-                                st.write("_No summary available for this article._")
-
-                            st.markdown("---")
+        st.session_state.pop("digest", None)
+        cached = get_streamed_digest(payload) if stream_results else None
+        if cached is not None:
+            st.session_state["digest"] = cached
+        elif stream_results:
+            digest = render_digest_stream(payload)
+            if digest is not None:
+                store_streamed_digest(payload, digest)
+                st.session_state["digest"] = digest
+                streamed_now = True
+        else:
+            data = fetch_digest_page(payload)
+            if data is not None:
+                st.session_state["digest"] = {
+                    "payload": payload,
+                    "topics": data.get("topics", []),
+                    "articles": data.get("articles", []),
+                    "next_cursor": data.get("next_cursor"),
+                    "total": data.get("total", 0),
+                }
 
+# The digest survives reruns (so changing a widget doesn't refetch it,
+# and "Load more" can append to it); a digest streamed in this run is
+# already on the page.
+if "digest" in st.session_state and not streamed_now:
+    render_digest(st.session_state["digest"])
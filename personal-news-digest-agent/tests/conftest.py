@@ -0,0 +1,59 @@
+# tests/conftest.py
+
+"""
+Backend modules import each other by bare name (they run from their
+own directory), so put backend/ on sys.path.
+
+Tests never reach Gemini (no API key) and keep the summary cache and
+usage databases in a throw-away directory.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = str(Path(__file__).resolve().parent.parent / "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+_DATA_DIR = Path(tempfile.mkdtemp(prefix="news-digest-tests-"))
+os.environ.pop("GEMINI_API_KEY", None)
+os.environ.pop("GOOGLE_API_KEY", None)
+os.environ["CACHE_DB_PATH"] = str(_DATA_DIR / "summary_cache.db")
+os.environ["USAGE_DB_PATH"] = str(_DATA_DIR / "usage_stats.db")
+
+import cache  # noqa: E402
+
+# Never migrate (and rename) a developer's real legacy JSON cache
+cache.CACHE_FILE_PATH = _DATA_DIR / "summary_cache.json"
+
+import pytest  # noqa: E402
+
+
+class FakeStore:
+    """
+    Stands in for ingestion.ARTICLE_STORE: a fixed snapshot, no fetching.
+    """
+
+    def __init__(self, version=1, articles=None):
+        self.version = version
+        self.articles = articles or []
+
+    def get_snapshot(self, budget=None):
+        return self.version, list(self.articles)
+
+    async def get_snapshot_async(self, budget=None):
+        return self.version, list(self.articles)
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    """
+    Install an empty FakeStore as agent.ARTICLE_STORE; set .articles/.version.
+    """
+    import agent
+
+    store = FakeStore()
+    monkeypatch.setattr(agent, "ARTICLE_STORE", store)
+    return store
@@ -0,0 +1,95 @@
+# tests/test_agent.py
+
+import asyncio
+
+import pytest
+
+import agent
+from digest_cache import DigestCache
+
+
+ARTICLES = [
+    {"id": "hn-1", "title": "AI chips get faster", "url": "https://example.com/1", "score": 10.0,
+     "source": "hackernews", "description": None, "alternates": []},
+    {"id": "wired-2", "title": "Gardening tips", "url": "https://example.com/2", "score": 0.0,
+     "source": "wired", "description": "Roses", "alternates": []},
+]
+
+
+@pytest.fixture
+def pipeline(monkeypatch, fake_store):
+    fake_store.articles = ARTICLES
+    calls = []
+
+    async def fake_summarize(articles, topics, deadline_at=None, **kwargs):
+        calls.append([a["id"] for a in articles])
+        await asyncio.sleep(0.01)
+        return [(f"summary of {a['id']}", False) for a in articles]
+
+    monkeypatch.setattr(agent, "DIGEST_CACHE", DigestCache())
+    monkeypatch.setattr(agent, "summarize_articles_async", fake_summarize)
+    return fake_store, calls
+
+
+def test_concurrent_identical_digests_compute_once(pipeline):
+    _, calls = pipeline
+
+    async def main():
+        return await asyncio.gather(
+            agent.build_digest_async(["AI"], 5),
+            agent.build_digest_async(["ai"], 5),
+            agent.build_digest_async([" AI "], 5),
+        )
+
+    results = asyncio.run(main())
+
+    assert calls == [["hn-1"]]
+    assert all(r == results[0] for r in results)
+    assert results[0][0]["summary"] == "summary of hn-1"
+
+
+def test_error_reaches_every_waiter(pipeline, monkeypatch):
+    async def failing(articles, topics, deadline_at=None, **kwargs):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("gemini down")
+
+    monkeypatch.setattr(agent, "summarize_articles_async", failing)
+
+    async def main():
+        return await asyncio.gather(
+            *(agent.build_digest_async(["AI"], 5) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+
+    assert [type(r) for r in results] == [RuntimeError] * 3
+    assert agent.DIGEST_CACHE.stats()["entries"] == 0
+
+
+def test_version_zero_is_never_cached(pipeline):
+    store, calls = pipeline
+    store.version = 0
+
+    asyncio.run(agent.build_digest_async(["AI"], 5))
+    asyncio.run(agent.build_digest_async(["AI"], 5))
+
+    assert len(calls) == 2
+    assert agent.DIGEST_CACHE.stats()["entries"] == 0
+
+
+def test_snapshot_version_bump_invalidates(pipeline):
+    store, calls = pipeline
+
+    asyncio.run(agent.build_digest_async(["AI"], 5))
+    asyncio.run(agent.build_digest_async(["AI"], 5))
+    assert len(calls) == 1
+
+    store.version = 2
+    store.articles = ARTICLES + [
+        {"id": "hn-3", "title": "AI startups raise", "url": "https://example.com/3", "score": 50.0,
+         "source": "hackernews", "description": None, "alternates": []},
+    ]
+    result = asyncio.run(agent.build_digest_async(["AI"], 5))
+
+    assert len(calls) == 2
+    assert [a["id"] for a in result] == ["hn-3", "hn-1"]
@@ -0,0 +1,108 @@
+# tests/test_budget.py
+
+import types
+
+import pytest
+
+import budget
+from budget import BudgetController
+
+START = 1_700_000_000.0 - 1_700_000_000.0 % 60  # a minute boundary
+
+
+@pytest.fixture
+def usage(monkeypatch):
+    """
+    Fake shared usage: minute -> tokens (all counted as prompt tokens),
+    and an injectable clock ("now", unix seconds).
+    """
+    state = {"now": START, "buckets": {}}
+
+    def read_minutes(first, last):
+        return {
+            m: {"calls": 1, "prompt_tokens": t, "response_tokens": 0}
+            for m, t in state["buckets"].items()
+            if first <= m <= last
+        }
+
+    monkeypatch.setattr(budget, "read_minutes", read_minutes)
+    monkeypatch.setattr(
+        budget,
+        "time",
+        types.SimpleNamespace(time=lambda: state["now"], monotonic=lambda: state["now"]),
+    )
+    return state
+
+
+def _minute(state, offset=0):
+    return int(state["now"] // 60) + offset
+
+
+def test_disabled_without_ceilings(usage):
+    usage["buckets"][_minute(usage)] = 10**9
+    assert BudgetController().tier() == "full"
+
+
+@pytest.mark.parametrize(
+    "tokens, tier",
+    [(0, "full"), (699, "full"), (700, "short"), (899, "short"), (900, "cache_only"), (999, "cache_only"),
+     (1000, "fallback"), (5000, "fallback")],
+)
+def test_minute_thresholds(usage, tokens, tier):
+    usage["buckets"][_minute(usage)] = tokens
+    controller = BudgetController(tokens_per_minute=1000, refresh_seconds=0)
+    assert controller.tier() == tier
+
+
+def test_usd_ceiling_binds(usage):
+    usage["buckets"][_minute(usage)] = 800_000  # $0.80 at $1 / M input tokens
+    controller = BudgetController(
+        tokens_per_minute=10_000_000, usd_per_minute=1.0, cost_input_per_m=1.0, refresh_seconds=0
+    )
+    assert controller.tier() == "short"
+    assert controller.stats()["binding_limit"] == "usd_per_minute"
+
+
+def test_minute_window_rolls_over(usage):
+    controller = BudgetController(tokens_per_minute=1000, refresh_seconds=0)
+    usage["buckets"][_minute(usage)] = 1600
+
+    # 30 s into the next minute: half the previous bucket still counts (800)
+    usage["now"] += 90
+    assert controller.tier() == "short"
+
+    # 54 s in: a tenth of it (160)
+    usage["now"] += 24
+    assert controller.tier() == "full"
+
+    # Two minutes later it's out of the window entirely
+    usage["now"] += 60
+    assert controller.tier() == "full"
+    assert controller.stats()["usage"]["minute"]["tokens"] == 0
+
+
+def test_day_window_rolls_over(usage):
+    controller = BudgetController(tokens_per_day=10_000, refresh_seconds=0)
+    usage["buckets"][_minute(usage)] = 9_500
+    assert controller.tier() == "cache_only"
+
+    # Still inside the last 1440 minutes
+    usage["now"] += (24 * 60 - 1) * 60
+    assert controller.tier() == "cache_only"
+
+    # One more minute and the bucket leaves the day window
+    usage["now"] += 60
+    assert controller.tier() == "full"
+
+
+def test_tier_is_cached_for_refresh_seconds(usage):
+    controller = BudgetController(tokens_per_minute=1000, refresh_seconds=5)
+    assert controller.tier() == "full"
+
+    usage["buckets"][_minute(usage)] = 1000
+    usage["now"] += 4
+    assert controller.tier() == "full"
+
+    usage["now"] += 1
+    assert controller.tier() == "fallback"
+    assert controller.stats()["tier_changes"][0]["to"] == "fallback"
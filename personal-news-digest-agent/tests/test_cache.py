@@ -0,0 +1,17 @@
+# tests/test_cache.py
+
+import sqlite3
+
+import cache
+
+
+def test_save_survives_connection_failure(monkeypatch):
+    def fail():
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(cache, "_get_conn", fail)
+
+    cache.save_cached_summary("https://example.com/a", "Title", None, "Summary.", "model", 10, 5)
+
+    # The write is lost, but the summary is still served from memory
+    assert cache._MEMORY_CACHE.get("https://example.com/a") == "Summary."
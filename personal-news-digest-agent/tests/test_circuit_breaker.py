@@ -0,0 +1,121 @@
+# tests/test_circuit_breaker.py
+
+import asyncio
+import types
+
+import pytest
+
+import circuit_breaker
+import news_sources
+from circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_OPEN_SECONDS,
+    CLOSED,
+    OPEN,
+    HALF_OPEN,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _fail(breaker, times=1):
+    for _ in range(times):
+        breaker.before_request()
+        breaker.record_failure(0.01)
+
+
+def _open_breaker():
+    breaker = CircuitBreaker("test")
+    _fail(breaker, BREAKER_FAILURE_THRESHOLD)
+    return breaker
+
+
+def test_opens_at_failure_threshold(clock):
+    breaker = CircuitBreaker("test")
+
+    _fail(breaker, BREAKER_FAILURE_THRESHOLD - 1)
+    assert breaker.stats()["state"] == CLOSED
+
+    _fail(breaker)
+    assert breaker.stats()["state"] == OPEN
+    assert breaker.stats()["opened"] == 1
+
+
+def test_success_resets_consecutive_failures(clock):
+    breaker = CircuitBreaker("test")
+    _fail(breaker, BREAKER_FAILURE_THRESHOLD - 1)
+    breaker.before_request()
+    breaker.record_success(0.01)
+    _fail(breaker, BREAKER_FAILURE_THRESHOLD - 1)
+    assert breaker.stats()["state"] == CLOSED
+
+
+def test_open_breaker_short_circuits(clock):
+    breaker = _open_breaker()
+
+    clock[0] += BREAKER_OPEN_SECONDS - 1
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = _open_breaker()
+    clock[0] += BREAKER_OPEN_SECONDS
+
+    breaker.before_request()
+    assert breaker.stats()["state"] == HALF_OPEN
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success(0.01)
+    assert breaker.stats()["state"] == CLOSED
+    breaker.before_request()
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = _open_breaker()
+    clock[0] += BREAKER_OPEN_SECONDS
+
+    breaker.before_request()
+    breaker.record_failure(0.01)
+
+    assert breaker.stats()["state"] == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_cancelled_async_probe_frees_the_slot(clock, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_BREAKERS", {})
+    breaker = circuit_breaker.get_breaker("test")
+    _fail(breaker, BREAKER_FAILURE_THRESHOLD)
+    clock[0] += BREAKER_OPEN_SECONDS
+
+    async def hang(client, url, source, timeout):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(news_sources.HTTP_CACHE, "get_async", hang)
+
+    async def main():
+        task = asyncio.create_task(news_sources._guarded_get_async(None, "https://example.com", "test", 5))
+        await asyncio.sleep(0)
+        assert breaker.stats()["state"] == HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    stats = breaker.stats()
+    assert stats["state"] == HALF_OPEN
+    assert stats["failures"] == BREAKER_FAILURE_THRESHOLD
+    # The probe slot is free again
+    breaker.before_request()
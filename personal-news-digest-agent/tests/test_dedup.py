@@ -0,0 +1,108 @@
+# tests/test_dedup.py
+
+from collections import Counter
+from xml.sax.saxutils import escape
+
+from dedup import cluster_articles, in_sources
+from feed_parser import parse_feed
+from news_sources import _normalize_hn_item, merge_source_articles
+
+
+def _article(source: str, title: str, description=None):
+    return {
+        "id": f"{source}-{title}",
+        "title": title,
+        "url": f"https://example.com/{source}/{abs(hash(title))}",
+        "score": 0.0,
+        "source": source,
+        "description": description,
+    }
+
+
+def test_description_does_not_split_a_cluster():
+    hn = _article("hackernews", "Rust compiler gets faster incremental builds")
+    rss = _article("theverge", "Rust compiler gets faster incremental builds", "A long description " * 10)
+
+    result = cluster_articles([hn, rss])
+
+    assert len(result) == 1
+    assert result[0]["source"] == "hackernews"
+    assert result[0]["alternates"] == [{"source": "theverge", "url": rss["url"]}]
+    assert result[0]["description"] == rss["description"]
+
+
+def test_one_extra_title_word_still_clusters():
+    result = cluster_articles([
+        _article("hackernews", "Rust compiler gets faster incremental builds"),
+        _article("wired", "Rust compiler gets much faster incremental builds"),
+    ])
+    assert len(result) == 1
+
+
+def test_unrelated_titles_stay_apart():
+    result = cluster_articles([
+        _article("hackernews", "Researchers launches AI GPU"),
+        _article("wired", "Researchers launches AI cloud"),
+    ])
+    assert len(result) == 2
+
+
+def test_source_filter_matches_alternates():
+    [story] = cluster_articles([
+        _article("hackernews", "Rust compiler gets faster incremental builds"),
+        _article("theverge", "Rust compiler gets faster incremental builds"),
+    ])
+    assert in_sources(story, {"theverge"})
+    assert in_sources(story, {"hackernews"})
+    assert not in_sources(story, {"wired"})
+
+
+# Same shape as the benchmark stubs: stories shared between HN and some
+# feeds, plus unrelated titles from the same small vocabulary that only
+# differ by a word or two (up to 0.67 Jaccard) and must stay apart
+SHARED = [
+    "Researchers launches cloud climate tech",
+    "Engineers rethinks open source crypto",
+    "Regulators cuts prices on privacy robotics",
+]
+HN_TITLES = SHARED + ["Hospitals quietly tests AI browser", "Developers bets big on GPU"]
+FEEDS = {
+    "theverge": [SHARED[0], SHARED[2], "Researchers launches cloud GPU"],
+    "wired": [SHARED[0], SHARED[1], "Engineers rethinks open source AI", "Regulators cuts prices on privacy chip"],
+    "bbc-tech": [SHARED[1], "Universities doubles down on space"],
+}
+
+
+def _rss(source, titles):
+    items = "".join(
+        f"<item><title>{escape(t)}</title><link>https://example.com/{source}/{n}</link>"
+        f"<description>{escape(source)} coverage</description></item>"
+        for n, t in enumerate(titles)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{source}</title>{items}</channel></rss>'.encode()
+
+
+def test_shared_stories_collapse_across_sources():
+    per_source = {
+        "hackernews": [
+            _normalize_hn_item(n, {"type": "story", "title": t, "url": f"https://example.com/hn/{n}", "score": 10})
+            for n, t in enumerate(HN_TITLES)
+        ],
+    }
+    for source, titles in FEEDS.items():
+        per_source[source] = parse_feed(_rss(source, titles), "application/rss+xml", source, 100, mode="incremental")
+
+    raw = [a for articles in per_source.values() for a in articles]
+    copies = Counter(a["title"] for a in raw)
+    duplicates = sum(n - 1 for n in copies.values())
+    assert duplicates == 5
+
+    result = merge_source_articles(list(per_source), per_source)
+
+    assert len(result) == len(raw) - duplicates
+    assert len({a["title"] for a in result}) == len(result)
+    for a in result:
+        assert len(a["alternates"]) == copies[a["title"]] - 1
+    lead = next(a for a in result if a["title"] == SHARED[0])
+    assert lead["source"] == "hackernews"
+    assert [alt["source"] for alt in lead["alternates"]] == ["theverge", "wired"]
@@ -0,0 +1,109 @@
+# tests/test_digest_cache.py
+
+import asyncio
+import threading
+import time
+
+from digest_cache import DigestCache, make_digest_key
+
+RESULT = [{"id": "a", "title": "A"}]
+
+
+def test_cancelled_follower_does_not_break_leader_or_other_followers():
+    cache = DigestCache()
+    key = make_digest_key(["ai"], None, 5, 1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return RESULT
+
+        leader = asyncio.create_task(cache.get_or_compute_async(key, compute))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(cache.get_or_compute_async(key, compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        followers[0].cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(leader, *followers, return_exceptions=True)
+        return results
+
+    leader_result, cancelled, *others = asyncio.run(main())
+
+    assert leader_result == RESULT
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert others == [RESULT, RESULT]
+    assert cache.stats()["coalesced"] == 3
+
+
+def test_concurrent_identical_requests_compute_once():
+    cache = DigestCache()
+    key = make_digest_key(["AI", "startups"], None, 5, 1)
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return RESULT
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute)))]
+    threads[0].start()
+    started.wait(5)
+    # Same request, different topic order/case: same key
+    other_key = make_digest_key(["startups", "ai"], None, 5, 1)
+    for _ in range(3):
+        t = threading.Thread(target=lambda: results.append(cache.get_or_compute(other_key, compute)))
+        threads.append(t)
+        t.start()
+    while cache.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert results == [RESULT] * 4
+    assert cache.get_or_compute(key, compute) == RESULT
+    assert len(calls) == 1
+
+
+def test_error_propagates_to_every_waiter_and_is_not_cached():
+    cache = DigestCache()
+    key = make_digest_key(["ai"], None, 5, 1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError("upstream down")
+
+        tasks = [asyncio.create_task(cache.get_or_compute_async(key, failing))]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(cache.get_or_compute_async(key, failing)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert [type(r) for r in results] == [RuntimeError] * 3
+    assert cache.stats()["entries"] == 0
+    assert cache.get_or_compute(key, lambda: RESULT) == RESULT
+
+
+def test_results_are_copies():
+    cache = DigestCache()
+    key = make_digest_key(["ai"], None, 5, 1)
+    first = cache.get_or_compute(key, lambda: [{"id": "a"}])
+    first[0]["id"] = "mutated"
+    assert cache.peek(key) == [{"id": "a"}]
+
@@ -0,0 +1,32 @@
+# tests/test_feed_parser.py
+
+import pytest
+
+from feed_parser import parse_feed
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example</title>
+  <entry>
+    <title type="html">A &amp;amp; B &amp;#8217;s</title>
+    <link href="https://example.com/1"/>
+    <id>urn:1</id>
+    <summary type="html">&lt;p&gt;Fish &amp;amp; chips&lt;/p&gt;</summary>
+  </entry>
+  <entry>
+    <title type="text">Plain &amp;amp; literal</title>
+    <link href="https://example.com/2"/>
+    <id>urn:2</id>
+  </entry>
+</feed>
+"""
+
+
+@pytest.mark.parametrize("mode", ["incremental", "feedparser"])
+def test_atom_html_text_is_unescaped(mode):
+    articles = parse_feed(ATOM_FEED, "application/atom+xml", "example", 10, mode=mode)
+
+    assert articles[0]["title"] == "A & B ’s"
+    assert articles[0]["description"] == "<p>Fish & chips</p>"
+    # type="text" is already literal text
+    assert articles[1]["title"] == "Plain &amp; literal"
@@ -0,0 +1,30 @@
+# tests/test_http_cache.py
+
+from http_cache import HttpCache
+
+
+def _download(cache, url, etag):
+    return cache._handle_response(url, "test", 200, {"etag": etag, "content-type": "text/xml"}, b"body " + url.encode())
+
+
+def test_validators_are_capped_lru():
+    cache = HttpCache(max_validators=2)
+    _download(cache, "https://a", '"a"')
+    _download(cache, "https://b", '"b"')
+
+    # Using a's validators makes b the least recently used
+    assert cache._conditional_headers("https://a") == {"If-None-Match": '"a"'}
+    _download(cache, "https://c", '"c"')
+
+    assert list(cache._validators) == ["https://a", "https://c"]
+    assert cache._conditional_headers("https://b") == {}
+
+
+def test_not_modified_reuses_stored_body():
+    cache = HttpCache()
+    _download(cache, "https://a", '"a"')
+
+    body, content_type, changed = cache._handle_response("https://a", "test", 304, {}, b"")
+
+    assert (body, content_type, changed) == (b"body https://a", "text/xml", False)
+    assert cache.stats()["test"]["not_modified"] == 1
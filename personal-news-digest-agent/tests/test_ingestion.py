@@ -0,0 +1,62 @@
+# tests/test_ingestion.py
+
+import types
+
+import ingestion
+from ingestion import ArticleStore
+
+SOURCES = ["Hacker News", "The Verge"]
+
+
+def _article(source, title):
+    return {"source": source, "title": title, "url": f"https://example.com/{source}/{title}", "description": None}
+
+
+def _report(per_source, failed=()):
+    articles = [a for name in SOURCES for a in per_source.get(name, [])]
+    return {
+        "sources": list(SOURCES),
+        "per_source": per_source,
+        "articles": articles,
+        "failed_sources": list(failed),
+        "timed_out_sources": [],
+    }
+
+
+def _clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        ingestion, "time", types.SimpleNamespace(time=lambda: clock.now, monotonic=lambda: clock.now)
+    )
+    return clock
+
+
+def test_failed_source_is_reused_until_max_staleness(monkeypatch):
+    clock = _clock(monkeypatch)
+    store = ArticleStore(max_stale_seconds=600)
+    hn = [_article("Hacker News", "rust compiler release")]
+    verge = [_article("The Verge", "phone review roundup")]
+    store._apply_report(_report({"Hacker News": hn, "The Verge": verge}), 1.0)
+
+    clock.now += 600
+    store._apply_report(_report({"Hacker News": hn}, failed=["The Verge"]), 1.0)
+    assert [a["source"] for a in store._articles] == ["Hacker News", "The Verge"]
+    assert store.stats()["stale_sources"] == ["The Verge"]
+    assert store.stats()["expired_sources"] == []
+
+    # Reuse doesn't refresh the source's age
+    clock.now += 1
+    store._apply_report(_report({"Hacker News": hn}, failed=["The Verge"]), 1.0)
+    assert [a["source"] for a in store._articles] == ["Hacker News"]
+    stats = store.stats()
+    assert stats["stale_sources"] == []
+    assert stats["expired_sources"] == ["The Verge"]
+
+    # Still reported while it keeps failing, until it succeeds again
+    clock.now += 1
+    store._apply_report(_report({"Hacker News": hn}, failed=["The Verge"]), 1.0)
+    assert store.stats()["expired_sources"] == ["The Verge"]
+
+    store._apply_report(_report({"Hacker News": hn, "The Verge": verge}), 1.0)
+    assert [a["source"] for a in store._articles] == ["Hacker News", "The Verge"]
+    assert store.stats()["expired_sources"] == []
@@ -0,0 +1,104 @@
+# tests/test_pagination.py
+
+import json
+import types
+
+import pytest
+from fastapi.testclient import TestClient
+
+import agent
+import main
+import pagination
+from pagination import RankedListStore, InvalidCursorError, ExpiredCursorError, page_slice
+
+
+def _articles(n):
+    return [
+        {"id": f"hn-{i}", "title": f"AI story {i}", "url": f"https://example.com/{i}", "score": float(100 - i),
+         "source": "hackernews", "description": None, "alternates": []}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def client(monkeypatch, fake_store):
+    fake_store.articles = _articles(5)
+    monkeypatch.setattr(agent, "RANKED_LISTS", RankedListStore())
+    # No lifespan: no ingestion thread or parse pool
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("cursor", ["no-offset", "token.x", ".3", "token.-1"])
+def test_malformed_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        RankedListStore().get(cursor)
+
+
+def test_expired_cursor(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pagination, "time", types.SimpleNamespace(time=lambda: now[0]))
+    store = RankedListStore(ttl_seconds=10)
+    token = store.put(["ai"], _articles(3))
+
+    assert store.get(f"{token}.1")[1] == 1
+    now[0] += 10
+    with pytest.raises(ExpiredCursorError):
+        store.get(f"{token}.1")
+
+
+def test_evicted_cursor():
+    store = RankedListStore(max_entries=1)
+    first = store.put(["ai"], _articles(3))
+    store.put(["ml"], _articles(3))
+
+    with pytest.raises(ExpiredCursorError):
+        store.get(f"{first}.1")
+
+
+def test_last_page_has_no_next_cursor():
+    articles = _articles(5)
+    page, cursor = page_slice("t", articles, 0, 3)
+    assert [a["id"] for a in page] == ["hn-0", "hn-1", "hn-2"]
+    assert cursor == "t.3"
+
+    page, cursor = page_slice("t", articles, 3, 3)
+    assert [a["id"] for a in page] == ["hn-3", "hn-4"]
+    assert cursor is None
+
+
+def test_page_endpoint_maps_cursor_errors(client):
+    assert client.post("/digest/page", json={"cursor": "garbage"}).status_code == 400
+    assert client.post("/digest/page", json={"cursor": "unknown-token.2"}).status_code == 410
+
+
+def test_page_endpoint_walks_to_the_last_page(client):
+    first = client.post("/digest/page", json={"topics": ["AI"], "max_articles": 3}).json()
+    assert first["total"] == 5
+    assert [a["id"] for a in first["articles"]] == ["hn-0", "hn-1", "hn-2"]
+
+    second = client.post("/digest/page", json={"cursor": first["next_cursor"], "max_articles": 3}).json()
+    assert [a["id"] for a in second["articles"]] == ["hn-3", "hn-4"]
+    assert second["next_cursor"] is None
+    assert second["topics"] == ["AI"]
+
+
+def test_stream_cursor_resumes_at_max_articles(client):
+    resp = client.post("/digest/stream", json={"topics": ["AI"], "max_articles": 2})
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    listing = events[0]
+
+    assert listing["type"] == "articles"
+    assert [a["id"] for a in listing["articles"]] == ["hn-0", "hn-1"]
+    assert listing["total"] == 5
+    assert listing["next_cursor"].endswith(".2")
+    assert events[-1] == {"type": "done"}
+
+    page = client.post("/digest/page", json={"cursor": listing["next_cursor"], "max_articles": 2}).json()
+    assert [a["id"] for a in page["articles"]] == ["hn-2", "hn-3"]
+
+
+def test_stream_without_more_pages_has_no_cursor(client):
+    resp = client.post("/digest/stream", json={"topics": ["AI"], "max_articles": 10})
+    listing = json.loads(resp.text.splitlines()[0])
+    assert listing["next_cursor"] is None
+    assert agent.RANKED_LISTS.stats()["lists"] == 0
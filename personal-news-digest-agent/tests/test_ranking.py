@@ -0,0 +1,60 @@
+# tests/test_ranking.py
+
+import pytest
+
+import ranking
+from ranking import BM25Index, bm25_rank
+
+
+def _article(n, title, description=None, source="wired", score=0.0):
+    return {"id": f"{source}-{n}", "title": title, "url": f"https://example.com/{n}", "score": score,
+            "source": source, "description": description, "alternates": []}
+
+
+ARTICLES = [
+    _article(0, "Gardening for beginners", "Roses and tulips"),
+    _article(1, "Rust rust rust: why Rust wins", "A language story"),
+    _article(2, "Weekly roundup", "Some Rust news among other things"),
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_index_cache(monkeypatch):
+    monkeypatch.setattr(ranking, "_INDEX_CACHE", {"version": None, "index": None, "source_scores": None})
+
+
+def test_term_heavy_title_outranks_non_matching():
+    scores = BM25Index(ARTICLES).score(["rust"])
+
+    assert scores[1] > scores[2] > 0
+    assert scores[0] == 0
+
+
+def test_bm25_rank_keeps_relevant_articles_best_first():
+    result = bm25_rank(ARTICLES, ["Rust"], snapshot_version=1)
+    assert [a["id"] for a in result] == ["wired-1", "wired-2"]
+    assert result[0]["relevance_score"] > result[1]["relevance_score"]
+
+
+def test_unknown_terms_score_nothing():
+    assert bm25_rank(ARTICLES, ["kubernetes"], snapshot_version=1) == []
+
+
+def test_index_is_reused_per_version_and_rebuilt_on_change(monkeypatch):
+    builds = []
+    real = ranking.BM25Index
+
+    def counting(articles, *args, **kwargs):
+        builds.append(len(articles))
+        return real(articles, *args, **kwargs)
+
+    monkeypatch.setattr(ranking, "BM25Index", counting)
+
+    bm25_rank(ARTICLES, ["rust"], snapshot_version=1)
+    bm25_rank(ARTICLES, ["gardening"], snapshot_version=1)
+    assert builds == [3]
+
+    grown = ARTICLES + [_article(3, "Rust in the kernel")]
+    result = bm25_rank(grown, ["kernel"], snapshot_version=2)
+    assert builds == [3, 4]
+    assert [a["id"] for a in result] == ["wired-3"]
@@ -0,0 +1,64 @@
+# tests/test_topic_matcher.py
+
+import pytest
+
+from topic_matcher import TopicMatcher
+
+
+def test_multi_word_topic_matches_as_phrase():
+    matcher = TopicMatcher(["machine learning"])
+    assert matcher.score("New machine learning chips") == 1.0
+    assert matcher.score("Machine shop learning curve") == 0.0
+    assert matcher.score("Learning machine") == 0.0
+
+
+def test_case_and_punctuation_are_ignored():
+    matcher = TopicMatcher(["  Open Source ", "AI"])
+    assert matcher.matches("OPEN-SOURCE tools: why ai, again?") == ["open source", "ai"]
+
+
+def test_whole_words_only():
+    matcher = TopicMatcher(["ai"])
+    assert matcher.score("She said no") == 0.0
+    assert matcher.score("AI said no") == 1.0
+
+
+def test_score_counts_distinct_topics():
+    matcher = TopicMatcher(["AI", "ai", "startup"])
+    assert matcher.topics == ["ai", "startup"]
+    assert matcher.score("AI startup hires AI researchers") == 2.0
+
+
+@pytest.mark.parametrize(
+    "topic, title",
+    [
+        ("startup", "Startups raise more"),
+        ("bus", "Electric buses arrive"),
+        ("box", "Set-top boxes are back"),
+        ("watch", "Smart watches sell out"),
+        ("company", "Tech companies cut jobs"),
+        ("database", "Databases get faster"),
+        ("game", "Games of the year"),
+    ],
+)
+def test_simple_plurals_match_singular_topic(topic, title):
+    assert TopicMatcher([topic]).score(title) == 1.0
+
+
+@pytest.mark.parametrize(
+    "topic, title",
+    [("new", "Tech news today"), ("statu", "Status page down"), ("analysi", "Data analysis")],
+)
+def test_non_plurals_are_not_stripped(topic, title):
+    assert TopicMatcher([topic]).score(title) == 0.0
+
+
+def test_symbol_topics_match_exactly():
+    matcher = TopicMatcher(["C++"])
+    assert matcher.score("Why C++ still matters") == 1.0
+    assert matcher.score("Plan C for the rollout") == 0.0
+
+
+def test_empty_topics_and_text():
+    assert TopicMatcher([" ", ""]).score("anything") == 0.0
+    assert TopicMatcher(["ai"]).score("") == 0.0